@@ -0,0 +1,307 @@
+# backend/alerts.py
+"""Motor de alertas.
+
+Cada família de regras (orçamento, fases, checklist) calcula, para um único projeto, o
+conjunto de alertas que deveriam estar ativos. A avaliação compara esse conjunto com os
+alertas ativos da família: cria os que faltam, atualiza os que mudaram e resolve os que
+deixaram de valer. Escritas em despesas, fases e checklist reavaliam só a família afetada
+do projeto; a varredura periódica cobre as regras que dependem da passagem do tempo.
+"""
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+
+from sqlalchemy import or_, select, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from . import config, events, models
+
+try:
+    import fcntl
+except ImportError:  # Windows: sem trava de arquivo; o índice único ainda impede alertas duplicados
+    fcntl = None
+
+BUDGET = "budget"
+PHASES = "phases"
+CHECKLIST = "checklist"
+ALL_FAMILIES = (BUDGET, PHASES, CHECKLIST)
+# Famílias cujas regras mudam com o tempo, mesmo sem escrita no projeto
+TIME_BASED_FAMILIES = (PHASES, CHECKLIST)
+
+FAMILY_TYPES = {
+    BUDGET: ("budget_overrun", "budget_warning"),
+    PHASES: ("deadline_missed", "deadline_approaching"),
+    CHECKLIST: ("checklist_overdue", "checklist_due_soon"),
+}
+
+COMPLETED_PROJECT_STATUS = "Concluída"
+COMPLETED_PHASE_STATUS = "Concluído"
+
+def _format_money(value: float) -> str:
+    return f"R$ {value:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+
+# --- Regras (cada uma devolve {dedup_key: dados do alerta}) ---
+
+def _budget_rules(db: Session, project: models.Project, now: datetime) -> dict:
+    if not project.budget or project.budget <= 0:
+        return {}
+    usage = (project.spent or 0.0) / project.budget
+    if usage > 1:
+        return {"budget_overrun": dict(
+            alert_type="budget_overrun",
+            severity="high",
+            title=f"Orçamento excedido: {project.name}",
+            message=f"Gasto de {_format_money(project.spent)} excede o orçamento de {_format_money(project.budget)}.",
+        )}
+    if usage >= config.ALERT_BUDGET_WARNING_RATIO:
+        return {"budget_warning": dict(
+            alert_type="budget_warning",
+            severity="medium",
+            title=f"Orçamento quase esgotado: {project.name}",
+            message=f"{usage * 100:.0f}% do orçamento já foi utilizado.",
+        )}
+    return {}
+
+def _phase_rules(db: Session, project: models.Project, now: datetime) -> dict:
+    if project.status == COMPLETED_PROJECT_STATUS:
+        return {}
+    horizon = now + timedelta(days=config.ALERT_DEADLINE_DAYS)
+    phases = db.execute(
+        select(models.ProjectPhase.id, models.ProjectPhase.name, models.ProjectPhase.end_date)
+        .where(
+            models.ProjectPhase.project_id == project.id,
+            models.ProjectPhase.end_date.isnot(None),
+            models.ProjectPhase.end_date <= horizon,
+            models.ProjectPhase.status != COMPLETED_PHASE_STATUS,
+            or_(models.ProjectPhase.progress_percentage.is_(None), models.ProjectPhase.progress_percentage < 100),
+        )
+    ).all()
+    desired = {}
+    for phase in phases:
+        deadline = phase.end_date.strftime("%d/%m/%Y")
+        if phase.end_date < now:
+            desired[f"deadline_missed:{phase.id}"] = dict(
+                alert_type="deadline_missed",
+                severity="high",
+                title=f"Fase atrasada: {phase.name}",
+                message=f"A fase '{phase.name}' deveria ter terminado em {deadline}.",
+            )
+        else:
+            desired[f"deadline_approaching:{phase.id}"] = dict(
+                alert_type="deadline_approaching",
+                severity="medium",
+                title=f"Prazo próximo: {phase.name}",
+                message=f"A fase '{phase.name}' termina em {deadline}.",
+            )
+    return desired
+
+def _checklist_rules(db: Session, project: models.Project, now: datetime) -> dict:
+    if project.status == COMPLETED_PROJECT_STATUS:
+        return {}
+    horizon = now + timedelta(days=config.ALERT_DEADLINE_DAYS)
+    items = db.execute(
+        select(models.Checklist.id, models.Checklist.item_name, models.Checklist.due_date, models.Checklist.priority)
+        .where(
+            models.Checklist.project_id == project.id,
+            models.Checklist.due_date.isnot(None),
+            models.Checklist.due_date <= horizon,
+            models.Checklist.is_completed == False,
+        )
+    ).all()
+    desired = {}
+    for item in items:
+        due = item.due_date.strftime("%d/%m/%Y")
+        if item.due_date < now:
+            desired[f"checklist_overdue:{item.id}"] = dict(
+                alert_type="checklist_overdue",
+                severity="high" if item.priority == "Alta" else "medium",
+                title=f"Item vencido: {item.item_name}",
+                message=f"O item '{item.item_name}' venceu em {due}.",
+            )
+        else:
+            desired[f"checklist_due_soon:{item.id}"] = dict(
+                alert_type="checklist_due_soon",
+                severity="low",
+                title=f"Item vence em breve: {item.item_name}",
+                message=f"O item '{item.item_name}' vence em {due}.",
+            )
+    return desired
+
+RULES = {
+    BUDGET: _budget_rules,
+    PHASES: _phase_rules,
+    CHECKLIST: _checklist_rules,
+}
+
+# --- Avaliação ---
+
+# Tentativas quando outra avaliação simultânea cria o mesmo alerta antes do commit
+EVALUATION_ATTEMPTS = 3
+
+def evaluate_project(db: Session, project_id: int, families: Iterable[str] = ALL_FAMILIES, now: Optional[datetime] = None) -> dict:
+    """Sincroniza os alertas ativos das famílias indicadas de um projeto e faz commit.
+
+    Devolve {"created": [...], "resolved": [...]} com os alertas alterados. O índice único
+    (project_id, dedup_key) dos alertas ativos impede duplicatas entre avaliações simultâneas
+    (workers, varredura e escritas): se outra avaliação criou o alerta antes, ele já existe e
+    a avaliação é refeita a partir do estado atual.
+    """
+    families = tuple(families)
+    now = now or datetime.utcnow()
+    for attempt in range(EVALUATION_ATTEMPTS):
+        try:
+            return _sync_alerts(db, project_id, families, now)
+        except IntegrityError:
+            db.rollback()
+    print(f"[WARNING] Alertas do projeto {project_id} não sincronizados: avaliações simultâneas em conflito.")
+    return {"created": [], "resolved": []}
+
+def _sync_alerts(db: Session, project_id: int, families: tuple, now: datetime) -> dict:
+    project = db.get(models.Project, project_id)
+    changes = {"created": [], "resolved": []}
+
+    desired = {}
+    if project is not None:
+        for family in families:
+            desired.update(RULES[family](db, project, now))
+
+    alert_types = [alert_type for family in families for alert_type in FAMILY_TYPES[family]]
+    active = {
+        alert.dedup_key: alert
+        for alert in db.execute(
+            select(models.Alert).where(
+                models.Alert.project_id == project_id,
+                models.Alert.is_active == True,
+                models.Alert.alert_type.in_(alert_types),
+            )
+        ).scalars()
+    }
+
+    for key, data in desired.items():
+        alert = active.pop(key, None)
+        if alert is None:
+            # Não existe alerta ativo com a mesma chave: cria um novo
+            alert = models.Alert(dedup_key=key, project_id=project_id, user_id=project.owner_id, created_at=now, **data)
+            db.add(alert)
+            changes["created"].append(alert)
+        elif alert.message != data["message"] or alert.severity != data["severity"]:
+            alert.title, alert.message, alert.severity = data["title"], data["message"], data["severity"]
+
+    for alert in active.values():
+        alert.is_active = False
+        alert.resolved_at = now
+        changes["resolved"].append(alert)
+
+    if not (db.new or db.dirty):
+        return changes
+    db.flush()
+    # Dados dos eventos lidos antes do commit, que expira os objetos da sessão
+    notifications = [
+        (kind, dict(alert_id=alert.id, alert_type=alert.alert_type, severity=alert.severity))
+        for kind, changed in (("alert.created", changes["created"]), ("alert.resolved", changes["resolved"]))
+        for alert in changed
+    ]
+    db.commit()
+    for kind, data in notifications:
+        events.publish(kind, project_id, **data)
+    return changes
+
+def sweep(db: Session, now: Optional[datetime] = None) -> int:
+    """Reavalia as regras que dependem do tempo, apenas nos projetos com prazos no horizonte
+    ou com alertas de prazo ainda ativos. Devolve o número de projetos avaliados."""
+    now = now or datetime.utcnow()
+    horizon = now + timedelta(days=config.ALERT_DEADLINE_DAYS)
+    open_projects = select(models.Project.id).where(models.Project.status != COMPLETED_PROJECT_STATUS)
+    candidates = (
+        select(models.ProjectPhase.project_id)
+        .where(
+            models.ProjectPhase.end_date.isnot(None),
+            models.ProjectPhase.end_date <= horizon,
+            models.ProjectPhase.status != COMPLETED_PHASE_STATUS,
+            models.ProjectPhase.project_id.in_(open_projects),
+        )
+        .union(
+            select(models.Checklist.project_id).where(
+                models.Checklist.due_date.isnot(None),
+                models.Checklist.due_date <= horizon,
+                models.Checklist.is_completed == False,
+                models.Checklist.project_id.in_(open_projects),
+            ),
+            select(models.Alert.project_id).where(
+                models.Alert.is_active == True,
+                models.Alert.alert_type.in_(FAMILY_TYPES[PHASES] + FAMILY_TYPES[CHECKLIST]),
+            ),
+        )
+    )
+    project_ids = [project_id for project_id in db.execute(candidates).scalars() if project_id is not None]
+    for project_id in project_ids:
+        evaluate_project(db, project_id, TIME_BASED_FAMILIES, now)
+    return len(project_ids)
+
+# --- Varredura exclusiva ---
+
+# Chave do advisory lock da varredura no PostgreSQL
+SWEEP_LOCK_KEY = 7_240_117
+
+@contextmanager
+def sweep_lock(engine):
+    """Trava entre processos para a varredura periódica; produz False se outro worker já a executa.
+
+    PostgreSQL: advisory lock de sessão em uma conexão dedicada. SQLite: flock em um arquivo
+    ao lado do banco (os workers que compartilham o arquivo estão na mesma máquina).
+    """
+    if engine.dialect.name == "postgresql":
+        with engine.connect() as connection:
+            acquired = connection.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": SWEEP_LOCK_KEY}).scalar()
+            try:
+                yield bool(acquired)
+            finally:
+                if acquired:
+                    connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": SWEEP_LOCK_KEY})
+        return
+
+    database = engine.url.database
+    if fcntl is None or not database or database == ":memory:":
+        yield True
+        return
+    with open(f"{database}.sweep.lock", "w") as lock_file:
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def exclusive_sweep(db: Session, now: Optional[datetime] = None) -> Optional[int]:
+    """sweep() em um único processo por vez; devolve None se outro worker já está varrendo."""
+    with sweep_lock(db.get_bind()) as acquired:
+        if not acquired:
+            return None
+        return sweep(db, now)
+
+# --- Feed ---
+
+def select_alert_feed(
+    user_id: int,
+    role: str,
+    project_id: Optional[int] = None,
+    is_active: Optional[bool] = True,
+    is_read: Optional[bool] = None,
+    severity: Optional[str] = None
+):
+    """Alertas dos projetos em que o usuário é o arquiteto dono ou o cliente."""
+    ownership = models.Project.owner_id == user_id if role == 'architect' else models.Project.client_id == user_id
+    statement = select(models.Alert).join(models.Project, models.Alert.project_id == models.Project.id).where(ownership)
+    if project_id is not None:
+        statement = statement.where(models.Alert.project_id == project_id)
+    if is_active is not None:
+        statement = statement.where(models.Alert.is_active == is_active)
+    if is_read is not None:
+        statement = statement.where(models.Alert.is_read == is_read)
+    if severity:
+        statement = statement.where(models.Alert.severity == severity)
+    return statement
@@ -3,8 +3,14 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from passlib.context import CryptContext
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
+import asyncio
+import threading
+import time
+
+from . import config
 
 # --- Configuração de Segurança ---
 
@@ -13,8 +19,9 @@ SECRET_KEY = "YBYOCA_SECRET_KEY_CHANGE_IN_PRODUCTION"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
-# Contexto para hashing de senhas
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Contexto para hashing de senhas. Hashes com custo diferente de PASSWORD_HASH_ROUNDS
+# (ou de esquemas obsoletos) são marcados para atualização no login
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=config.PASSWORD_HASH_ROUNDS)
 
 # Esquema de autenticação OAuth2
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
@@ -39,3 +46,79 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode.update({"exp": expire})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
+
+def verify_and_update_password(plain_password, hashed_password) -> Tuple[bool, Optional[str]]:
+    """Verifica a senha e, se o hash estiver desatualizado, devolve também o novo hash."""
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+# --- Pool dedicado ao bcrypt ---
+
+class HashingBusy(RuntimeError):
+    """A fila de hashing está cheia (config.PASSWORD_HASH_MAX_PENDING)."""
+
+_executor = None
+_executor_lock = threading.Lock()
+_stats_lock = threading.Lock()
+_stats = {
+    "completed": 0,
+    "rejected": 0,
+    "pending": 0,
+    "queue_seconds_total": 0.0,
+    "queue_seconds_max": 0.0,
+    "hash_seconds_total": 0.0,
+}
+
+def _get_executor() -> ThreadPoolExecutor:
+    # O bcrypt libera o GIL durante o cálculo, então threads bastam para paralelizar
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=config.PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash")
+        return _executor
+
+def shutdown():
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False)
+            _executor = None
+
+def hashing_stats() -> dict:
+    with _stats_lock:
+        stats = dict(_stats)
+    stats["queue_seconds_avg"] = stats["queue_seconds_total"] / stats["completed"] if stats["completed"] else 0.0
+    return stats
+
+async def _run_hashing(function, *args):
+    """Executa uma operação de bcrypt no pool, medindo o tempo de espera na fila."""
+    with _stats_lock:
+        if _stats["pending"] >= config.PASSWORD_HASH_MAX_PENDING:
+            _stats["rejected"] += 1
+            raise HashingBusy("Muitas autenticações simultâneas. Tente novamente em instantes.")
+        _stats["pending"] += 1
+    submitted_at = time.perf_counter()
+
+    def job():
+        started_at = time.perf_counter()
+        try:
+            return function(*args)
+        finally:
+            finished_at = time.perf_counter()
+            with _stats_lock:
+                queue_seconds = started_at - submitted_at
+                _stats["completed"] += 1
+                _stats["queue_seconds_total"] += queue_seconds
+                _stats["queue_seconds_max"] = max(_stats["queue_seconds_max"], queue_seconds)
+                _stats["hash_seconds_total"] += finished_at - started_at
+
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_get_executor(), job)
+    finally:
+        with _stats_lock:
+            _stats["pending"] -= 1
+
+async def verify_and_update_password_async(plain_password, hashed_password) -> Tuple[bool, Optional[str]]:
+    return await _run_hashing(verify_and_update_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password) -> str:
+    return await _run_hashing(get_password_hash, password)
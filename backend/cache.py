@@ -0,0 +1,86 @@
+# backend/cache.py
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+from . import config
+
+class TTLCache:
+    """Cache LRU em memória com expiração por entrada e contadores de acerto/erro."""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data = OrderedDict()  # chave -> (expira_em, valor)
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: Hashable):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def invalidate_where(self, predicate: Callable[[Hashable, Any], bool]):
+        """Remove todas as entradas cujo (chave, valor) satisfaz o predicado."""
+        with self._lock:
+            for key in [k for k, (_, v) in self._data.items() if predicate(k, v)]:
+                del self._data[key]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+# --- Cache de usuários autenticados (token -> principal) ---
+
+user_cache = TTLCache(maxsize=config.USER_CACHE_MAX_SIZE, ttl=config.USER_CACHE_TTL_SECONDS)
+
+def invalidate_user(email: str):
+    """Descarta todos os tokens em cache que pertencem ao usuário informado."""
+    user_cache.invalidate_where(lambda _token, principal: principal.email == email)
+
+# --- Cache de relatórios PDF ((project_id, versão) -> bytes) ---
+
+report_cache = TTLCache(maxsize=config.REPORT_CACHE_MAX_SIZE, ttl=config.REPORT_CACHE_TTL_SECONDS)
+
+def invalidate_project_reports(project_id: int):
+    """Descarta os relatórios em cache de um projeto após alterações de conteúdo."""
+    report_cache.invalidate_where(lambda key, _pdf: key[0] == project_id)
@@ -1,5 +1,17 @@
 import os
 
+def _int_env(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, str(default)).strip())
+    except (ValueError, TypeError):
+        return default
+
+def _float_env(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, str(default)).strip())
+    except (ValueError, TypeError):
+        return default
+
 # Security Configuration
 SECRET_KEY = os.environ.get("SECRET_KEY", "YBYOCA_SECRET_KEY_CHANGE_IN_PRODUCTION")
 ALGORITHM = os.environ.get("JWT_ALGORITHM", "HS256")
@@ -8,8 +20,79 @@ try:
 except (ValueError, TypeError):
     ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
+# Custo do bcrypt (log2 das iterações); ao mudar, as senhas são refeitas no próximo login
+PASSWORD_HASH_ROUNDS = _int_env("PASSWORD_HASH_ROUNDS", 12)
+# Threads dedicadas ao bcrypt e limite de operações na fila antes de responder 503
+PASSWORD_HASH_WORKERS = _int_env("PASSWORD_HASH_WORKERS", 2)
+PASSWORD_HASH_MAX_PENDING = _int_env("PASSWORD_HASH_MAX_PENDING", 64)
+
+# Usuário arquiteto criado por "python -m backend.manage seed"
+ADMIN_EMAIL = os.environ.get("ADMIN_EMAIL", "admin@ybyoca.com")
+ADMIN_PASSWORD = os.environ.get("ADMIN_PASSWORD", "admin")
+
 # Database Configuration
 SQLALCHEMY_DATABASE_URL = os.environ.get("DATABASE_URL", "sqlite:///./ybyoca.db")
+for _scheme in ("postgres://", "postgresql://"):
+    # Provedores como Heroku/Replit usam "postgres://", não aceito pelo SQLAlchemy;
+    # sem driver explícito, usamos o psycopg (v3)
+    if SQLALCHEMY_DATABASE_URL.startswith(_scheme):
+        SQLALCHEMY_DATABASE_URL = "postgresql+psycopg://" + SQLALCHEMY_DATABASE_URL[len(_scheme):]
+DB_POOL_SIZE = _int_env("DB_POOL_SIZE", 5)
+DB_MAX_OVERFLOW = _int_env("DB_MAX_OVERFLOW", 10)
+DB_POOL_TIMEOUT = _int_env("DB_POOL_TIMEOUT", 30)
+DB_POOL_RECYCLE = _int_env("DB_POOL_RECYCLE", 1800)
+SQLITE_BUSY_TIMEOUT_MS = _int_env("SQLITE_BUSY_TIMEOUT_MS", 5000)
+SQLITE_SYNCHRONOUS = os.environ.get("SQLITE_SYNCHRONOUS", "NORMAL").strip().upper()
 
 # Application Configuration
 UPLOAD_DIR = os.environ.get("UPLOAD_DIR", "uploads")
+MAX_UPLOAD_BYTES = _int_env("MAX_UPLOAD_BYTES", 15 * 1024 * 1024)
+UPLOAD_CHUNK_SIZE = _int_env("UPLOAD_CHUNK_SIZE", 1024 * 1024)
+IMAGE_WEBP = os.environ.get("IMAGE_WEBP", "true").strip().lower() in ("1", "true", "yes")
+IMAGE_QUALITY = _int_env("IMAGE_QUALITY", 80)
+
+# Cache Configuration
+USER_CACHE_TTL_SECONDS = _int_env("USER_CACHE_TTL_SECONDS", 60)
+USER_CACHE_MAX_SIZE = _int_env("USER_CACHE_MAX_SIZE", 1024)
+
+# Alert Configuration
+ALERT_BUDGET_WARNING_RATIO = _float_env("ALERT_BUDGET_WARNING_RATIO", 0.9)
+ALERT_DEADLINE_DAYS = _int_env("ALERT_DEADLINE_DAYS", 7)
+# Intervalo da varredura de prazos em segundo plano (0 desativa; use "manage sweep-alerts").
+# Com vários workers, uma trava entre processos garante que só um deles varre por vez
+ALERT_SWEEP_INTERVAL_SECONDS = _int_env("ALERT_SWEEP_INTERVAL_SECONDS", 900)
+
+# Events Configuration (Server-Sent Events)
+# Com uma URL Redis os eventos chegam a todos os workers; sem ela, só ao processo que os gerou
+EVENTS_REDIS_URL = os.environ.get("EVENTS_REDIS_URL", "").strip()
+EVENTS_QUEUE_SIZE = _int_env("EVENTS_QUEUE_SIZE", 100)
+EVENTS_KEEPALIVE_SECONDS = _int_env("EVENTS_KEEPALIVE_SECONDS", 15)
+
+# Metrics Configuration
+METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "true").strip().lower() in ("1", "true", "yes")
+# Token para o Prometheus ("Authorization: Bearer <token>"); sem ele, /metrics exige login de arquiteto
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN", "").strip()
+# Consultas SQL mais lentas que isso (ms) são registradas no log; 0 desativa
+SLOW_QUERY_MS = _int_env("SLOW_QUERY_MS", 500)
+
+# Profiling Configuration (sob demanda; desligado, não há nenhum custo por requisição)
+PROFILING_ENABLED = os.environ.get("PROFILING_ENABLED", "false").strip().lower() in ("1", "true", "yes")
+# E-mails (separados por vírgula) que podem pedir o perfil com "X-Profile: 1" ou ?profile=1
+PROFILING_USERS = {email.strip().lower() for email in os.environ.get("PROFILING_USERS", ADMIN_EMAIL).split(",") if email.strip()}
+PROFILE_DIR = os.environ.get("PROFILE_DIR", "profiles")
+PROFILE_INTERVAL_MS = _float_env("PROFILE_INTERVAL_MS", 2.0)
+PROFILE_MAX_FILES = _int_env("PROFILE_MAX_FILES", 50)
+
+# Compression Configuration (brotli quando o pacote estiver instalado e o cliente aceitar; senão gzip)
+COMPRESSION_ENABLED = os.environ.get("COMPRESSION_ENABLED", "true").strip().lower() in ("1", "true", "yes")
+# Respostas menores que isso (bytes) não compensam a compressão
+COMPRESSION_MIN_BYTES = _int_env("COMPRESSION_MIN_BYTES", 1024)
+GZIP_LEVEL = _int_env("GZIP_LEVEL", 6)
+BROTLI_QUALITY = _int_env("BROTLI_QUALITY", 5)
+
+# Report Configuration
+REPORT_WORKERS = _int_env("REPORT_WORKERS", 2)
+REPORT_CACHE_MAX_SIZE = _int_env("REPORT_CACHE_MAX_SIZE", 64)
+REPORT_CACHE_TTL_SECONDS = _int_env("REPORT_CACHE_TTL_SECONDS", 3600)
+# Projetos com mais despesas que isso geram o relatório em segundo plano (202 + polling)
+REPORT_ASYNC_THRESHOLD = _int_env("REPORT_ASYNC_THRESHOLD", 500)
@@ -1,8 +1,171 @@
 # backend/crud.py
-from sqlalchemy.orm import Session
-from datetime import datetime
-from typing import Optional
-from . import models, schemas, auth
+from sqlalchemy import Date, and_, case, cast, exists, func, literal_column, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session, noload, selectinload
+from pydantic import ValidationError
+from datetime import date, datetime, timedelta
+from typing import List, Optional
+import base64
+import hashlib
+from decimal import Decimal, ROUND_HALF_UP
+from . import models, schemas, alerts, auth, cache, events
+
+# --- Paginação por cursor (keyset) ---
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+def encode_cursor(last_id: int) -> str:
+    return base64.urlsafe_b64encode(str(last_id).encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> int:
+    """Converte o cursor opaco de volta no último ID visto. Lança ValueError se for inválido."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return int(base64.urlsafe_b64decode(padded.encode()).decode())
+    except Exception:
+        raise ValueError("Cursor inválido")
+
+def clamp_page_size(limit: int) -> int:
+    return max(1, min(limit, MAX_PAGE_SIZE))
+
+def keyset(statement, id_column, cursor: Optional[str], limit: int, descending: bool = False):
+    """Restringe uma consulta (Query ou select()) à página após o cursor, ordenada pelo ID."""
+    if cursor:
+        last_id = decode_cursor(cursor)
+        statement = statement.filter(id_column < last_id if descending else id_column > last_id)
+    # Busca um item a mais para saber se existe uma próxima página
+    return statement.order_by(id_column.desc() if descending else id_column).limit(limit + 1)
+
+def page_from_rows(rows, limit: int):
+    next_cursor = encode_cursor(rows[limit - 1].id) if len(rows) > limit else None
+    return {"items": list(rows[:limit]), "next_cursor": next_cursor}
+
+def paginate(query, id_column, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE):
+    """Aplica paginação keyset ordenada pelo ID e devolve o envelope {items, next_cursor}."""
+    limit = clamp_page_size(limit)
+    return page_from_rows(keyset(query, id_column, cursor, limit).all(), limit)
+
+def execute_page(db: Session, statement, id_column, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE, descending: bool = False):
+    limit = clamp_page_size(limit)
+    return page_from_rows(db.execute(keyset(statement, id_column, cursor, limit, descending)).scalars().all(), limit)
+
+# --- Consultas compartilhadas com crud_async (select() do SQLAlchemy 2.0) ---
+
+def select_user_by_email(email: str):
+    return select(models.User).where(models.User.email == email)
+
+def select_project_exists(project_id: int):
+    return select(exists().where(models.Project.id == project_id))
+
+def select_can_access_project(project_id: int, user_id: int, role: str):
+    """EXISTS que verifica se o usuário é o arquiteto dono ou o cliente do projeto (None para outros papéis)."""
+    if role == 'architect':
+        condition = models.Project.owner_id == user_id
+    elif role == 'client':
+        condition = models.Project.client_id == user_id
+    else:
+        return None
+    return select(exists().where(models.Project.id == project_id, condition))
+
+def _project_loader(with_expenses: bool = True):
+    # Carrega as despesas (já filtradas pelo soft delete no relacionamento) em uma
+    # única consulta extra com IN, evitando um SELECT por projeto na serialização.
+    return selectinload(models.Project.expenses) if with_expenses else noload(models.Project.expenses)
+
+def _project_filters(
+    owner_id: Optional[int] = None,
+    client_id: Optional[int] = None,
+    status: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None
+):
+    conditions = []
+    if owner_id is not None:
+        conditions.append(models.Project.owner_id == owner_id)
+    if client_id is not None:
+        conditions.append(models.Project.client_id == client_id)
+    if status:
+        conditions.append(models.Project.status == status)
+    if created_from:
+        conditions.append(models.Project.created_at >= created_from)
+    if created_to:
+        conditions.append(models.Project.created_at <= created_to)
+    return conditions
+
+def select_projects(
+    owner_id: Optional[int] = None,
+    client_id: Optional[int] = None,
+    status: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    with_expenses: bool = True
+):
+    statement = select(models.Project).options(_project_loader(with_expenses))
+    return statement.where(*_project_filters(owner_id, client_id, status, created_from, created_to))
+
+def select_project_version(project_id: int):
+    return select(models.Project.version).where(models.Project.id == project_id)
+
+def select_projects_version(
+    owner_id: Optional[int] = None,
+    client_id: Optional[int] = None,
+    status: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None
+):
+    """Resumo (quantidade, maior ID, soma das versões) dos projetos da listagem.
+
+    As versões só crescem, então qualquer escrita, projeto novo ou mudança de filtro
+    altera o resultado sem que seja preciso carregar os projetos e suas despesas.
+    """
+    return select(
+        func.count(models.Project.id),
+        func.max(models.Project.id),
+        func.coalesce(func.sum(models.Project.version), 0),
+    ).where(*_project_filters(owner_id, client_id, status, created_from, created_to))
+
+def select_expenses(project_id: int, category: Optional[str] = None):
+    statement = select(models.Expense).where(
+        models.Expense.project_id == project_id,
+        models.Expense.is_deleted == False
+    )
+    if category:
+        statement = statement.where(models.Expense.category == category)
+    return statement
+
+def select_project_phases(
+    project_id: int,
+    status: Optional[str] = None,
+    start_from: Optional[datetime] = None,
+    start_to: Optional[datetime] = None
+):
+    statement = select(models.ProjectPhase).where(models.ProjectPhase.project_id == project_id)
+    if status:
+        statement = statement.where(models.ProjectPhase.status == status)
+    if start_from:
+        statement = statement.where(models.ProjectPhase.start_date >= start_from)
+    if start_to:
+        statement = statement.where(models.ProjectPhase.start_date <= start_to)
+    return statement
+
+def select_project_checklist(
+    project_id: int,
+    is_completed: Optional[bool] = None,
+    priority: Optional[str] = None,
+    due_from: Optional[datetime] = None,
+    due_to: Optional[datetime] = None
+):
+    statement = select(models.Checklist).where(models.Checklist.project_id == project_id)
+    if is_completed is not None:
+        statement = statement.where(models.Checklist.is_completed == is_completed)
+    if priority:
+        statement = statement.where(models.Checklist.priority == priority)
+    if due_from:
+        statement = statement.where(models.Checklist.due_date >= due_from)
+    if due_to:
+        statement = statement.where(models.Checklist.due_date <= due_to)
+    return statement
 
 # --- CRUD para Usuários ---
 
@@ -10,17 +173,26 @@ def get_user(db: Session, user_id: int):
     return db.query(models.User).filter(models.User.id == user_id).first()
 
 def get_user_by_email(db: Session, email: str):
-    return db.query(models.User).filter(models.User.email == email).first()
+    return db.execute(select_user_by_email(email)).scalars().first()
 
 def get_users(db: Session, skip: int = 0, limit: int = 100):
     return db.query(models.User).offset(skip).limit(limit).all()
 
-def create_user(db: Session, user: schemas.UserCreate):
-    hashed_password = auth.get_password_hash(user.password)
+def get_users_page(db: Session, role: Optional[str] = None, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE):
+    query = db.query(models.User)
+    if role:
+        query = query.filter(models.User.role == role)
+    return paginate(query, models.User.id, cursor, limit)
+
+def create_user(db: Session, user: schemas.UserCreate, hashed_password: Optional[str] = None):
+    # Rotas assíncronas calculam o hash no pool de auth e o repassam já pronto
+    if hashed_password is None:
+        hashed_password = auth.get_password_hash(user.password)
     db_user = models.User(email=user.email, hashed_password=hashed_password, role=user.role)
     db.add(db_user)
     db.commit()
     db.refresh(db_user)
+    cache.invalidate_user(db_user.email)
     return db_user
 
 # --- CRUD para Projetos ---
@@ -28,20 +200,74 @@ def create_user(db: Session, user: schemas.UserCreate):
 def get_project(db: Session, project_id: int):
     return db.query(models.Project).filter(models.Project.id == project_id).first()
 
-def get_projects_by_architect(db: Session, architect_id: int, status: Optional[str] = None):
-    query = db.query(models.Project).filter(models.Project.owner_id == architect_id)
-    if status:
-        query = query.filter(models.Project.status == status)
-    return query.all()
+def get_project_with_expenses(db: Session, project_id: int):
+    return db.execute(select_projects().where(models.Project.id == project_id)).scalars().first()
+
+def get_project_content_version(db: Session, project_id: int):
+    """Devolve (versão, nº de despesas) do conteúdo do projeto, usada como chave de cache dos relatórios.
+
+    Despesas só são criadas ou excluídas (soft delete), então contagem, maior ID e
+    soma das despesas ativas junto com os campos do projeto identificam o conteúdo.
+    """
+    row = (
+        db.query(
+            models.Project.name,
+            models.Project.status,
+            models.Project.budget,
+            models.Project.spent,
+            models.Project.completed_at,
+            func.count(models.Expense.id),
+            func.max(models.Expense.id),
+            func.sum(models.Expense.value),
+        )
+        .outerjoin(models.Expense, and_(models.Expense.project_id == models.Project.id, models.Expense.is_deleted == False))
+        .filter(models.Project.id == project_id)
+        .group_by(models.Project.id)
+        .first()
+    )
+    if row is None:
+        return None, 0
+    return hashlib.sha1(repr(tuple(row)).encode()).hexdigest()[:16], row[5]
+
+def project_exists(db: Session, project_id: int) -> bool:
+    return db.execute(select_project_exists(project_id)).scalar()
+
+def bump_project_version(db: Session, project_id: int):
+    """Incrementa a versão do projeto na mesma transação da escrita (invalida os ETags)."""
+    stmt = update(models.Project).where(models.Project.id == project_id).values(version=models.Project.version + 1)
+    db.execute(stmt.execution_options(synchronize_session=False))
 
-def get_projects_by_client(db: Session, client_id: int):
-    return db.query(models.Project).filter(models.Project.client_id == client_id).all()
+def can_access_project(db: Session, project_id: int, user_id: int, role: str) -> bool:
+    """Verifica com um único EXISTS se o usuário é o arquiteto dono ou o cliente do projeto."""
+    statement = select_can_access_project(project_id, user_id, role)
+    return statement is not None and db.execute(statement).scalar()
+
+def get_projects_by_architect(db: Session, architect_id: int, status: Optional[str] = None, with_expenses: bool = True):
+    return db.execute(select_projects(owner_id=architect_id, status=status, with_expenses=with_expenses)).scalars().all()
+
+def get_projects_by_client(db: Session, client_id: int, with_expenses: bool = True):
+    return db.execute(select_projects(client_id=client_id, with_expenses=with_expenses)).scalars().all()
+
+def get_projects_page(
+    db: Session,
+    owner_id: Optional[int] = None,
+    client_id: Optional[int] = None,
+    status: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    with_expenses: bool = True,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE
+):
+    statement = select_projects(owner_id, client_id, status, created_from, created_to, with_expenses)
+    return execute_page(db, statement, models.Project.id, cursor, limit)
 
 def create_project(db: Session, project: schemas.ProjectCreate, architect_id: int):
     db_project = models.Project(**project.dict(), owner_id=architect_id)
     db.add(db_project)
     db.commit()
     db.refresh(db_project)
+    events.publish("project.created", db_project.id, user_ids=(db_project.owner_id, db_project.client_id), name=db_project.name)
     return db_project
 
 def update_project_status(db: Session, project_id: int, status: str, completed_at: datetime = None):
@@ -49,10 +275,238 @@ def update_project_status(db: Session, project_id: int, status: str, completed_a
     if db_project:
         db_project.status = status
         db_project.completed_at = completed_at
+        bump_project_version(db, project_id)
         db.commit()
         db.refresh(db_project)
+        cache.invalidate_project_reports(project_id)
+        # Projeto concluído: os alertas de prazo deixam de valer
+        alerts.evaluate_project(db, project_id, alerts.TIME_BASED_FAMILIES)
+        events.publish("project.updated", project_id, status=status)
     return db_project
 
+# --- Resumo do Dashboard (agregações em SQL) ---
+
+def get_dashboard_summary(
+    db: Session,
+    owner_id: Optional[int] = None,
+    client_id: Optional[int] = None,
+    project_id: Optional[int] = None,
+    status: Optional[str] = None
+):
+    """Calcula totais por projeto, por categoria e do portfólio com GROUP BY."""
+    project_statement, category_statement = select_dashboard(owner_id, client_id, project_id, status)
+    return build_dashboard_summary(db.execute(project_statement).all(), db.execute(category_statement).all())
+
+def select_dashboard(
+    owner_id: Optional[int] = None,
+    client_id: Optional[int] = None,
+    project_id: Optional[int] = None,
+    status: Optional[str] = None
+):
+    """Devolve as consultas agregadas (por projeto, por projeto+categoria) do dashboard."""
+    project_filters = []
+    if owner_id is not None:
+        project_filters.append(models.Project.owner_id == owner_id)
+    if client_id is not None:
+        project_filters.append(models.Project.client_id == client_id)
+    if project_id is not None:
+        project_filters.append(models.Project.id == project_id)
+    if status:
+        project_filters.append(models.Project.status == status)
+    active_expense = and_(models.Expense.project_id == models.Project.id, models.Expense.is_deleted == False)
+
+    project_statement = (
+        select(
+            models.Project.id,
+            models.Project.name,
+            models.Project.status,
+            models.Project.budget,
+            func.count(models.Expense.id).label("expense_count"),
+            func.coalesce(func.sum(models.Expense.value), 0.0).label("spent"),
+            func.coalesce(func.max(models.Expense.value), 0.0).label("max_expense"),
+        )
+        .outerjoin(models.Expense, active_expense)
+        .where(*project_filters)
+        .group_by(models.Project.id)
+        .order_by(models.Project.id)
+    )
+
+    category_statement = (
+        select(
+            models.Expense.project_id,
+            models.Expense.category,
+            func.count(models.Expense.id).label("count"),
+            func.sum(models.Expense.value).label("total"),
+        )
+        .join(models.Project, active_expense)
+        .where(*project_filters)
+        .group_by(models.Expense.project_id, models.Expense.category)
+    )
+    return project_statement, category_statement
+
+def build_dashboard_summary(project_rows, category_rows):
+    # Categoria principal (maior número de itens) de cada projeto e totais do portfólio
+    main_category = {}
+    project_categories = {}
+    portfolio_categories = {}
+    for row in category_rows:
+        project_categories.setdefault(row.project_id, []).append(
+            {"category": row.category, "count": row.count, "total": row.total}
+        )
+        current = main_category.get(row.project_id)
+        if current is None or row.count > current[1]:
+            main_category[row.project_id] = (row.category, row.count)
+        totals = portfolio_categories.setdefault(row.category, {"category": row.category, "count": 0, "total": 0.0})
+        totals["count"] += row.count
+        totals["total"] += row.total
+
+    projects = []
+    for row in project_rows:
+        budget = row.budget or 0.0
+        projects.append({
+            "project_id": row.id,
+            "name": row.name,
+            "status": row.status,
+            "budget": budget,
+            "spent": row.spent,
+            "remaining": budget - row.spent,
+            "budget_usage": (row.spent / budget * 100) if budget > 0 else 0.0,
+            "is_over_budget": row.spent > budget,
+            "expense_count": row.expense_count,
+            "avg_expense": row.spent / row.expense_count if row.expense_count else 0.0,
+            "max_expense": row.max_expense,
+            "main_category": main_category.get(row.id, (None, 0))[0],
+            "categories": project_categories.get(row.id, []),
+        })
+
+    total_budget = sum(p["budget"] for p in projects)
+    total_spent = sum(p["spent"] for p in projects)
+    return {
+        "total_projects": len(projects),
+        "active_projects": sum(1 for p in projects if p["status"] == "Em Andamento"),
+        "completed_projects": sum(1 for p in projects if p["status"] == "Concluída"),
+        "total_budget": total_budget,
+        "total_spent": total_spent,
+        "budget_usage": (total_spent / total_budget * 100) if total_budget > 0 else 0.0,
+        "over_budget_count": sum(1 for p in projects if p["is_over_budget"]),
+        "expense_count": sum(p["expense_count"] for p in projects),
+        "categories": sorted(portfolio_categories.values(), key=lambda c: c["total"], reverse=True),
+        "projects": projects,
+    }
+
+# --- Totais de gastos (agregados em centavos) ---
+
+def to_cents(value: float) -> int:
+    return int((Decimal(str(value)) * 100).quantize(Decimal("1"), rounding=ROUND_HALF_UP))
+
+def _sync_project_spent(db: Session, project_ids=None):
+    """Recalcula Project.spent a partir dos totais em centavos, no próprio banco."""
+    totals = models.ProjectCategoryTotal
+    total_cents = (
+        select(func.coalesce(func.sum(totals.total_cents), 0))
+        .where(totals.project_id == models.Project.id)
+        .scalar_subquery()
+    )
+    stmt = update(models.Project).values(spent=total_cents / 100.0)
+    if project_ids is not None:
+        stmt = stmt.where(models.Project.id.in_(project_ids))
+    db.execute(stmt.execution_options(synchronize_session=False))
+
+def _apply_spending_deltas(db: Session, project_id: int, deltas: dict):
+    """Incrementa atomicamente (upsert em SQL) os totais por categoria e atualiza Project.spent.
+
+    deltas: {categoria: (centavos, quantidade)}
+    """
+    if not deltas:
+        return
+    table = models.ProjectCategoryTotal.__table__
+    dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+    stmt = dialect.insert(table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.project_id, table.c.category],
+        set_={
+            "total_cents": table.c.total_cents + stmt.excluded.total_cents,
+            "expense_count": table.c.expense_count + stmt.excluded.expense_count,
+        },
+    )
+    db.execute(stmt, [
+        {"project_id": project_id, "category": category, "total_cents": cents, "expense_count": count}
+        for category, (cents, count) in deltas.items()
+    ])
+    _sync_project_spent(db, [project_id])
+
+def _apply_spending_delta(db: Session, project_id: int, category: str, delta_cents: int, delta_count: int):
+    _apply_spending_deltas(db, project_id, {category: (delta_cents, delta_count)})
+
+RECONCILE_BATCH_SIZE = 10000
+
+def reconcile_spending(db: Session, apply: bool = False):
+    """Recalcula os totais a partir das despesas e devolve as divergências encontradas.
+
+    Com apply=True, reescreve a tabela de totais e Project.spent em lote.
+    """
+    # Soma em Python com to_cents, o mesmo arredondamento da escrita: o round() do SQLite e o
+    # do PostgreSQL (metade para o par) divergem dele em valores como 1.005
+    actual = {}
+    rows = db.execute(
+        select(models.Expense.project_id, models.Expense.category, models.Expense.value)
+        .where(models.Expense.is_deleted == False)
+        .execution_options(yield_per=RECONCILE_BATCH_SIZE)
+    )
+    for project_id, category, value in rows:
+        cents, count = actual.get((project_id, category), (0, 0))
+        actual[(project_id, category)] = (cents + to_cents(value or 0.0), count + 1)
+    stored = {
+        (r.project_id, r.category): (r.total_cents, r.expense_count)
+        for r in db.query(models.ProjectCategoryTotal).all()
+    }
+
+    drift = []
+    for key in sorted(set(actual) | set(stored), key=lambda k: (k[0], k[1] or "")):
+        expected, found = actual.get(key, (0, 0)), stored.get(key, (0, 0))
+        if expected != found:
+            drift.append({
+                "project_id": key[0],
+                "category": key[1],
+                "expected_cents": expected[0],
+                "stored_cents": found[0],
+                "expected_count": expected[1],
+                "stored_count": found[1],
+            })
+
+    expected_by_project = {}
+    for (project_id, _), (cents, _) in actual.items():
+        expected_by_project[project_id] = expected_by_project.get(project_id, 0) + cents
+    spent_drift = [
+        {"project_id": p.id, "expected_spent": expected_by_project.get(p.id, 0) / 100.0, "stored_spent": p.spent}
+        for p in db.query(models.Project.id, models.Project.spent).all()
+        if abs((p.spent or 0.0) - expected_by_project.get(p.id, 0) / 100.0) >= 0.005
+    ]
+
+    if apply:
+        db.query(models.ProjectCategoryTotal).delete(synchronize_session=False)
+        if actual:
+            db.execute(
+                models.ProjectCategoryTotal.__table__.insert(),
+                [
+                    {"project_id": p, "category": c, "total_cents": cents, "expense_count": count}
+                    for (p, c), (cents, count) in actual.items()
+                ],
+            )
+        _sync_project_spent(db)
+        # Os totais de todos os projetos podem ter mudado
+        db.execute(update(models.Project).values(version=models.Project.version + 1).execution_options(synchronize_session=False))
+        db.commit()
+
+    return {"category_drift": drift, "spent_drift": spent_drift, "applied": apply}
+
+def backfill_spending_totals(db: Session):
+    """Preenche os totais na primeira execução em um banco que já tinha despesas."""
+    has_totals = db.query(exists().where(models.ProjectCategoryTotal.project_id.isnot(None))).scalar()
+    has_expenses = db.query(exists().where(models.Expense.is_deleted == False)).scalar()
+    if has_expenses and not has_totals:
+        reconcile_spending(db, apply=True)
+
 # --- CRUD para Despesas ---
 
 def get_expense(db: Session, expense_id: int):
@@ -67,61 +521,338 @@ def create_expense(db: Session, project_id: int, expense: schemas.ExpenseCreate,
         photo_url=photo_url
     )
     db.add(db_expense)
-    
-    project = get_project(db, project_id)
-    project.spent += expense.value
-
+    _apply_spending_delta(db, project_id, expense.category, to_cents(expense.value), 1)
+    bump_project_version(db, project_id)
     db.commit()
     db.refresh(db_expense)
+    cache.invalidate_project_reports(project_id)
+    events.publish("expense.created", project_id, expense_id=db_expense.id)
+    alerts.evaluate_project(db, project_id, [alerts.BUDGET])
     return db_expense
 
 def delete_expense(db: Session, expense_id: int):
     db_expense = get_expense(db, expense_id)
-    if db_expense:
-        # Atualiza o valor gasto no projeto antes de marcar a despesa como excluída
-        project = get_project(db, db_expense.project_id)
-        if project:
-            project.spent -= db_expense.value
-            db.add(project) # Garante que o SQLAlchemy registre a modificação do projeto
-            # db.flush() # Não é necessário se o commit for no final
-        
-        db_expense.is_deleted = True # Marca a despesa como excluída (soft delete)
-        db.add(db_expense) # Garante que o SQLAlchemy registre a modificação da despesa
+    if db_expense and not db_expense.is_deleted:
+        # Soft delete condicional: com duas exclusões simultâneas só uma altera a linha,
+        # e apenas ela desconta a despesa dos totais do projeto
+        result = db.execute(
+            update(models.Expense)
+            .where(models.Expense.id == expense_id, models.Expense.is_deleted == False)
+            .values(is_deleted=True)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount != 1:
+            db.rollback()
+            return db_expense
+        _apply_spending_delta(db, db_expense.project_id, db_expense.category, -to_cents(db_expense.value), -1)
+        bump_project_version(db, db_expense.project_id)
         db.commit()
+        cache.invalidate_project_reports(db_expense.project_id)
+        events.publish("expense.deleted", db_expense.project_id, expense_id=db_expense.id)
+        alerts.evaluate_project(db, db_expense.project_id, [alerts.BUDGET])
     return db_expense
 
+def bulk_create_expenses(db: Session, project_id: int, rows, atomic: bool = True, batch_size: int = 1000, max_errors: int = 100):
+    """Valida e insere despesas em lote numa única transação.
+
+    rows: iterável de (número da linha, dict) consumido sob demanda. As linhas válidas são
+    inseridas com executemany a cada batch_size, e os totais do projeto são atualizados uma
+    única vez no final. Com atomic=True, qualquer linha inválida cancela toda a importação.
+    """
+    table = models.Expense.__table__
+    batch = []
+    deltas = {}
+    inserted = 0
+    total_rows = 0
+    error_count = 0
+    errors = []
+
+    for row_number, data in rows:
+        total_rows += 1
+        try:
+            expense = schemas.ExpenseCreate(**data)
+        except (ValidationError, TypeError) as e:
+            error_count += 1
+            if len(errors) < max_errors:
+                details = [err["msg"] for err in e.errors()] if isinstance(e, ValidationError) else [str(e)]
+                errors.append({"row": row_number, "errors": details})
+            continue
+        if atomic and error_count:
+            # A importação será descartada: basta continuar validando
+            continue
+        batch.append({
+            "name": expense.name,
+            "value": expense.value,
+            "category": expense.category,
+            "photo_url": None,
+            "is_deleted": False,
+            "project_id": project_id,
+        })
+        cents, count = deltas.get(expense.category, (0, 0))
+        deltas[expense.category] = (cents + to_cents(expense.value), count + 1)
+        if len(batch) >= batch_size:
+            db.execute(table.insert(), batch)
+            inserted += len(batch)
+            batch = []
+
+    if atomic and error_count:
+        db.rollback()
+        inserted = 0
+    else:
+        if batch:
+            db.execute(table.insert(), batch)
+            inserted += len(batch)
+        _apply_spending_deltas(db, project_id, deltas)
+        if inserted:
+            bump_project_version(db, project_id)
+        db.commit()
+        if inserted:
+            cache.invalidate_project_reports(project_id)
+            events.publish("expense.imported", project_id, count=inserted)
+            alerts.evaluate_project(db, project_id, [alerts.BUDGET])
+
+    return {
+        "total_rows": total_rows,
+        "inserted": inserted,
+        "error_count": error_count,
+        "errors": errors,
+    }
+
 def get_all_expenses_for_project(db: Session, project_id: int):
     return db.query(models.Expense).filter(models.Expense.project_id == project_id).all()
 
+def get_expenses_page(
+    db: Session,
+    project_id: int,
+    category: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE
+):
+    return execute_page(db, select_expenses(project_id, category), models.Expense.id, cursor, limit)
+
+# --- Fluxo de Caixa ---
+
+def create_cash_flow_entries(db: Session, project_id: int, entries: List[schemas.CashFlowCreate]):
+    """Insere os lançamentos com um único executemany."""
+    now = datetime.utcnow()
+    rows = [
+        {**entry.model_dump(), "transaction_date": entry.transaction_date or now, "project_id": project_id}
+        for entry in entries
+    ]
+    db.execute(models.CashFlow.__table__.insert(), rows)
+    bump_project_version(db, project_id)
+    db.commit()
+    events.publish("cashflow.created", project_id, count=len(rows))
+    return {"inserted": len(rows)}
+
+def select_cash_flows(
+    project_id: int,
+    transaction_type: Optional[str] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None
+):
+    statement = select(models.CashFlow).where(models.CashFlow.project_id == project_id)
+    if transaction_type:
+        statement = statement.where(models.CashFlow.transaction_type == transaction_type)
+    if date_from:
+        statement = statement.where(models.CashFlow.transaction_date >= date_from)
+    if date_to:
+        statement = statement.where(models.CashFlow.transaction_date <= date_to)
+    return statement
+
+def get_cash_flows_page(
+    db: Session,
+    project_id: int,
+    transaction_type: Optional[str] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE
+):
+    statement = select_cash_flows(project_id, transaction_type, date_from, date_to)
+    return execute_page(db, statement, models.CashFlow.id, cursor, limit)
+
+def bucket_start(value: datetime, bucket: str) -> date:
+    """Início do período (segunda-feira da semana ou dia 1 do mês) que contém a data."""
+    day = value.date() if isinstance(value, datetime) else value
+    if bucket == "week":
+        return day - timedelta(days=day.weekday())
+    return day.replace(day=1)
+
+def _cash_flow_period(dialect_name: str, bucket: str):
+    column = models.CashFlow.transaction_date
+    if dialect_name == "sqlite":
+        if bucket == "week":
+            # Volta 6 dias e avança até a segunda-feira: a segunda-feira em ou antes da data
+            return func.date(column, "-6 days", "weekday 1", type_=Date)
+        return func.strftime("%Y-%m-01", column, type_=Date)
+    # Literal na consulta (e não parâmetro) para que o PostgreSQL reconheça a mesma
+    # expressão no SELECT e no GROUP BY
+    return cast(func.date_trunc(literal_column(f"'{bucket}'"), column), Date)
+
+def select_cash_flow_series(
+    dialect_name: str,
+    project_id: int,
+    bucket: str = "month",
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None
+):
+    """Agrupa os lançamentos por período e calcula os saldos acumulados com funções de janela.
+
+    Lançamentos confirmados de entrada/saída formam a série realizada; os do tipo forecast
+    ou não confirmados formam a série prevista. O saldo considera todo o histórico anterior
+    a date_from, que só limita os períodos devolvidos.
+    """
+    if bucket not in ("week", "month"):
+        raise ValueError("Período inválido: use week ou month.")
+    cash_flow = models.CashFlow
+    period = _cash_flow_period(dialect_name, bucket).label("period")
+    is_actual = and_(cash_flow.is_confirmed == True, cash_flow.transaction_type != "forecast")
+    signed_amount = case(
+        (cash_flow.transaction_type == "income", cash_flow.amount),
+        (cash_flow.transaction_type == "expense", -cash_flow.amount),
+        else_=cash_flow.amount,
+    )
+    filters = [cash_flow.project_id == project_id]
+    if date_to:
+        filters.append(cash_flow.transaction_date <= date_to)
+
+    buckets = (
+        select(
+            period,
+            func.sum(case((and_(is_actual, cash_flow.transaction_type == "income"), cash_flow.amount), else_=0.0)).label("income"),
+            func.sum(case((and_(is_actual, cash_flow.transaction_type == "expense"), cash_flow.amount), else_=0.0)).label("expense"),
+            func.sum(case((is_actual, signed_amount), else_=0.0)).label("net"),
+            func.sum(case((is_actual, 0.0), else_=signed_amount)).label("forecast_net"),
+        )
+        .where(*filters)
+        .group_by(period)
+        .subquery()
+    )
+    running = dict(order_by=buckets.c.period, rows=(None, 0))
+    series = select(
+        buckets.c.period,
+        buckets.c.income,
+        buckets.c.expense,
+        buckets.c.net,
+        buckets.c.forecast_net,
+        func.sum(buckets.c.net).over(**running).label("balance"),
+        func.sum(buckets.c.net + buckets.c.forecast_net).over(**running).label("projected_balance"),
+    ).subquery()
+
+    statement = select(series).order_by(series.c.period)
+    if date_from:
+        statement = statement.where(series.c.period >= bucket_start(date_from, bucket))
+    return statement
+
+def build_cash_flow_series(project_id: int, bucket: str, rows):
+    return {"project_id": project_id, "bucket": bucket, "items": [dict(row._mapping) for row in rows]}
+
+def get_cash_flow_series(
+    db: Session,
+    project_id: int,
+    bucket: str = "month",
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None
+):
+    statement = select_cash_flow_series(db.bind.dialect.name, project_id, bucket, date_from, date_to)
+    return build_cash_flow_series(project_id, bucket, db.execute(statement).all())
+
+# --- Alertas ---
+
+def get_alert(db: Session, alert_id: int):
+    return db.get(models.Alert, alert_id)
+
+def mark_alert_read(db: Session, alert_id: int):
+    db_alert = get_alert(db, alert_id)
+    if db_alert and not db_alert.is_read:
+        db_alert.is_read = True
+        db.commit()
+        db.refresh(db_alert)
+    return db_alert
+
+# --- Atualizações em lote (fases e checklist) ---
+
+def _bulk_update_project_rows(db: Session, model, project_id: int, updates):
+    """Aplica atualizações parciais com um UPDATE em lote por chave primária, numa única transação.
+
+    Devolve os IDs alterados, ou None se algum ID não pertencer ao projeto (nada é gravado).
+    """
+    values = {}
+    for item in updates:
+        # Vários itens com o mesmo ID são combinados, prevalecendo o último
+        values.setdefault(item.id, {"id": item.id}).update(item.model_dump(exclude_unset=True, exclude={"id"}))
+    found = db.execute(select(func.count(model.id)).where(model.id.in_(values), model.project_id == project_id)).scalar()
+    if found < len(values):
+        return None
+    rows = [row for row in values.values() if len(row) > 1]
+    if rows:
+        db.execute(update(model), rows)
+        bump_project_version(db, project_id)
+        db.commit()
+    return [row["id"] for row in rows]
+
 # --- CRUD para Fases do Projeto ---
 
 def get_project_phases(db: Session, project_id: int):
     return db.query(models.ProjectPhase).filter(models.ProjectPhase.project_id == project_id).all()
 
+def get_project_phases_page(
+    db: Session,
+    project_id: int,
+    status: Optional[str] = None,
+    start_from: Optional[datetime] = None,
+    start_to: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE
+):
+    statement = select_project_phases(project_id, status, start_from, start_to)
+    return execute_page(db, statement, models.ProjectPhase.id, cursor, limit)
+
 def get_project_phase(db: Session, phase_id: int):
     return db.query(models.ProjectPhase).filter(models.ProjectPhase.id == phase_id).first()
 
 def create_project_phase(db: Session, phase: schemas.ProjectPhaseCreate, project_id: int):
     db_phase = models.ProjectPhase(**phase.dict(), project_id=project_id)
     db.add(db_phase)
+    bump_project_version(db, project_id)
     db.commit()
     db.refresh(db_phase)
+    events.publish("phase.created", project_id, phase_id=db_phase.id)
+    alerts.evaluate_project(db, project_id, [alerts.PHASES])
     return db_phase
 
-def update_project_phase(db: Session, phase_id: int, phase_data: dict):
+def update_project_phase(db: Session, phase_id: int, phase_data: schemas.ProjectPhaseUpdate):
     db_phase = get_project_phase(db, phase_id)
     if db_phase:
-        for key, value in phase_data.items():
+        for key, value in phase_data.model_dump(exclude_unset=True).items():
             setattr(db_phase, key, value)
+        bump_project_version(db, db_phase.project_id)
         db.commit()
         db.refresh(db_phase)
+        events.publish("phase.updated", db_phase.project_id, phase_id=db_phase.id)
+        alerts.evaluate_project(db, db_phase.project_id, [alerts.PHASES])
     return db_phase
 
+def bulk_update_project_phases(db: Session, project_id: int, updates: List[schemas.ProjectPhaseBatchItem]):
+    """Atualiza várias fases do projeto de uma vez e devolve as fases alteradas (None se algum ID for de outro projeto)."""
+    changed = _bulk_update_project_rows(db, models.ProjectPhase, project_id, updates)
+    if not changed:
+        return changed
+    events.publish("phase.updated", project_id, phase_ids=changed)
+    alerts.evaluate_project(db, project_id, [alerts.PHASES])
+    statement = select(models.ProjectPhase).where(models.ProjectPhase.id.in_(changed)).order_by(models.ProjectPhase.id)
+    return db.execute(statement).scalars().all()
+
 def delete_project_phase(db: Session, phase_id: int):
     db_phase = get_project_phase(db, phase_id)
     if db_phase:
+        project_id = db_phase.project_id
         db.delete(db_phase)
+        bump_project_version(db, project_id)
         db.commit()
+        events.publish("phase.deleted", project_id, phase_id=phase_id)
+        alerts.evaluate_project(db, project_id, [alerts.PHASES])
     return db_phase
 
 # --- CRUD para Checklist ---
@@ -129,36 +860,72 @@ def delete_project_phase(db: Session, phase_id: int):
 def get_project_checklist(db: Session, project_id: int):
     return db.query(models.Checklist).filter(models.Checklist.project_id == project_id).all()
 
+def get_project_checklist_page(
+    db: Session,
+    project_id: int,
+    is_completed: Optional[bool] = None,
+    priority: Optional[str] = None,
+    due_from: Optional[datetime] = None,
+    due_to: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE
+):
+    statement = select_project_checklist(project_id, is_completed, priority, due_from, due_to)
+    return execute_page(db, statement, models.Checklist.id, cursor, limit)
+
 def get_checklist_item(db: Session, item_id: int):
     return db.query(models.Checklist).filter(models.Checklist.id == item_id).first()
 
 def create_checklist_item(db: Session, item: schemas.ChecklistCreate, project_id: int):
     db_item = models.Checklist(**item.dict(), project_id=project_id)
     db.add(db_item)
+    bump_project_version(db, project_id)
     db.commit()
     db.refresh(db_item)
+    events.publish("checklist.created", project_id, item_id=db_item.id)
+    alerts.evaluate_project(db, project_id, [alerts.CHECKLIST])
     return db_item
 
-def update_checklist_item(db: Session, item_id: int, item_data: dict):
+def update_checklist_item(db: Session, item_id: int, item_data: schemas.ChecklistUpdate):
     db_item = get_checklist_item(db, item_id)
     if db_item:
-        for key, value in item_data.items():
+        for key, value in item_data.model_dump(exclude_unset=True).items():
             setattr(db_item, key, value)
+        bump_project_version(db, db_item.project_id)
         db.commit()
         db.refresh(db_item)
+        events.publish("checklist.updated", db_item.project_id, item_id=db_item.id)
+        alerts.evaluate_project(db, db_item.project_id, [alerts.CHECKLIST])
     return db_item
 
+def bulk_update_checklist_items(db: Session, project_id: int, updates: List[schemas.ChecklistBatchItem]):
+    """Atualiza vários itens do checklist de uma vez e devolve os itens alterados (None se algum ID for de outro projeto)."""
+    changed = _bulk_update_project_rows(db, models.Checklist, project_id, updates)
+    if not changed:
+        return changed
+    events.publish("checklist.updated", project_id, item_ids=changed)
+    alerts.evaluate_project(db, project_id, [alerts.CHECKLIST])
+    statement = select(models.Checklist).where(models.Checklist.id.in_(changed)).order_by(models.Checklist.id)
+    return db.execute(statement).scalars().all()
+
 def toggle_checklist_item(db: Session, item_id: int):
     db_item = get_checklist_item(db, item_id)
     if db_item:
         db_item.is_completed = not db_item.is_completed
+        bump_project_version(db, db_item.project_id)
         db.commit()
         db.refresh(db_item)
+        events.publish("checklist.toggled", db_item.project_id, item_id=db_item.id, is_completed=db_item.is_completed)
+        alerts.evaluate_project(db, db_item.project_id, [alerts.CHECKLIST])
     return db_item
 
 def delete_checklist_item(db: Session, item_id: int):
     db_item = get_checklist_item(db, item_id)
     if db_item:
+        project_id = db_item.project_id
         db.delete(db_item)
+        bump_project_version(db, project_id)
         db.commit()
+        events.publish("checklist.deleted", project_id, item_id=item_id)
+        alerts.evaluate_project(db, project_id, [alerts.CHECKLIST])
     return db_item
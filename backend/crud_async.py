@@ -0,0 +1,180 @@
+# backend/crud_async.py
+"""Versões assíncronas (AsyncSession) das consultas de leitura usadas pelas rotas mais acessadas.
+
+As consultas em si são montadas pelos construtores select_* de crud.py, de modo que
+as duas versões sempre filtram e paginam da mesma forma.
+"""
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from . import alerts, models
+from .crud import (
+    DEFAULT_PAGE_SIZE,
+    build_cash_flow_series,
+    build_dashboard_summary,
+    clamp_page_size,
+    keyset,
+    page_from_rows,
+    select_can_access_project,
+    select_cash_flow_series,
+    select_cash_flows,
+    select_dashboard,
+    select_expenses,
+    select_project_checklist,
+    select_project_exists,
+    select_project_phases,
+    select_project_version,
+    select_projects,
+    select_projects_version,
+    select_user_by_email,
+)
+
+async def execute_page(db: AsyncSession, statement, id_column, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE, descending: bool = False):
+    limit = clamp_page_size(limit)
+    result = await db.execute(keyset(statement, id_column, cursor, limit, descending))
+    return page_from_rows(result.scalars().all(), limit)
+
+# --- Usuários ---
+
+async def get_user_by_email(db: AsyncSession, email: str):
+    result = await db.execute(select_user_by_email(email))
+    return result.scalars().first()
+
+async def update_user_password_hash(db: AsyncSession, user_id: int, hashed_password: str):
+    await db.execute(update(models.User).where(models.User.id == user_id).values(hashed_password=hashed_password))
+    await db.commit()
+
+# --- Projetos ---
+
+async def project_exists(db: AsyncSession, project_id: int) -> bool:
+    return (await db.execute(select_project_exists(project_id))).scalar()
+
+async def get_accessible_project_ids(db: AsyncSession, user_id: int, role: str):
+    ownership = models.Project.owner_id == user_id if role == 'architect' else models.Project.client_id == user_id
+    return (await db.execute(select(models.Project.id).where(ownership))).scalars().all()
+
+async def can_access_project(db: AsyncSession, project_id: int, user_id: int, role: str) -> bool:
+    statement = select_can_access_project(project_id, user_id, role)
+    return statement is not None and (await db.execute(statement)).scalar()
+
+async def get_project_version(db: AsyncSession, project_id: int) -> Optional[int]:
+    return (await db.execute(select_project_version(project_id))).scalar()
+
+async def get_projects_version(
+    db: AsyncSession,
+    owner_id: Optional[int] = None,
+    client_id: Optional[int] = None,
+    status: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None
+):
+    return tuple((await db.execute(select_projects_version(owner_id, client_id, status, created_from, created_to))).one())
+
+async def get_projects_page(
+    db: AsyncSession,
+    owner_id: Optional[int] = None,
+    client_id: Optional[int] = None,
+    status: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    with_expenses: bool = True,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE
+):
+    statement = select_projects(owner_id, client_id, status, created_from, created_to, with_expenses)
+    return await execute_page(db, statement, models.Project.id, cursor, limit)
+
+async def get_dashboard_summary(
+    db: AsyncSession,
+    owner_id: Optional[int] = None,
+    client_id: Optional[int] = None,
+    project_id: Optional[int] = None,
+    status: Optional[str] = None
+):
+    project_statement, category_statement = select_dashboard(owner_id, client_id, project_id, status)
+    project_rows = (await db.execute(project_statement)).all()
+    category_rows = (await db.execute(category_statement)).all()
+    return build_dashboard_summary(project_rows, category_rows)
+
+# --- Despesas ---
+
+async def get_expenses_page(
+    db: AsyncSession,
+    project_id: int,
+    category: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE
+):
+    return await execute_page(db, select_expenses(project_id, category), models.Expense.id, cursor, limit)
+
+# --- Fluxo de Caixa ---
+
+async def get_cash_flows_page(
+    db: AsyncSession,
+    project_id: int,
+    transaction_type: Optional[str] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE
+):
+    statement = select_cash_flows(project_id, transaction_type, date_from, date_to)
+    return await execute_page(db, statement, models.CashFlow.id, cursor, limit)
+
+async def get_cash_flow_series(
+    db: AsyncSession,
+    project_id: int,
+    bucket: str = "month",
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None
+):
+    statement = select_cash_flow_series(db.bind.dialect.name, project_id, bucket, date_from, date_to)
+    rows = (await db.execute(statement)).all()
+    return build_cash_flow_series(project_id, bucket, rows)
+
+# --- Alertas ---
+
+async def get_alert_feed_page(
+    db: AsyncSession,
+    user_id: int,
+    role: str,
+    project_id: Optional[int] = None,
+    is_active: Optional[bool] = True,
+    is_read: Optional[bool] = None,
+    severity: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE
+):
+    """Feed de alertas do usuário, do mais recente para o mais antigo."""
+    statement = alerts.select_alert_feed(user_id, role, project_id, is_active, is_read, severity)
+    return await execute_page(db, statement, models.Alert.id, cursor, limit, descending=True)
+
+# --- Fases e Checklist ---
+
+async def get_project_phases_page(
+    db: AsyncSession,
+    project_id: int,
+    status: Optional[str] = None,
+    start_from: Optional[datetime] = None,
+    start_to: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE
+):
+    statement = select_project_phases(project_id, status, start_from, start_to)
+    return await execute_page(db, statement, models.ProjectPhase.id, cursor, limit)
+
+async def get_project_checklist_page(
+    db: AsyncSession,
+    project_id: int,
+    is_completed: Optional[bool] = None,
+    priority: Optional[str] = None,
+    due_from: Optional[datetime] = None,
+    due_to: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE
+):
+    statement = select_project_checklist(project_id, is_completed, priority, due_from, due_to)
+    return await execute_page(db, statement, models.Checklist.id, cursor, limit)
@@ -1,19 +1,68 @@
 # backend/database.py
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
-# Define o caminho para o nosso arquivo de banco de dados SQLite
-SQLALCHEMY_DATABASE_URL = "sqlite:///./ybyoca.db"
+from . import config
+
+# URL do banco vinda da configuração (DATABASE_URL); SQLite local por padrão
+SQLALCHEMY_DATABASE_URL = config.SQLALCHEMY_DATABASE_URL
+
+def is_sqlite(url: str) -> bool:
+    return url.startswith("sqlite")
+
+def engine_options(url: str) -> dict:
+    """Parâmetros do engine conforme o banco: pool ajustado para servidores, timeout de lock para SQLite."""
+    if is_sqlite(url):
+        return {
+            "connect_args": {
+                "check_same_thread": False,
+                "timeout": config.SQLITE_BUSY_TIMEOUT_MS / 1000,
+            },
+        }
+    return {
+        "pool_size": config.DB_POOL_SIZE,
+        "max_overflow": config.DB_MAX_OVERFLOW,
+        "pool_timeout": config.DB_POOL_TIMEOUT,
+        "pool_recycle": config.DB_POOL_RECYCLE,
+        "pool_pre_ping": True,
+    }
+
+def async_database_url(url: str) -> str:
+    """Mesma base de dados com um driver assíncrono (aiosqlite; psycopg 3 já é assíncrono)."""
+    if url.startswith("sqlite:"):
+        return "sqlite+aiosqlite:" + url[len("sqlite:"):]
+    return url
+
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    # WAL permite leituras concorrentes durante uma escrita; busy_timeout espera pelo lock
+    # em vez de falhar com "database is locked"
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute(f"PRAGMA busy_timeout={int(config.SQLITE_BUSY_TIMEOUT_MS)}")
+    if config.SQLITE_SYNCHRONOUS in ("OFF", "NORMAL", "FULL", "EXTRA"):
+        cursor.execute(f"PRAGMA synchronous={config.SQLITE_SYNCHRONOUS}")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
 
 # Cria o "motor" do SQLAlchemy, o ponto de entrada para o banco de dados
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
-)
+engine = create_engine(SQLALCHEMY_DATABASE_URL, **engine_options(SQLALCHEMY_DATABASE_URL))
+if is_sqlite(SQLALCHEMY_DATABASE_URL):
+    event.listen(engine, "connect", set_sqlite_pragmas)
 
 # Cria uma classe SessionLocal, que será usada para criar sessões de banco de dados individuais
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Engine assíncrono para as rotas de leitura mais acessadas (dashboard, listagens, autenticação)
+ASYNC_DATABASE_URL = async_database_url(SQLALCHEMY_DATABASE_URL)
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **engine_options(ASYNC_DATABASE_URL))
+if is_sqlite(ASYNC_DATABASE_URL):
+    event.listen(async_engine.sync_engine, "connect", set_sqlite_pragmas)
+
+# expire_on_commit=False: os objetos continuam legíveis após o commit sem novo I/O implícito
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
 # Cria uma classe Base que nossos modelos de tabela (ex: Tabela de Projetos) irão herdar
 Base = declarative_base()
 
@@ -24,3 +73,7 @@ def get_db():
         yield db
     finally:
         db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,170 @@
+# backend/events.py
+"""Eventos de alteração por projeto, entregues aos navegadores via Server-Sent Events.
+
+O crud publica um evento após cada escrita confirmada. Cada conexão SSE assina os tópicos
+"project:<id>" dos projetos que pode ver e "user:<id>" (novos projetos). O broker padrão
+entrega os eventos dentro do processo; com config.EVENTS_REDIS_URL eles passam por um canal
+Redis e chegam a todos os workers.
+"""
+import asyncio
+import itertools
+import json
+import threading
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Iterable, Optional
+
+from . import config
+
+try:
+    import redis
+except ImportError:  # Redis é opcional: sem ele os eventos ficam restritos ao processo
+    redis = None
+
+REDIS_CHANNEL = "ybyoca:events"
+
+@dataclass
+class Event:
+    id: int
+    type: str
+    project_id: Optional[int]
+    data: dict = field(default_factory=dict)
+    topics: tuple = ()
+    created_at: str = ""
+
+def project_topic(project_id: int) -> str:
+    return f"project:{project_id}"
+
+def user_topic(user_id: int) -> str:
+    return f"user:{user_id}"
+
+def format_sse(event: Event) -> str:
+    payload = {"type": event.type, "project_id": event.project_id, "created_at": event.created_at, **event.data}
+    return f"id: {event.id}\nevent: {event.type}\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
+class Subscription:
+    """Fila de uma conexão SSE. Vive no event loop que a criou."""
+
+    def __init__(self, topics: Iterable[str], maxsize: int):
+        self.topics = set(topics)
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=maxsize)
+
+    def _deliver(self, event: Event):
+        if self.queue.full():
+            # Cliente lento: descarta o evento mais antigo em vez de bloquear quem publica
+            self.queue.get_nowait()
+        self.queue.put_nowait(event)
+
+    async def get(self, timeout: float) -> Optional[Event]:
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+class LocalBroker:
+    """Pub/sub em memória. publish() pode ser chamado de qualquer thread."""
+
+    def __init__(self):
+        self._subscriptions = set()
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    def subscribe(self, topics: Iterable[str]) -> Subscription:
+        subscription = Subscription(topics, config.EVENTS_QUEUE_SIZE)
+        with self._lock:
+            self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subscriptions)
+
+    def build_event(self, event_type: str, project_id: Optional[int], user_ids: Iterable[int], data: dict) -> Event:
+        topics = [user_topic(user_id) for user_id in user_ids if user_id is not None]
+        if project_id is not None:
+            topics.append(project_topic(project_id))
+        return Event(
+            id=next(self._ids),
+            type=event_type,
+            project_id=project_id,
+            data=data,
+            topics=tuple(topics),
+            created_at=datetime.utcnow().isoformat(),
+        )
+
+    def dispatch(self, event: Event):
+        with self._lock:
+            subscriptions = [s for s in self._subscriptions if s.topics.intersection(event.topics)]
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription._deliver, event)
+            except RuntimeError:
+                # Event loop já encerrado
+                self.unsubscribe(subscription)
+
+    def publish(self, event_type: str, project_id: Optional[int] = None, user_ids: Iterable[int] = (), **data):
+        self.dispatch(self.build_event(event_type, project_id, user_ids, data))
+
+    def close(self):
+        pass
+
+class RedisBroker(LocalBroker):
+    """Publica no canal Redis; uma thread por processo recebe o canal e entrega localmente."""
+
+    def __init__(self, url: str):
+        super().__init__()
+        self._redis = redis.Redis.from_url(url)
+        self._listener = None
+        self._pubsub = None
+
+    def subscribe(self, topics: Iterable[str]) -> Subscription:
+        self._start_listener()
+        return super().subscribe(topics)
+
+    def _start_listener(self):
+        with self._lock:
+            if self._listener is not None:
+                return
+            self._pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+            self._pubsub.subscribe(REDIS_CHANNEL)
+            self._listener = threading.Thread(target=self._listen, name="events-redis", daemon=True)
+            self._listener.start()
+
+    def _listen(self):
+        for message in self._pubsub.listen():
+            try:
+                payload = json.loads(message["data"])
+                payload["topics"] = tuple(payload["topics"])
+                self.dispatch(Event(**payload))
+            except (ValueError, TypeError, KeyError) as e:
+                print(f"[ERROR] Evento inválido recebido do Redis: {e}")
+
+    def publish(self, event_type: str, project_id: Optional[int] = None, user_ids: Iterable[int] = (), **data):
+        event = self.build_event(event_type, project_id, user_ids, data)
+        self._redis.publish(REDIS_CHANNEL, json.dumps(asdict(event), ensure_ascii=False))
+
+    def close(self):
+        if self._pubsub is not None:
+            self._pubsub.close()
+
+def _create_broker() -> LocalBroker:
+    if config.EVENTS_REDIS_URL:
+        if redis is None:
+            print("[ERROR] EVENTS_REDIS_URL definido, mas o pacote 'redis' não está instalado; usando eventos locais.")
+        else:
+            return RedisBroker(config.EVENTS_REDIS_URL)
+    return LocalBroker()
+
+broker = _create_broker()
+
+def publish(event_type: str, project_id: Optional[int] = None, user_ids: Iterable[int] = (), **data):
+    """Publica um evento sem nunca interromper a escrita que o originou."""
+    try:
+        broker.publish(event_type, project_id, user_ids, **data)
+    except Exception as e:
+        print(f"[ERROR] Falha ao publicar o evento '{event_type}': {e}")
@@ -0,0 +1,98 @@
+# backend/images.py
+import os
+import tempfile
+import threading
+from typing import Optional
+
+from . import config
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Pillow é opcional: sem ele as fotos são servidas no tamanho original
+    Image = None
+
+# Variantes geradas para cada foto: nome -> maior dimensão em pixels
+VARIANTS = {
+    "thumb": 320,
+    "medium": 1024,
+}
+
+DERIVATIVES_DIR = os.path.join(config.UPLOAD_DIR, "derivatives")
+
+# Evita que duas requisições gerem a mesma variante ao mesmo tempo. Conjunto fixo de locks
+# escolhidos pelo hash do caminho: nunca são removidos, então quem espera e quem chega
+# depois disputam sempre o mesmo lock
+LOCK_STRIPES = 64
+_locks = [threading.Lock() for _ in range(LOCK_STRIPES)]
+
+def is_available() -> bool:
+    return Image is not None
+
+def variant_url(photo_url: Optional[str], variant: str) -> Optional[str]:
+    if not photo_url:
+        return None
+    return f"/media/{variant}/{os.path.basename(photo_url)}"
+
+def _extension() -> str:
+    return ".webp" if config.IMAGE_WEBP else ".jpg"
+
+def derivative_path(filename: str, variant: str) -> str:
+    stem, _ = os.path.splitext(filename)
+    return os.path.join(DERIVATIVES_DIR, variant, f"{stem}{_extension()}")
+
+def media_type() -> str:
+    return "image/webp" if config.IMAGE_WEBP else "image/jpeg"
+
+def _render(source_path: str, target_path: str, max_size: int):
+    with Image.open(source_path) as image:
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+        image.thumbnail((max_size, max_size))
+        os.makedirs(os.path.dirname(target_path), exist_ok=True)
+        # Nome temporário único no mesmo diretório: o os.replace final é atômico
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(target_path), suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                if config.IMAGE_WEBP:
+                    image.save(f, "WEBP", quality=config.IMAGE_QUALITY, method=4)
+                else:
+                    image.save(f, "JPEG", quality=config.IMAGE_QUALITY, optimize=True, progressive=True)
+            os.chmod(temp_path, 0o644)  # mkstemp cria com 0600
+            os.replace(temp_path, target_path)
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except FileNotFoundError:
+                pass
+            raise
+
+def ensure_derivative(filename: str, variant: str) -> Optional[str]:
+    """Devolve o caminho da variante, gerando-a se ainda não existir (chamada bloqueante).
+
+    Retorna None se o Pillow não estiver instalado, se o original não existir ou se
+    o arquivo não puder ser lido como imagem.
+    """
+    if not is_available() or variant not in VARIANTS:
+        return None
+    filename = os.path.basename(filename)
+    source_path = os.path.join(config.UPLOAD_DIR, filename)
+    target_path = derivative_path(filename, variant)
+    if os.path.exists(target_path):
+        return target_path
+    if not os.path.exists(source_path):
+        return None
+
+    with _locks[hash(target_path) % LOCK_STRIPES]:
+        try:
+            if not os.path.exists(target_path):
+                _render(source_path, target_path, VARIANTS[variant])
+        except Exception as e:
+            print(f"[ERROR] Falha ao gerar a variante '{variant}' de {filename}: {e}")
+            return None
+    return target_path
+
+def generate_derivatives(photo_url: str):
+    """Gera todas as variantes de uma foto recém-enviada (usada em BackgroundTasks)."""
+    for variant in VARIANTS:
+        ensure_derivative(os.path.basename(photo_url), variant)
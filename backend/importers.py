@@ -0,0 +1,86 @@
+# backend/importers.py
+import csv
+import io
+import json
+from typing import IO, Iterator, Tuple
+
+class ImportFormatError(ValueError):
+    """O arquivo não pôde ser lido como CSV ou JSON de despesas."""
+
+# Cabeçalhos aceitos (em inglês ou português) -> campo de schemas.ExpenseCreate
+COLUMN_ALIASES = {
+    "name": "name",
+    "nome": "name",
+    "descricao": "name",
+    "descrição": "name",
+    "value": "value",
+    "valor": "value",
+    "category": "category",
+    "categoria": "category",
+}
+
+def _normalize_value(value):
+    # Aceita valores no formato brasileiro ("1.234,56") além do formato com ponto
+    if isinstance(value, str):
+        value = value.strip().replace("R$", "").strip()
+        if "," in value:
+            value = value.replace(".", "").replace(",", ".")
+    return value
+
+def _normalize_row(row: dict) -> dict:
+    data = {}
+    for key, value in row.items():
+        if key is None:
+            continue
+        field = COLUMN_ALIASES.get(key.strip().lower())
+        if field:
+            data[field] = value.strip() if isinstance(value, str) and field != "value" else value
+    if "value" in data:
+        data["value"] = _normalize_value(data["value"])
+    return data
+
+def detect_format(filename: str, content_type: str) -> str:
+    filename = (filename or "").lower()
+    content_type = (content_type or "").lower()
+    if filename.endswith(".json") or "json" in content_type:
+        return "json"
+    if filename.endswith(".csv") or "csv" in content_type or content_type.startswith("text/"):
+        return "csv"
+    raise ImportFormatError("Formato não suportado: envie um arquivo .csv ou .json.")
+
+def iter_csv_rows(stream: IO[bytes]) -> Iterator[Tuple[int, dict]]:
+    """Lê o CSV linha a linha, detectando ';' ou ',' como separador."""
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    try:
+        sample = text.read(4096)
+    except UnicodeDecodeError as e:
+        raise ImportFormatError(f"CSV inválido: {e}")
+    text.seek(0)
+    try:
+        dialect = csv.Sniffer().sniff(sample, delimiters=";,")
+    except csv.Error:
+        dialect = csv.excel
+    reader = csv.DictReader(text, dialect=dialect)
+    try:
+        # A linha 1 é o cabeçalho
+        for row_number, row in enumerate(reader, start=2):
+            yield row_number, _normalize_row(row)
+    except (UnicodeDecodeError, csv.Error) as e:
+        raise ImportFormatError(f"CSV inválido: {e}")
+    finally:
+        text.detach()
+
+def iter_json_rows(stream: IO[bytes]) -> Iterator[Tuple[int, dict]]:
+    try:
+        payload = json.load(stream)
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        raise ImportFormatError(f"JSON inválido: {e}")
+    if isinstance(payload, dict) and isinstance(payload.get("expenses"), list):
+        payload = payload["expenses"]
+    if not isinstance(payload, list):
+        raise ImportFormatError("O JSON deve ser uma lista de despesas.")
+    for row_number, row in enumerate(payload, start=1):
+        yield row_number, _normalize_row(row) if isinstance(row, dict) else {}
+
+def iter_expense_rows(stream: IO[bytes], fmt: str) -> Iterator[Tuple[int, dict]]:
+    return iter_csv_rows(stream) if fmt == "csv" else iter_json_rows(stream)
@@ -1,30 +1,35 @@
 # backend/main.py
-import shutil
-from fastapi import Depends, FastAPI, HTTPException, status, File, UploadFile, Form
+from fastapi import BackgroundTasks, Depends, FastAPI, HTTPException, status, File, UploadFile, Form, Query, Request
 from fastapi.security import OAuth2PasswordRequestForm
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse
+from fastapi.responses import FileResponse, HTMLResponse, JSONResponse, PlainTextResponse, RedirectResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from starlette.concurrency import run_in_threadpool
+from typing import List, Literal, Optional, Union
+import asyncio
+import hashlib
 import os
+import secrets
 import time
 from datetime import datetime
 
 try:
-    from . import auth, crud, models, schemas, pdf_generator
-    from .database import SessionLocal, engine
+    from . import alerts, auth, cache, config, crud, crud_async, events, images, importers, metrics, profiling, responses, schemas, reports, uploads
+    from .static import CachedStaticFiles, FrontendBundle, IMMUTABLE_CACHE_CONTROL
+    from .database import SessionLocal, async_engine, engine, get_async_db
 except ImportError:
     # Para execução direta ou no Replit
-    import auth, crud, models, schemas, pdf_generator
-    from database import SessionLocal, engine
+    import alerts, auth, cache, config, crud, crud_async, events, images, importers, metrics, profiling, responses, schemas, reports, uploads
+    from static import CachedStaticFiles, FrontendBundle, IMMUTABLE_CACHE_CONTROL
+    from database import SessionLocal, async_engine, engine, get_async_db
 from fastapi import Response
 
 # --- Criação do Banco de Dados e Diretórios ---
 
 # Cria o diretório para uploads se não existir
-if not os.path.exists("uploads"):
-    os.makedirs("uploads")
+if not os.path.exists(config.UPLOAD_DIR):
+    os.makedirs(config.UPLOAD_DIR)
 
 app = FastAPI(
     title="Ybyoca API",
@@ -32,6 +37,10 @@ app = FastAPI(
     version="1.0.0"
 )
 
+# --- Limite de upload ---
+# Adicionado primeiro: fica por dentro do CORS, então a resposta 413 também chega ao navegador
+app.add_middleware(uploads.UploadLimitMiddleware)
+
 # --- Configuração CORS ---
 app.add_middleware(
     CORSMiddleware,
@@ -41,57 +50,93 @@ app.add_middleware(
     allow_headers=["*"],  # Permitir todos os headers
 )
 
-# --- Criação de Usuário Inicial ---
-def create_initial_user():
-    print("[DEBUG] Tentando criar usuário inicial...")
+# --- Compressão (gzip/brotli) ---
+if config.COMPRESSION_ENABLED:
+    app.add_middleware(responses.CompressionMiddleware)
+
+# --- Perfil sob demanda ---
+if config.PROFILING_ENABLED:
+    # Fica dentro do middleware de métricas para ler o tempo de SQL da requisição
+    app.add_middleware(profiling.ProfilingMiddleware)
+
+# --- Métricas (Prometheus) ---
+if config.METRICS_ENABLED:
+    metrics.instrument_engine(engine, "sync")
+    metrics.instrument_engine(async_engine.sync_engine, "async")
+    # Adicionado por último: é o middleware mais externo e mede também o CORS
+    app.add_middleware(metrics.MetricsMiddleware)
+
+# --- Ciclo de Vida ---
+# A inicialização não cria tabelas nem usuários: o esquema e o usuário inicial são
+# preparados uma única vez por "python -m backend.manage migrate" e "seed", antes dos workers
+
+def run_alert_sweep():
     db = SessionLocal()
     try:
-        # Verifica se o usuário admin já existe
-        admin_user = crud.get_user_by_email(db, email="admin@ybyoca.com")
-        if not admin_user:
-            print("[DEBUG] Usuário admin não encontrado, criando um novo.")
-            # Se não existir, cria um novo usuário arquiteto
-            user_in = schemas.UserCreate(
-                email="admin@ybyoca.com",
-                password="admin", # Senha provisória
-                role="architect"
-            )
-            crud.create_user(db=db, user=user_in)
-            print("[SUCCESS] Usuário administrador padrão 'admin@ybyoca.com' criado com sucesso.")
-        else:
-            print("[DEBUG] Usuário admin 'admin@ybyoca.com' já existe no banco de dados.")
-    except Exception as e:
-        print(f"[ERROR] Ocorreu um erro durante a criação do usuário inicial: {e}")
+        # Todos os workers têm o laço, mas só um varre por vez (trava entre processos)
+        return alerts.exclusive_sweep(db)
     finally:
-        print("[DEBUG] Fechando sessão do banco de dados de inicialização.")
         db.close()
 
+async def alert_sweep_loop():
+    # Regras de prazo mudam com o tempo: reavaliadas periodicamente, fora do event loop
+    while True:
+        await asyncio.sleep(config.ALERT_SWEEP_INTERVAL_SECONDS)
+        try:
+            await run_in_threadpool(run_alert_sweep)
+        except Exception as e:
+            print(f"[ERROR] Falha na varredura de alertas: {e}")
+
 @app.on_event("startup")
-def startup_event():
-    print("[STARTUP] Criando tabelas do banco de dados...")
-    models.Base.metadata.create_all(bind=engine)
-    print("[STARTUP] Tabelas criadas.")
-    create_initial_user()
+async def startup_event():
+    app.state.alert_sweep = None
+    if config.ALERT_SWEEP_INTERVAL_SECONDS > 0:
+        app.state.alert_sweep = asyncio.create_task(alert_sweep_loop())
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    if app.state.alert_sweep is not None:
+        app.state.alert_sweep.cancel()
+    reports.shutdown()
+    auth.shutdown()
+    events.broker.close()
+    await async_engine.dispose()
 
-# Monta o diretório 'uploads' para ser acessível via /uploads
-app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
-# Monta o diretório 'frontend' para servir o CSS e JS
-app.mount("/frontend", StaticFiles(directory="frontend"), name="frontend")
 
-# --- Dependências ---
+# Monta o diretório 'uploads' para ser acessível via /uploads
+app.mount("/uploads", CachedStaticFiles(directory=config.UPLOAD_DIR), name="uploads")
+# Frontend (página, CSS e JS) carregado e pré-comprimido uma única vez, com URLs pelo hash do conteúdo
+# Caminho a partir deste arquivo: o servidor pode ser iniciado de qualquer diretório
+FRONTEND_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "frontend"))
+frontend = FrontendBundle(FRONTEND_DIR)
+
+def frontend_response(request: Request, asset, cache_control: str) -> Response:
+    if etag_matches(request, asset.etag):
+        return not_modified(asset.etag, cache_control)
+    body, encoding = asset.body(responses.negotiate_encoding(request.headers.get("accept-encoding", "")))
+    headers = {"ETag": asset.etag, "Cache-Control": cache_control}
+    if len(asset.bodies) > 1:
+        headers["Vary"] = "Accept-Encoding"
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type=asset.media_type, headers=headers)
+
+def serve_frontend_file(request: Request, path: str) -> Response:
+    asset = frontend.get(path)
+    if asset is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Arquivo não encontrado.")
+    return frontend_response(request, asset, frontend.cache_control(path))
 
 @app.get("/", response_class=HTMLResponse)
-async def serve_frontend():
-    import os
-    try:
-        # Tenta ler com UTF-8 (codificação moderna)
-        with open("frontend/index.html", encoding="utf-8") as f:
-            return HTMLResponse(content=f.read(), status_code=200)
-    except UnicodeDecodeError:
-        # Se falhar, tenta com a codificação padrão do sistema
-        with open("frontend/index.html", encoding="cp1252") as f:
-            return HTMLResponse(content=f.read(), status_code=200)
+async def serve_frontend(request: Request):
+    # A página revalida a cada acesso (ETag) para receber as URLs novas após um deploy
+    return serve_frontend_file(request, "index.html")
+
+@app.api_route("/frontend/{path:path}", methods=["GET", "HEAD"], include_in_schema=False)
+async def serve_frontend_asset(path: str, request: Request):
+    return serve_frontend_file(request, path)
+
+# --- Dependências ---
 
 def get_db():
     db = SessionLocal()
@@ -100,25 +145,87 @@ def get_db():
     finally:
         db.close()
 
+def fetch_page(fetch, *args, **kwargs):
+    """Executa uma consulta paginada do crud, convertendo cursores inválidos em 400."""
+    try:
+        return fetch(*args, **kwargs)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+async def fetch_page_async(fetch, *args, **kwargs):
+    """Versão de fetch_page para as consultas de crud_async."""
+    try:
+        return await fetch(*args, **kwargs)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+async def run_password_hashing(operation, *args):
+    """Executa o bcrypt no pool dedicado; com a fila cheia responde 503 em vez de acumular requisições."""
+    try:
+        return await operation(*args)
+    except auth.HashingBusy as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e), headers={"Retry-After": "1"})
+
+# --- GET condicional (ETag) ---
 
+CONDITIONAL_CACHE_CONTROL = "private, no-cache"
+
+def weak_etag(*parts) -> str:
+    """ETag fraco a partir da versão do conteúdo e dos parâmetros que alteram a resposta."""
+    return f'W/"{hashlib.sha1(repr(parts).encode()).hexdigest()[:16]}"'
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Comparação fraca com o If-None-Match (aceita lista de ETags e "*")."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = {value.strip().removeprefix("W/") for value in header.split(",")}
+    return etag.removeprefix("W/") in candidates
+
+def conditional_headers(response: Response, etag: str):
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CONDITIONAL_CACHE_CONTROL
+
+def not_modified(etag: str, cache_control: str = CONDITIONAL_CACHE_CONTROL) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag, "Cache-Control": cache_control})
+
+# Serializadores sem validação para a listagem de projetos (dados lidos do banco)
+dump_project = responses.orm_dumper(schemas.Project)
+dump_project_summary = responses.orm_dumper(schemas.ProjectSummary)
 
 # --- Endpoints de Autenticação ---
 
 @app.post("/token", response_model=schemas.Token)
-def login_for_access_token(db: Session = Depends(get_db), form_data: OAuth2PasswordRequestForm = Depends()):
-    user = crud.get_user_by_email(db, email=form_data.username)
-    if not user or not auth.verify_password(form_data.password, user.hashed_password):
+async def login_for_access_token(db: AsyncSession = Depends(get_async_db), form_data: OAuth2PasswordRequestForm = Depends()):
+    user = await crud_async.get_user_by_email(db, email=form_data.username)
+    verified, new_hash = False, None
+    if user:
+        verified, new_hash = await run_password_hashing(
+            auth.verify_and_update_password_async, form_data.password, user.hashed_password
+        )
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="E-mail ou senha incorretos",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    if new_hash:
+        # Custo do bcrypt alterado desde o último login: regrava o hash com os parâmetros atuais
+        await crud_async.update_user_password_hash(db, user.id, new_hash)
     access_token = auth.create_access_token(data={"sub": user.email})
     return {"access_token": access_token, "token_type": "bearer"}
 
 # --- Endpoints de Usuários ---
 
-async def get_current_active_user(token: str = Depends(auth.oauth2_scheme), db: Session = Depends(get_db)) -> models.User:
+async def get_current_active_user(token: str = Depends(auth.oauth2_scheme), db: AsyncSession = Depends(get_async_db)) -> schemas.User:
+    # Tokens já validados ficam em cache até expirarem, evitando decodificar o JWT
+    # e consultar o banco a cada requisição
+    principal = cache.user_cache.get(token)
+    if principal is not None:
+        return principal
+
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Não foi possível validar as credenciais",
@@ -132,36 +239,139 @@ async def get_current_active_user(token: str = Depends(auth.oauth2_scheme), db:
         token_data = schemas.TokenData(email=email)
     except auth.JWTError:
         raise credentials_exception
-    user = crud.get_user_by_email(db, email=token_data.email)
+    user = await crud_async.get_user_by_email(db, email=token_data.email)
     if user is None:
         raise credentials_exception
-    return user
+
+    principal = schemas.User.model_validate(user)
+    expires_in = payload["exp"] - time.time() if payload.get("exp") else None
+    cache.user_cache.set(token, principal, ttl=expires_in)
+    return principal
+
+# --- Autorização por Projeto ---
+
+ALL_ROLES = ('architect', 'client')
+
+def authorize_project(
+    db: Session,
+    project_id: int,
+    current_user: schemas.User,
+    roles: tuple = ALL_ROLES,
+    detail: str = "Sem permissão para acessar este projeto."
+):
+    """Garante que o usuário (com um dos papéis aceitos) é dono ou cliente do projeto.
+
+    O caminho feliz custa um único EXISTS; a verificação de existência do projeto
+    só é feita quando o acesso é negado, para diferenciar 404 de 403.
+    """
+    if current_user.role in roles and crud.can_access_project(db, project_id, current_user.id, current_user.role):
+        return
+    if not crud.project_exists(db, project_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Projeto não encontrado.")
+    raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=detail)
+
+def require_project_access(roles: tuple = ALL_ROLES, detail: str = "Sem permissão para acessar este projeto."):
+    """Dependência para rotas com {project_id} no caminho."""
+    def dependency(
+        project_id: int,
+        db: Session = Depends(get_db),
+        current_user: schemas.User = Depends(get_current_active_user)
+    ):
+        authorize_project(db, project_id, current_user, roles, detail)
+    return dependency
+
+async def authorize_project_async(
+    db: AsyncSession,
+    project_id: int,
+    current_user: schemas.User,
+    roles: tuple = ALL_ROLES,
+    detail: str = "Sem permissão para acessar este projeto."
+):
+    """Mesma regra de authorize_project, sem bloquear o event loop."""
+    if current_user.role in roles and await crud_async.can_access_project(db, project_id, current_user.id, current_user.role):
+        return
+    if not await crud_async.project_exists(db, project_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Projeto não encontrado.")
+    raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=detail)
+
+def require_project_access_async(roles: tuple = ALL_ROLES, detail: str = "Sem permissão para acessar este projeto."):
+    """Dependência assíncrona para as rotas de leitura que usam crud_async."""
+    async def dependency(
+        project_id: int,
+        db: AsyncSession = Depends(get_async_db),
+        current_user: schemas.User = Depends(get_current_active_user)
+    ):
+        await authorize_project_async(db, project_id, current_user, roles, detail)
+    return dependency
 
 @app.get("/users/me", response_model=schemas.User)
-def read_users_me(current_user: models.User = Depends(get_current_active_user)):
+async def read_users_me(current_user: schemas.User = Depends(get_current_active_user)):
     return current_user
 
 @app.post("/users/", response_model=schemas.User)
-def create_client_user(user: schemas.UserCreate, db: Session = Depends(get_db), current_user: models.User = Depends(get_current_active_user)):
+async def create_client_user(user: schemas.UserCreate, db: Session = Depends(get_db), current_user: schemas.User = Depends(get_current_active_user)):
     if current_user.role != 'architect':
         raise HTTPException(status_code=403, detail="Apenas arquitetos podem criar usuários.")
-    db_user = crud.get_user_by_email(db, email=user.email)
+    db_user = await run_in_threadpool(crud.get_user_by_email, db, email=user.email)
     if db_user:
         raise HTTPException(status_code=400, detail="E-mail já registrado.")
     user.role = 'client' # Garante que o arquiteto só crie clientes
-    return crud.create_user(db=db, user=user)
+    hashed_password = await run_password_hashing(auth.get_password_hash_async, user.password)
+    return await run_in_threadpool(crud.create_user, db=db, user=user, hashed_password=hashed_password)
 
-@app.get("/users/clients", response_model=List[schemas.User])
-def get_all_clients(db: Session = Depends(get_db), current_user: models.User = Depends(get_current_active_user)):
+@app.get("/users/clients", response_model=schemas.Page[schemas.User])
+def get_all_clients(
+    db: Session = Depends(get_db),
+    current_user: schemas.User = Depends(get_current_active_user),
+    cursor: Optional[str] = None,
+    limit: int = Query(crud.DEFAULT_PAGE_SIZE, ge=1, le=crud.MAX_PAGE_SIZE)
+):
     if current_user.role != 'architect':
         raise HTTPException(status_code=403, detail="Acesso não permitido.")
-    users = crud.get_users(db)
-    return [user for user in users if user.role == 'client']
+    return fetch_page(crud.get_users_page, db, role='client', cursor=cursor, limit=limit)
+
+@app.get("/cache/stats")
+def get_cache_stats(current_user: schemas.User = Depends(get_current_active_user)):
+    if current_user.role != 'architect':
+        raise HTTPException(status_code=403, detail="Acesso não permitido.")
+    return {"users": cache.user_cache.stats(), "password_hashing": auth.hashing_stats()}
+
+def require_profiling_user(current_user: schemas.User = Depends(get_current_active_user)) -> schemas.User:
+    if not config.PROFILING_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not profiling.can_profile(current_user.email):
+        raise HTTPException(status_code=403, detail="Acesso não permitido.")
+    return current_user
+
+@app.get("/profiles", dependencies=[Depends(require_profiling_user)])
+def list_profiles():
+    return profiling.list_profiles()
+
+@app.get("/profiles/{profile_id}", response_class=PlainTextResponse, dependencies=[Depends(require_profiling_user)])
+def download_profile(profile_id: str):
+    path = profiling.profile_path(profile_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Perfil não encontrado.")
+    return FileResponse(path, media_type="text/plain; charset=utf-8", filename=f"{profile_id}.folded")
+
+async def require_metrics_access(token: str = Depends(auth.oauth2_scheme), db: AsyncSession = Depends(get_async_db)):
+    if not config.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+    # O Prometheus usa o token fixo de METRICS_TOKEN (os JWT expiram); fora isso, só arquitetos
+    if config.METRICS_TOKEN and secrets.compare_digest(token.encode(), config.METRICS_TOKEN.encode()):
+        return
+    current_user = await get_current_active_user(token, db)
+    if current_user.role != 'architect':
+        raise HTTPException(status_code=403, detail="Acesso não permitido.")
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False, dependencies=[Depends(require_metrics_access)])
+def get_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
 
 # --- Endpoints de Projetos ---
 
 @app.post("/projects/", response_model=schemas.Project)
-def create_project(project: schemas.ProjectCreate, db: Session = Depends(get_db), current_user: models.User = Depends(get_current_active_user)):
+def create_project(project: schemas.ProjectCreate, db: Session = Depends(get_db), current_user: schemas.User = Depends(get_current_active_user)):
     if current_user.role != 'architect':
         raise HTTPException(status_code=403, detail="Apenas arquitetos podem criar projetos.")
     
@@ -172,94 +382,229 @@ def create_project(project: schemas.ProjectCreate, db: Session = Depends(get_db)
 
     return crud.create_project(db=db, project=project, architect_id=current_user.id)
 
-@app.get("/projects/", response_model=List[schemas.Project])
-def read_projects(db: Session = Depends(get_db), current_user: models.User = Depends(get_current_active_user), status: Optional[str] = None):
-    if current_user.role == 'architect':
-        return crud.get_projects_by_architect(db, architect_id=current_user.id, status=status)
-    else: # Cliente
-        return crud.get_projects_by_client(db, client_id=current_user.id)
-
-@app.put("/projects/{project_id}/finalize", response_model=schemas.Project)
-def finalize_project(
-    project_id: int,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user)
+@app.get("/projects/", response_model=Union[schemas.Page[schemas.Project], schemas.Page[schemas.ProjectSummary]])
+async def read_projects(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: schemas.User = Depends(get_current_active_user),
+    status: Optional[str] = None,
+    fields: Optional[str] = None,
+    client_id: Optional[int] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(crud.DEFAULT_PAGE_SIZE, ge=1, le=crud.MAX_PAGE_SIZE)
 ):
-    if current_user.role != 'architect':
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Apenas arquitetos podem finalizar projetos.")
-    
+    # ?fields=summary devolve os projetos sem as despesas embutidas
+    summary = fields == "summary"
+    filters = dict(status=status, created_from=created_from, created_to=created_to)
+    owner_id, client_id = (current_user.id, client_id) if current_user.role == 'architect' else (None, current_user.id)
+
+    # Quantidade, maior ID e soma das versões mudam a cada escrita: responde 304 sem carregar os projetos
+    version = await crud_async.get_projects_version(db, owner_id=owner_id, client_id=client_id, **filters)
+    etag = weak_etag("projects", owner_id, client_id, version, summary, status, created_from, created_to, cursor, limit)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    page = await fetch_page_async(
+        crud_async.get_projects_page, db, owner_id=owner_id, client_id=client_id,
+        with_expenses=not summary, cursor=cursor, limit=limit, **filters
+    )
+
+    # Objetos vindos do banco: serializa direto com orjson, sem validar cada projeto e despesa
+    dump = dump_project_summary if summary else dump_project
+    return responses.FastJSONResponse(
+        {"items": [dump(p) for p in page["items"]], "next_cursor": page["next_cursor"]},
+        headers={"ETag": etag, "Cache-Control": CONDITIONAL_CACHE_CONTROL},
+    )
+
+@app.put(
+    "/projects/{project_id}/finalize",
+    response_model=schemas.Project,
+    dependencies=[Depends(require_project_access(('architect',), "Você não tem permissão para finalizar este projeto."))]
+)
+def finalize_project(project_id: int, db: Session = Depends(get_db)):
     project = crud.get_project(db, project_id=project_id)
-    if not project:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Projeto não encontrado.")
-    if project.owner_id != current_user.id:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Você não tem permissão para finalizar este projeto.")
     if project.status == "Concluída":
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Projeto já está concluído.")
 
     updated_project = crud.update_project_status(db, project_id, "Concluída", datetime.utcnow())
     return updated_project
 
-@app.get("/projects/{project_id}/report")
-def get_project_report(
-    project_id: int,
+def report_job_schema(job: reports.ReportJob) -> schemas.ReportJob:
+    return schemas.ReportJob(
+        job_id=job.id,
+        project_id=job.project_id,
+        status=job.status,
+        download_url=f"/report-jobs/{job.id}/download"
+    )
+
+def report_job_response(job: reports.ReportJob) -> JSONResponse:
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content=report_job_schema(job).model_dump(),
+        headers={"Location": f"/report-jobs/{job.id}"}
+    )
+
+@app.get(
+    "/projects/{project_id}/report",
+    dependencies=[Depends(require_project_access(detail="Você não tem permissão para acessar este relatório."))]
+)
+def get_project_report(project_id: int, request: Request, db: Session = Depends(get_db)):
+    # A versão do conteúdo identifica o PDF: serve do cache ou responde 304 sem renderizar
+    version, expense_count = crud.get_project_content_version(db, project_id)
+    etag = f'"report-{project_id}-{version}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    pdf_bytes = reports.get_cached(project_id, version)
+    if pdf_bytes is None:
+        project = crud.get_project_with_expenses(db, project_id)
+        if expense_count > config.REPORT_ASYNC_THRESHOLD:
+            # Projetos grandes: renderiza em segundo plano e o cliente acompanha pelo job
+            return report_job_response(reports.submit(project, version))
+        pdf_bytes = reports.render(project, version)
+
+    return Response(content=pdf_bytes, media_type='application/pdf', headers=headers)
+
+@app.post(
+    "/projects/{project_id}/report/jobs",
+    status_code=status.HTTP_202_ACCEPTED,
+    response_model=schemas.ReportJob,
+    dependencies=[Depends(require_project_access(detail="Você não tem permissão para acessar este relatório."))]
+)
+def request_project_report(project_id: int, db: Session = Depends(get_db)):
+    version, _ = crud.get_project_content_version(db, project_id)
+    return report_job_response(reports.submit(crud.get_project_with_expenses(db, project_id), version))
+
+def get_authorized_report_job(job_id: str, db: Session, current_user: schemas.User) -> reports.ReportJob:
+    job = reports.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Relatório não encontrado.")
+    authorize_project(db, job.project_id, current_user, detail="Você não tem permissão para acessar este relatório.")
+    return job
+
+@app.get("/report-jobs/{job_id}", response_model=schemas.ReportJob)
+def get_report_job(
+    job_id: str,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user)
+    current_user: schemas.User = Depends(get_current_active_user)
 ):
-    project = crud.get_project(db, project_id=project_id)
-    if not project:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Projeto não encontrado.")
+    return report_job_schema(get_authorized_report_job(job_id, db, current_user))
 
-    # Valida se o usuário tem permissão para ver o relatório
-    if current_user.role == 'client':
-        client_projects = crud.get_projects_by_client(db, client_id=current_user.id)
-        client_project_ids = {p.id for p in client_projects}
-        if project.id not in client_project_ids:
-            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Você não tem permissão para acessar este relatório.")
-    elif current_user.role == 'architect':
-        if project.owner_id != current_user.id:
-            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Você não tem permissão para acessar este relatório.")
-    
-    pdf_bytes = pdf_generator.create_project_report(project)
-    
-    return Response(content=pdf_bytes, media_type='application/pdf')
+@app.get("/report-jobs/{job_id}/download")
+def download_report_job(
+    job_id: str,
+    db: Session = Depends(get_db),
+    current_user: schemas.User = Depends(get_current_active_user)
+):
+    job = get_authorized_report_job(job_id, db, current_user)
+    if job.status == "failed":
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Falha ao gerar o relatório.")
+    if job.status != "done":
+        return report_job_response(job)
+    etag = f'"report-{job.project_id}-{job.version}"'
+    return Response(content=job.future.result(), media_type='application/pdf', headers={"ETag": etag})
+
+# --- Endpoints do Dashboard ---
+
+@app.get("/dashboard/summary", response_model=schemas.DashboardSummary)
+async def get_dashboard_summary(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: schemas.User = Depends(get_current_active_user),
+    project_id: Optional[int] = None,
+    status: Optional[str] = None
+):
+    if current_user.role == 'architect':
+        return await crud_async.get_dashboard_summary(db, owner_id=current_user.id, project_id=project_id, status=status)
+    else: # Cliente
+        return await crud_async.get_dashboard_summary(db, client_id=current_user.id, project_id=project_id, status=status)
 
 # --- Endpoints de Despesas ---
 
-@app.post("/projects/{project_id}/expenses/", response_model=schemas.Expense)
-def create_expense_for_project(
+@app.post(
+    "/projects/{project_id}/expenses/",
+    response_model=schemas.Expense,
+    dependencies=[Depends(require_project_access(('architect',), "Você não tem permissão para adicionar despesas a este projeto."))]
+)
+async def create_expense_for_project(
     project_id: int,
+    background_tasks: BackgroundTasks,
     name: str = Form(...),
-    value: float = Form(...),
+    value: float = Form(..., allow_inf_nan=False),
     category: str = Form(...),
     photo: Optional[UploadFile] = File(None),
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user)
+    db: Session = Depends(get_db)
 ):
-    if current_user.role != 'architect':
-        raise HTTPException(status_code=403, detail="Apenas arquitetos podem adicionar despesas.")
-
-    project = crud.get_project(db, project_id=project_id)
-    if not project or project.owner_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Você não tem permissão para adicionar despesas a este projeto.")
-
     photo_url = None
     if photo:
-        _, extension = os.path.splitext(photo.filename)
-        safe_filename = f"{int(time.time())}_{project_id}{extension}"
-        file_location = f"uploads/{safe_filename}"
-        with open(file_location, "wb+") as file_object:
-            shutil.copyfileobj(photo.file, file_object)
-        photo_url = f"/{file_location}"
-    
+        try:
+            photo_url = await uploads.save_upload(photo)
+        except uploads.UploadTooLarge as e:
+            raise HTTPException(status_code=413, detail=str(e))
+        # Miniaturas geradas depois que a resposta for enviada
+        background_tasks.add_task(images.generate_derivatives, photo_url)
+
     expense_data = schemas.ExpenseCreate(name=name, value=value, category=category)
-    
-    return crud.create_expense(db=db, project_id=project_id, expense=expense_data, photo_url=photo_url)
+
+    # O acesso ao banco é síncrono: roda no threadpool para não bloquear o event loop
+    return await run_in_threadpool(crud.create_expense, db=db, project_id=project_id, expense=expense_data, photo_url=photo_url)
+
+@app.post(
+    "/projects/{project_id}/expenses/import",
+    response_model=schemas.ExpenseImportResult,
+    dependencies=[Depends(require_project_access(('architect',), "Você não tem permissão para adicionar despesas a este projeto."))]
+)
+def import_expenses(
+    project_id: int,
+    file: UploadFile = File(...),
+    atomic: bool = True,
+    db: Session = Depends(get_db)
+):
+    """Importa despesas de um CSV (name;value;category) ou JSON (lista de objetos).
+
+    Com atomic=true (padrão) nada é gravado se alguma linha for inválida.
+    """
+    try:
+        fmt = importers.detect_format(file.filename, file.content_type)
+        rows = importers.iter_expense_rows(file.file, fmt)
+        return crud.bulk_create_expenses(db, project_id, rows, atomic=atomic)
+    except importers.ImportFormatError as e:
+        db.rollback()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+@app.get(
+    "/projects/{project_id}/expenses/",
+    response_model=schemas.Page[schemas.Expense],
+    dependencies=[Depends(require_project_access_async())]
+)
+async def get_project_expenses(
+    project_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    category: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(crud.DEFAULT_PAGE_SIZE, ge=1, le=crud.MAX_PAGE_SIZE)
+):
+    return await fetch_page_async(crud_async.get_expenses_page, db, project_id=project_id, category=category, cursor=cursor, limit=limit)
+
+@app.get("/media/{variant}/{filename}")
+def get_photo_variant(variant: str, filename: str):
+    if variant not in images.VARIANTS:
+        raise HTTPException(status_code=404, detail="Variante não encontrada.")
+    path = images.ensure_derivative(filename, variant)
+    if path is None:
+        # Sem Pillow ou imagem ilegível: serve o original
+        if not os.path.exists(os.path.join(config.UPLOAD_DIR, os.path.basename(filename))):
+            raise HTTPException(status_code=404, detail="Foto não encontrada.")
+        return RedirectResponse(url=f"/uploads/{os.path.basename(filename)}")
+    return FileResponse(path, media_type=images.media_type(), headers={"Cache-Control": IMMUTABLE_CACHE_CONTROL})
 
 @app.delete("/expenses/{expense_id}")
 def delete_expense(
     expense_id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user)
+    current_user: schemas.User = Depends(get_current_active_user)
 ):
     if current_user.role != 'client':
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Apenas clientes podem excluir despesas.")
@@ -268,67 +613,213 @@ def delete_expense(
     if not expense:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Despesa não encontrada.")
 
-    client_projects = crud.get_projects_by_client(db, client_id=current_user.id)
-    client_project_ids = {p.id for p in client_projects}
-    if expense.project_id not in client_project_ids:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Você não tem permissão para excluir esta despesa.")
+    authorize_project(db, expense.project_id, current_user, ('client',), "Você não tem permissão para excluir esta despesa.")
 
     crud.delete_expense(db, expense_id=expense_id)
     return {"message": "Despesa excluída com sucesso."}
 
-# --- Endpoints de Fases do Projeto (Cronograma) ---
+# --- Eventos em Tempo Real (Server-Sent Events) ---
 
-@app.get("/projects/{project_id}/phases", response_model=List[schemas.ProjectPhase])
-def get_project_phases(
-    project_id: int,
+@app.get("/events")
+async def stream_events(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    access_token: Optional[str] = None,
+    project_id: Optional[int] = None
+):
+    """Stream de alterações dos projetos do usuário (ou de um único projeto).
+
+    O EventSource do navegador não envia cabeçalhos, por isso o token também é aceito
+    em ?access_token=.
+    """
+    token = access_token
+    authorization = request.headers.get("authorization", "")
+    if not token and authorization.lower().startswith("bearer "):
+        token = authorization[7:]
+    if not token:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Não autenticado", headers={"WWW-Authenticate": "Bearer"})
+    current_user = await get_current_active_user(token=token, db=db)
+
+    if project_id is not None:
+        await authorize_project_async(db, project_id, current_user)
+        project_ids = [project_id]
+    else:
+        project_ids = await crud_async.get_accessible_project_ids(db, current_user.id, current_user.role)
+    # A conexão com o banco não fica presa durante o stream
+    await db.close()
+
+    topics = [events.project_topic(pid) for pid in project_ids]
+    if project_id is None:
+        topics.append(events.user_topic(current_user.id))
+    subscription = events.broker.subscribe(topics)
+
+    async def event_stream():
+        try:
+            yield "retry: 5000\n\n"
+            while not await request.is_disconnected():
+                event = await subscription.get(timeout=config.EVENTS_KEEPALIVE_SECONDS)
+                if event is None:
+                    # Comentário SSE: mantém a conexão aberta através de proxies
+                    yield ": ping\n\n"
+                    continue
+                if event.type == "project.created" and project_id is None:
+                    subscription.topics.add(events.project_topic(event.project_id))
+                yield events.format_sse(event)
+        finally:
+            events.broker.unsubscribe(subscription)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+# --- Endpoints de Alertas ---
+
+@app.get("/alerts", response_model=schemas.Page[schemas.Alert])
+async def get_alerts(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: schemas.User = Depends(get_current_active_user),
+    project_id: Optional[int] = None,
+    is_active: Optional[bool] = True,
+    is_read: Optional[bool] = None,
+    severity: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(crud.DEFAULT_PAGE_SIZE, ge=1, le=crud.MAX_PAGE_SIZE)
+):
+    return await fetch_page_async(
+        crud_async.get_alert_feed_page, db, current_user.id, current_user.role, project_id=project_id,
+        is_active=is_active, is_read=is_read, severity=severity, cursor=cursor, limit=limit
+    )
+
+@app.put("/alerts/{alert_id}/read", response_model=schemas.Alert)
+def mark_alert_read(
+    alert_id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user)
+    current_user: schemas.User = Depends(get_current_active_user)
 ):
-    project = crud.get_project(db, project_id=project_id)
-    if not project:
-        raise HTTPException(status_code=404, detail="Projeto não encontrado.")
+    alert = crud.get_alert(db, alert_id)
+    if not alert:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Alerta não encontrado.")
 
-    # Verificar permissão
-    if current_user.role == 'architect' and project.owner_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Sem permissão para acessar este projeto.")
-    elif current_user.role == 'client':
-        client_projects = crud.get_projects_by_client(db, client_id=current_user.id)
-        client_project_ids = {p.id for p in client_projects}
-        if project_id not in client_project_ids:
-            raise HTTPException(status_code=403, detail="Sem permissão para acessar este projeto.")
+    authorize_project(db, alert.project_id, current_user, detail="Você não tem permissão para acessar este alerta.")
 
-    return crud.get_project_phases(db, project_id=project_id)
+    return crud.mark_alert_read(db, alert_id)
 
-@app.post("/projects/{project_id}/phases", response_model=schemas.ProjectPhase)
-def create_project_phase(
+# --- Endpoints de Fluxo de Caixa ---
+
+@app.post(
+    "/projects/{project_id}/cashflow",
+    response_model=schemas.CashFlowBulkResult,
+    dependencies=[Depends(require_project_access(('architect',), "Apenas arquitetos podem lançar no fluxo de caixa."))]
+)
+def create_cash_flow_entries(
     project_id: int,
-    phase: schemas.ProjectPhaseCreate,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user)
+    payload: schemas.CashFlowBulkCreate,
+    db: Session = Depends(get_db)
 ):
-    project = crud.get_project(db, project_id=project_id)
-    if not project:
-        raise HTTPException(status_code=404, detail="Projeto não encontrado.")
+    return crud.create_cash_flow_entries(db, project_id=project_id, entries=payload.entries)
 
-    if current_user.role != 'architect' or project.owner_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Apenas arquitetos podem criar fases.")
+@app.get(
+    "/projects/{project_id}/cashflow",
+    response_model=schemas.CashFlowSeries,
+    dependencies=[Depends(require_project_access_async())]
+)
+async def get_cash_flow_series(
+    project_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    bucket: Literal["week", "month"] = "month",
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None
+):
+    return await crud_async.get_cash_flow_series(db, project_id, bucket=bucket, date_from=date_from, date_to=date_to)
+
+@app.get(
+    "/projects/{project_id}/cashflow/entries",
+    response_model=schemas.Page[schemas.CashFlow],
+    dependencies=[Depends(require_project_access_async())]
+)
+async def get_cash_flow_entries(
+    project_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    transaction_type: Optional[str] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(crud.DEFAULT_PAGE_SIZE, ge=1, le=crud.MAX_PAGE_SIZE)
+):
+    return await fetch_page_async(
+        crud_async.get_cash_flows_page, db, project_id=project_id, transaction_type=transaction_type,
+        date_from=date_from, date_to=date_to, cursor=cursor, limit=limit
+    )
+
+# --- Endpoints de Fases do Projeto (Cronograma) ---
 
+@app.get(
+    "/projects/{project_id}/phases",
+    response_model=schemas.Page[schemas.ProjectPhase],
+    dependencies=[Depends(require_project_access_async())]
+)
+async def get_project_phases(
+    project_id: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    status: Optional[str] = None,
+    start_from: Optional[datetime] = None,
+    start_to: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(crud.DEFAULT_PAGE_SIZE, ge=1, le=crud.MAX_PAGE_SIZE)
+):
+    version = await crud_async.get_project_version(db, project_id)
+    etag = weak_etag("phases", project_id, version, status, start_from, start_to, cursor, limit)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    conditional_headers(response, etag)
+    return await fetch_page_async(
+        crud_async.get_project_phases_page, db, project_id=project_id, status=status,
+        start_from=start_from, start_to=start_to, cursor=cursor, limit=limit
+    )
+
+@app.post(
+    "/projects/{project_id}/phases",
+    response_model=schemas.ProjectPhase,
+    dependencies=[Depends(require_project_access(('architect',), "Apenas arquitetos podem criar fases."))]
+)
+def create_project_phase(
+    project_id: int,
+    phase: schemas.ProjectPhaseCreate,
+    db: Session = Depends(get_db)
+):
     return crud.create_project_phase(db=db, phase=phase, project_id=project_id)
 
+@app.patch(
+    "/projects/{project_id}/phases",
+    response_model=List[schemas.ProjectPhase],
+    dependencies=[Depends(require_project_access(('architect',), "Apenas arquitetos podem atualizar fases."))]
+)
+def bulk_update_project_phases(
+    project_id: int,
+    payload: schemas.ProjectPhaseBatchUpdate,
+    db: Session = Depends(get_db)
+):
+    phases = crud.bulk_update_project_phases(db, project_id=project_id, updates=payload.updates)
+    if phases is None:
+        raise HTTPException(status_code=404, detail="Uma ou mais fases não foram encontradas neste projeto.")
+    return phases
+
 @app.put("/phases/{phase_id}", response_model=schemas.ProjectPhase)
 def update_project_phase(
     phase_id: int,
-    phase_data: dict,
+    phase_data: schemas.ProjectPhaseUpdate,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user)
+    current_user: schemas.User = Depends(get_current_active_user)
 ):
     phase = crud.get_project_phase(db, phase_id=phase_id)
     if not phase:
         raise HTTPException(status_code=404, detail="Fase não encontrada.")
 
-    project = crud.get_project(db, project_id=phase.project_id)
-    if current_user.role != 'architect' or project.owner_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Apenas arquitetos podem atualizar fases.")
+    authorize_project(db, phase.project_id, current_user, ('architect',), "Apenas arquitetos podem atualizar fases.")
 
     return crud.update_project_phase(db, phase_id=phase_id, phase_data=phase_data)
 
@@ -336,88 +827,99 @@ def update_project_phase(
 def delete_project_phase(
     phase_id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user)
+    current_user: schemas.User = Depends(get_current_active_user)
 ):
     phase = crud.get_project_phase(db, phase_id=phase_id)
     if not phase:
         raise HTTPException(status_code=404, detail="Fase não encontrada.")
 
-    project = crud.get_project(db, project_id=phase.project_id)
-    if current_user.role != 'architect' or project.owner_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Apenas arquitetos podem excluir fases.")
+    authorize_project(db, phase.project_id, current_user, ('architect',), "Apenas arquitetos podem excluir fases.")
 
     crud.delete_project_phase(db, phase_id=phase_id)
     return {"message": "Fase excluída com sucesso."}
 
 # --- Endpoints de Checklist (Controle de Qualidade) ---
 
-@app.get("/projects/{project_id}/checklist", response_model=List[schemas.Checklist])
-def get_project_checklist(
+@app.get(
+    "/projects/{project_id}/checklist",
+    response_model=schemas.Page[schemas.Checklist],
+    dependencies=[Depends(require_project_access_async())]
+)
+async def get_project_checklist(
     project_id: int,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user)
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    is_completed: Optional[bool] = None,
+    priority: Optional[str] = None,
+    due_from: Optional[datetime] = None,
+    due_to: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(crud.DEFAULT_PAGE_SIZE, ge=1, le=crud.MAX_PAGE_SIZE)
 ):
-    project = crud.get_project(db, project_id=project_id)
-    if not project:
-        raise HTTPException(status_code=404, detail="Projeto não encontrado.")
-
-    # Verificar permissão
-    if current_user.role == 'architect' and project.owner_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Sem permissão para acessar este projeto.")
-    elif current_user.role == 'client':
-        client_projects = crud.get_projects_by_client(db, client_id=current_user.id)
-        client_project_ids = {p.id for p in client_projects}
-        if project_id not in client_project_ids:
-            raise HTTPException(status_code=403, detail="Sem permissão para acessar este projeto.")
-
-    return crud.get_project_checklist(db, project_id=project_id)
+    version = await crud_async.get_project_version(db, project_id)
+    etag = weak_etag("checklist", project_id, version, is_completed, priority, due_from, due_to, cursor, limit)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    conditional_headers(response, etag)
+    return await fetch_page_async(
+        crud_async.get_project_checklist_page, db, project_id=project_id, is_completed=is_completed,
+        priority=priority, due_from=due_from, due_to=due_to, cursor=cursor, limit=limit
+    )
 
-@app.post("/projects/{project_id}/checklist", response_model=schemas.Checklist)
+@app.post(
+    "/projects/{project_id}/checklist",
+    response_model=schemas.Checklist,
+    dependencies=[Depends(require_project_access(('architect',), "Apenas arquitetos podem criar itens de checklist."))]
+)
 def create_checklist_item(
     project_id: int,
     item: schemas.ChecklistCreate,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user)
+    db: Session = Depends(get_db)
 ):
-    project = crud.get_project(db, project_id=project_id)
-    if not project:
-        raise HTTPException(status_code=404, detail="Projeto não encontrado.")
-
-    if current_user.role != 'architect' or project.owner_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Apenas arquitetos podem criar itens de checklist.")
-
     return crud.create_checklist_item(db=db, item=item, project_id=project_id)
 
 @app.put("/checklist/{item_id}/toggle", response_model=schemas.Checklist)
 def toggle_checklist_item(
     item_id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user)
+    current_user: schemas.User = Depends(get_current_active_user)
 ):
     item = crud.get_checklist_item(db, item_id=item_id)
     if not item:
         raise HTTPException(status_code=404, detail="Item de checklist não encontrado.")
 
-    project = crud.get_project(db, project_id=item.project_id)
-    if current_user.role != 'architect' or project.owner_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Apenas arquitetos podem atualizar checklist.")
+    authorize_project(db, item.project_id, current_user, ('architect',), "Apenas arquitetos podem atualizar checklist.")
 
     return crud.toggle_checklist_item(db, item_id=item_id)
 
+@app.patch(
+    "/projects/{project_id}/checklist",
+    response_model=List[schemas.Checklist],
+    dependencies=[Depends(require_project_access(('architect',), "Apenas arquitetos podem atualizar checklist."))]
+)
+def bulk_update_checklist_items(
+    project_id: int,
+    payload: schemas.ChecklistBatchUpdate,
+    db: Session = Depends(get_db)
+):
+    items = crud.bulk_update_checklist_items(db, project_id=project_id, updates=payload.updates)
+    if items is None:
+        raise HTTPException(status_code=404, detail="Um ou mais itens de checklist não foram encontrados neste projeto.")
+    return items
+
 @app.put("/checklist/{item_id}", response_model=schemas.Checklist)
 def update_checklist_item(
     item_id: int,
-    item_data: dict,
+    item_data: schemas.ChecklistUpdate,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user)
+    current_user: schemas.User = Depends(get_current_active_user)
 ):
     item = crud.get_checklist_item(db, item_id=item_id)
     if not item:
         raise HTTPException(status_code=404, detail="Item de checklist não encontrado.")
 
-    project = crud.get_project(db, project_id=item.project_id)
-    if current_user.role != 'architect' or project.owner_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Apenas arquitetos podem atualizar checklist.")
+    authorize_project(db, item.project_id, current_user, ('architect',), "Apenas arquitetos podem atualizar checklist.")
 
     return crud.update_checklist_item(db, item_id=item_id, item_data=item_data)
 
@@ -425,15 +927,13 @@ def update_checklist_item(
 def delete_checklist_item(
     item_id: int,
     db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user)
+    current_user: schemas.User = Depends(get_current_active_user)
 ):
     item = crud.get_checklist_item(db, item_id=item_id)
     if not item:
         raise HTTPException(status_code=404, detail="Item de checklist não encontrado.")
 
-    project = crud.get_project(db, project_id=item.project_id)
-    if current_user.role != 'architect' or project.owner_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Apenas arquitetos podem excluir checklist.")
+    authorize_project(db, item.project_id, current_user, ('architect',), "Apenas arquitetos podem excluir checklist.")
 
     crud.delete_checklist_item(db, item_id=item_id)
     return {"message": "Item de checklist excluído com sucesso."}
\ No newline at end of file
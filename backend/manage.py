@@ -0,0 +1,84 @@
+# backend/manage.py
+"""Comandos de manutenção. Uso: python -m backend.manage <comando> [opções]"""
+import argparse
+import json
+import sys
+
+from . import alerts, config, crud, schemas
+from .database import SessionLocal, engine
+
+def migrate(args) -> int:
+    """Aplica as migrações pendentes e preenche os totais de gastos de bancos antigos."""
+    from . import migrate as migrations  # Alembic só é carregado por este comando
+
+    migrations.upgrade(engine, args.revision)
+    db = SessionLocal()
+    try:
+        crud.backfill_spending_totals(db)
+    finally:
+        db.close()
+    print(f"Banco de dados atualizado até a revisão '{args.revision}'.")
+    return 0
+
+def seed(args) -> int:
+    """Cria o usuário arquiteto inicial (config.ADMIN_EMAIL), se ainda não existir."""
+    db = SessionLocal()
+    try:
+        if crud.get_user_by_email(db, email=config.ADMIN_EMAIL):
+            print(f"Usuário '{config.ADMIN_EMAIL}' já existe.")
+            return 0
+        user_in = schemas.UserCreate(email=config.ADMIN_EMAIL, password=config.ADMIN_PASSWORD, role="architect")
+        crud.create_user(db=db, user=user_in)
+    finally:
+        db.close()
+    print(f"Usuário administrador '{config.ADMIN_EMAIL}' criado.")
+    return 0
+
+def reconcile(args) -> int:
+    """Recalcula os totais de gastos a partir das despesas e informa as divergências."""
+    db = SessionLocal()
+    try:
+        report = crud.reconcile_spending(db, apply=args.apply)
+    finally:
+        db.close()
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    drifted = report["category_drift"] or report["spent_drift"]
+    # Código de saída 1 indica divergência não corrigida (útil em jobs agendados)
+    return 1 if drifted and not args.apply else 0
+
+def sweep_alerts(args) -> int:
+    """Reavalia os alertas de prazo (alternativa agendada à varredura dentro da API)."""
+    db = SessionLocal()
+    try:
+        evaluated = alerts.exclusive_sweep(db)
+    finally:
+        db.close()
+    if evaluated is None:
+        print("Outra varredura de alertas já está em andamento.")
+        return 0
+    print(f"{evaluated} projeto(s) reavaliado(s).")
+    return 0
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m backend.manage")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    migrate_parser = subparsers.add_parser("migrate", help="aplica as migrações do banco de dados")
+    migrate_parser.add_argument("--revision", default="head", help="revisão de destino (padrão: head)")
+    migrate_parser.set_defaults(func=migrate)
+
+    seed_parser = subparsers.add_parser("seed", help="cria o usuário administrador inicial")
+    seed_parser.set_defaults(func=seed)
+
+    reconcile_parser = subparsers.add_parser("reconcile", help="recalcula os totais de gastos por projeto")
+    reconcile_parser.add_argument("--apply", action="store_true", help="grava os totais recalculados")
+    reconcile_parser.set_defaults(func=reconcile)
+
+    sweep_parser = subparsers.add_parser("sweep-alerts", help="reavalia os alertas de prazo de todos os projetos")
+    sweep_parser.set_defaults(func=sweep_alerts)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,228 @@
+# backend/metrics.py
+"""Métricas da API no formato de texto do Prometheus (GET /metrics, com config.METRICS_TOKEN
+ou login de arquiteto).
+
+O MetricsMiddleware mede cada requisição (latência por rota, status, requisições em
+andamento) e abre um RequestStats no contexto da requisição. Os eventos de cursor das
+engines somam nele as consultas SQL e o tempo gasto no banco, inclusive nas rotas
+síncronas (o threadpool herda o contexto). Consultas acima de config.SLOW_QUERY_MS
+são registradas no log com a rota que as executou.
+"""
+import contextvars
+import threading
+import time
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+from sqlalchemy import event
+from starlette.datastructures import MutableHeaders
+
+from . import config
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+SLOW_QUERY_MAX_CHARS = 500
+
+_lock = threading.Lock()
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _labels(names: tuple, values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+class Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, label_names: Iterable[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self._series = {}
+
+    def header(self) -> list:
+        return [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, labels: tuple = (), amount: float = 1):
+        with _lock:
+            self._series[labels] = self._series.get(labels, 0) + amount
+
+    def render(self) -> list:
+        with _lock:
+            series = sorted(self._series.items())
+        return self.header() + [f"{self.name}{_labels(self.label_names, labels)} {_number(value)}" for labels, value in series]
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, labels: tuple, value: float):
+        with _lock:
+            self._series[labels] = value
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, label_names: Iterable[str] = (), buckets: tuple = LATENCY_BUCKETS):
+        super().__init__(name, help_text, label_names)
+        self.buckets = buckets
+
+    def observe(self, labels: tuple, value: float):
+        # Guarda a contagem por faixa; as faixas acumuladas do Prometheus são montadas no render
+        index = bisect_left(self.buckets, value)
+        with _lock:
+            counts, total = self._series.get(labels, ([0] * (len(self.buckets) + 1), 0.0))
+            counts[index] += 1
+            self._series[labels] = (counts, total + value)
+
+    def render(self) -> list:
+        with _lock:
+            series = sorted((labels, (list(counts), total)) for labels, (counts, total) in self._series.items())
+        lines = self.header()
+        for labels, (counts, total) in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else _number(bound)
+                bucket_label = f'le="{le}"'
+                lines.append(f"{self.name}_bucket{_labels(self.label_names, labels, bucket_label)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.label_names, labels)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(self.label_names, labels)} {cumulative}")
+        return lines
+
+# --- Métricas ---
+
+REQUESTS = Counter("ybyoca_http_requests_total", "Requisições HTTP por rota e status.", ("method", "route", "status"))
+LATENCY = Histogram("ybyoca_http_request_duration_seconds", "Latência das requisições HTTP por rota.", ("method", "route"))
+IN_FLIGHT = Gauge("ybyoca_http_requests_in_flight", "Requisições HTTP em andamento.")
+REQUEST_STATEMENTS = Histogram(
+    "ybyoca_http_request_sql_statements", "Consultas SQL executadas por requisição.", ("method", "route"), STATEMENT_BUCKETS
+)
+REQUEST_DB_TIME = Histogram("ybyoca_http_request_db_seconds", "Tempo total no banco por requisição.", ("method", "route"))
+STATEMENTS = Counter("ybyoca_db_statements_total", "Consultas SQL executadas.", ("engine",))
+STATEMENT_TIME = Histogram("ybyoca_db_statement_duration_seconds", "Duração das consultas SQL.", ("engine",))
+SLOW_STATEMENTS = Counter("ybyoca_db_slow_statements_total", "Consultas SQL acima de SLOW_QUERY_MS.", ("engine",))
+POOL_CHECKED_OUT = Gauge("ybyoca_db_pool_checked_out", "Conexões do pool em uso.", ("engine",))
+POOL_OVERFLOW = Gauge("ybyoca_db_pool_overflow", "Conexões abertas além do pool_size (negativo: pool ainda não cheio).", ("engine",))
+POOL_SIZE = Gauge("ybyoca_db_pool_size", "Tamanho configurado do pool.", ("engine",))
+
+REGISTRY = [
+    REQUESTS, LATENCY, IN_FLIGHT, REQUEST_STATEMENTS, REQUEST_DB_TIME,
+    STATEMENTS, STATEMENT_TIME, SLOW_STATEMENTS, POOL_CHECKED_OUT, POOL_OVERFLOW, POOL_SIZE,
+]
+
+_engines = {}
+
+def _collect_pools():
+    for name, engine in _engines.items():
+        pool = engine.pool
+        for gauge, attribute in ((POOL_CHECKED_OUT, "checkedout"), (POOL_OVERFLOW, "overflow"), (POOL_SIZE, "size")):
+            reader = getattr(pool, attribute, None)
+            if reader is not None:
+                gauge.set((name,), reader())
+
+def render() -> str:
+    _collect_pools()
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+# --- Contabilidade de SQL por requisição ---
+
+@dataclass
+class RequestStats:
+    method: str = ""
+    path: str = ""
+    statements: int = 0
+    db_seconds: float = 0.0
+
+_request_stats = contextvars.ContextVar("request_stats", default=None)
+
+def current_request() -> Optional[RequestStats]:
+    return _request_stats.get()
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+def _after_cursor_execute(engine_name: str):
+    def listener(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_started"].pop()
+        STATEMENTS.inc((engine_name,))
+        STATEMENT_TIME.observe((engine_name,), elapsed)
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.statements += 1
+            stats.db_seconds += elapsed
+        if config.SLOW_QUERY_MS and elapsed * 1000 >= config.SLOW_QUERY_MS:
+            SLOW_STATEMENTS.inc((engine_name,))
+            where = f"{stats.method} {stats.path}" if stats is not None else "fora de requisição"
+            print(f"[WARNING] Consulta lenta ({elapsed * 1000:.0f} ms, {where}): {' '.join(statement.split())[:SLOW_QUERY_MAX_CHARS]}")
+    return listener
+
+def _handle_error(context):
+    # Consulta que falhou não passa pelo after_cursor_execute
+    if context.connection is not None and context.connection.info.get("query_started"):
+        context.connection.info["query_started"].pop()
+
+def instrument_engine(engine, name: str):
+    """Registra os eventos de cursor de uma engine síncrona (para AsyncEngine, use .sync_engine)."""
+    if name in _engines:
+        return
+    _engines[name] = engine
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute(name))
+    event.listen(engine, "handle_error", _handle_error)
+
+# --- Middleware ---
+
+def route_template(scope) -> str:
+    # Usa o padrão da rota ("/projects/{project_id}/phases") para não criar uma série por ID
+    route = scope.get("route")
+    return getattr(route, "path", None) or "não encontrada"
+
+class MetricsMiddleware:
+    """Middleware ASGI que mede as requisições e informa o tempo de banco no cabeçalho Server-Timing."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(method=scope["method"], path=scope["path"])
+        token = _request_stats.set(stats)
+        status_code = 500
+
+        async def send_with_timing(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", f'db;dur={stats.db_seconds * 1000:.1f};desc="{stats.statements} SQL"')
+            await send(message)
+
+        IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            elapsed = time.perf_counter() - started
+            IN_FLIGHT.inc(amount=-1)
+            labels = (stats.method, route_template(scope))
+            REQUESTS.inc(labels + (str(status_code),))
+            LATENCY.observe(labels, elapsed)
+            REQUEST_STATEMENTS.observe(labels, stats.statements)
+            REQUEST_DB_TIME.observe(labels, stats.db_seconds)
+            _request_stats.reset(token)
@@ -0,0 +1,33 @@
+# backend/migrate.py
+"""Aplica as migrações do Alembic (backend/migrations) a partir do código."""
+import os
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect
+
+from . import config
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "migrations")
+# Revisão que corresponde ao esquema criado antes das migrações (metadata.create_all)
+BASELINE_REVISION = "0001"
+
+def alembic_config(url: str = None) -> Config:
+    alembic_cfg = Config()
+    alembic_cfg.set_main_option("script_location", MIGRATIONS_DIR)
+    alembic_cfg.set_main_option("sqlalchemy.url", (url or config.SQLALCHEMY_DATABASE_URL).replace("%", "%%"))
+    return alembic_cfg
+
+def upgrade(engine, revision: str = "head"):
+    """Atualiza o banco até a revisão indicada.
+
+    Bancos criados antes das migrações (tabelas existentes, sem alembic_version) são
+    marcados com a revisão inicial antes de receber as demais.
+    """
+    alembic_cfg = alembic_config(engine.url.render_as_string(hide_password=False))
+    with engine.begin() as connection:
+        alembic_cfg.attributes["connection"] = connection
+        tables = set(inspect(connection).get_table_names())
+        if "alembic_version" not in tables and "users" in tables:
+            command.stamp(alembic_cfg, BASELINE_REVISION)
+        command.upgrade(alembic_cfg, revision)
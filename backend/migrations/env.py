@@ -0,0 +1,59 @@
+# backend/migrations/env.py
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import create_engine
+
+from backend import config as app_config
+from backend import models
+from backend.database import engine_options, is_sqlite
+
+config = context.config
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+target_metadata = models.Base.metadata
+
+def database_url() -> str:
+    return config.get_main_option("sqlalchemy.url") or app_config.SQLALCHEMY_DATABASE_URL
+
+def configure(connection=None, **kwargs):
+    # SQLite não suporta ALTER TABLE completo: o modo batch recria a tabela quando necessário
+    url = database_url() if connection is None else str(connection.engine.url)
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        render_as_batch=is_sqlite(url),
+        compare_type=True,
+        **kwargs
+    )
+
+def run_migrations_offline():
+    """Gera o SQL das migrações sem conectar ao banco (alembic upgrade head --sql)."""
+    configure(url=database_url(), literal_binds=True, dialect_opts={"paramstyle": "named"})
+    with context.begin_transaction():
+        context.run_migrations()
+
+def run_migrations_online():
+    # backend.migrate repassa a conexão já aberta; pela linha de comando criamos uma
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        configure(connection)
+        with context.begin_transaction():
+            context.run_migrations()
+        return
+
+    url = database_url()
+    engine = create_engine(url, **engine_options(url))
+    try:
+        with engine.connect() as connection:
+            configure(connection)
+            with context.begin_transaction():
+                context.run_migrations()
+    finally:
+        engine.dispose()
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
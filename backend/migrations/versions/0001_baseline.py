@@ -0,0 +1,119 @@
+"""Esquema inicial (tabelas criadas até então por metadata.create_all)
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("email", sa.String(), nullable=True),
+        sa.Column("hashed_password", sa.String(), nullable=True),
+        sa.Column("role", sa.String(), nullable=True),
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    op.create_table(
+        "projects",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(), nullable=True),
+        sa.Column("budget", sa.Float(), nullable=True),
+        sa.Column("spent", sa.Float(), nullable=True),
+        sa.Column("status", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("completed_at", sa.DateTime(), nullable=True),
+        sa.Column("owner_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=True),
+        sa.Column("client_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=True),
+    )
+    op.create_index("ix_projects_id", "projects", ["id"])
+    op.create_index("ix_projects_name", "projects", ["name"])
+
+    op.create_table(
+        "expenses",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(), nullable=True),
+        sa.Column("value", sa.Float(), nullable=True),
+        sa.Column("category", sa.String(), nullable=True),
+        sa.Column("photo_url", sa.String(), nullable=True),
+        sa.Column("is_deleted", sa.Boolean(), nullable=True),
+        sa.Column("project_id", sa.Integer(), sa.ForeignKey("projects.id"), nullable=True),
+    )
+    op.create_index("ix_expenses_id", "expenses", ["id"])
+    op.create_index("ix_expenses_name", "expenses", ["name"])
+    op.create_index("ix_expenses_category", "expenses", ["category"])
+
+    op.create_table(
+        "project_phases",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(), nullable=True),
+        sa.Column("description", sa.String(), nullable=True),
+        sa.Column("start_date", sa.DateTime(), nullable=True),
+        sa.Column("end_date", sa.DateTime(), nullable=True),
+        sa.Column("status", sa.String(), nullable=True),
+        sa.Column("progress_percentage", sa.Float(), nullable=True),
+        sa.Column("estimated_cost", sa.Float(), nullable=True),
+        sa.Column("actual_cost", sa.Float(), nullable=True),
+        sa.Column("notes", sa.String(), nullable=True),
+        sa.Column("project_id", sa.Integer(), sa.ForeignKey("projects.id"), nullable=True),
+    )
+    op.create_index("ix_project_phases_id", "project_phases", ["id"])
+    op.create_index("ix_project_phases_name", "project_phases", ["name"])
+
+    op.create_table(
+        "checklists",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("item_name", sa.String(), nullable=True),
+        sa.Column("is_completed", sa.Boolean(), nullable=True),
+        sa.Column("priority", sa.String(), nullable=True),
+        sa.Column("due_date", sa.DateTime(), nullable=True),
+        sa.Column("notes", sa.String(), nullable=True),
+        sa.Column("project_id", sa.Integer(), sa.ForeignKey("projects.id"), nullable=True),
+    )
+    op.create_index("ix_checklists_id", "checklists", ["id"])
+    op.create_index("ix_checklists_item_name", "checklists", ["item_name"])
+
+    op.create_table(
+        "cash_flows",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("transaction_date", sa.DateTime(), nullable=True),
+        sa.Column("amount", sa.Float(), nullable=True),
+        sa.Column("transaction_type", sa.String(), nullable=True),
+        sa.Column("category", sa.String(), nullable=True),
+        sa.Column("description", sa.String(), nullable=True),
+        sa.Column("is_confirmed", sa.Boolean(), nullable=True),
+        sa.Column("project_id", sa.Integer(), sa.ForeignKey("projects.id"), nullable=True),
+    )
+    op.create_index("ix_cash_flows_id", "cash_flows", ["id"])
+    op.create_index("ix_cash_flows_category", "cash_flows", ["category"])
+
+    op.create_table(
+        "alerts",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("alert_type", sa.String(), nullable=True),
+        sa.Column("title", sa.String(), nullable=True),
+        sa.Column("message", sa.String(), nullable=True),
+        sa.Column("severity", sa.String(), nullable=True),
+        sa.Column("is_read", sa.Boolean(), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("resolved_at", sa.DateTime(), nullable=True),
+        sa.Column("project_id", sa.Integer(), sa.ForeignKey("projects.id"), nullable=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=True),
+    )
+    op.create_index("ix_alerts_id", "alerts", ["id"])
+    op.create_index("ix_alerts_alert_type", "alerts", ["alert_type"])
+    op.create_index("ix_alerts_title", "alerts", ["title"])
+
+def downgrade():
+    for table in ("alerts", "cash_flows", "checklists", "project_phases", "expenses", "projects", "users"):
+        op.drop_table(table)
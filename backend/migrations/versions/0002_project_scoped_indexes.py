@@ -0,0 +1,43 @@
+"""Índices para as consultas por projeto, dono e cliente; remove índices de texto sem uso
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+# (nome, tabela, colunas)
+NEW_INDEXES = [
+    ("ix_projects_owner_id_status", "projects", ["owner_id", "status"]),
+    ("ix_projects_client_id", "projects", ["client_id"]),
+    ("ix_expenses_project_id_is_deleted", "expenses", ["project_id", "is_deleted"]),
+    ("ix_project_phases_project_id", "project_phases", ["project_id"]),
+    ("ix_checklists_project_id", "checklists", ["project_id"]),
+    ("ix_alerts_project_id", "alerts", ["project_id"]),
+    ("ix_alerts_user_id", "alerts", ["user_id"]),
+]
+
+# Colunas de texto livre que nunca aparecem em filtros: o índice só encarece as escritas
+DROPPED_INDEXES = [
+    ("ix_expenses_name", "expenses", ["name"]),
+    ("ix_project_phases_name", "project_phases", ["name"]),
+    ("ix_checklists_item_name", "checklists", ["item_name"]),
+    ("ix_alerts_title", "alerts", ["title"]),
+]
+
+def upgrade():
+    for name, table, columns in NEW_INDEXES:
+        op.create_index(name, table, columns)
+    for name, table, _ in DROPPED_INDEXES:
+        op.drop_index(name, table_name=table)
+
+def downgrade():
+    for name, table, columns in DROPPED_INDEXES:
+        op.create_index(name, table, columns)
+    for name, table, _ in NEW_INDEXES:
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,22 @@
+"""Data de lançamento das despesas (usada no relatório em PDF)
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # Despesas já existentes ficam sem data: o relatório mostra "N/A"
+    with op.batch_alter_table("expenses") as batch_op:
+        batch_op.add_column(sa.Column("created_at", sa.DateTime(), nullable=True))
+
+def downgrade():
+    with op.batch_alter_table("expenses") as batch_op:
+        batch_op.drop_column("created_at")
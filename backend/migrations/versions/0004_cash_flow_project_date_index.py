@@ -0,0 +1,18 @@
+"""Índice (project_id, transaction_date) para as séries do fluxo de caixa
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_index("ix_cash_flows_project_id_transaction_date", "cash_flows", ["project_id", "transaction_date"])
+
+def downgrade():
+    op.drop_index("ix_cash_flows_project_id_transaction_date", table_name="cash_flows")
@@ -0,0 +1,21 @@
+"""Chave de deduplicação dos alertas
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    with op.batch_alter_table("alerts") as batch_op:
+        batch_op.add_column(sa.Column("dedup_key", sa.String(), nullable=True))
+
+def downgrade():
+    with op.batch_alter_table("alerts") as batch_op:
+        batch_op.drop_column("dedup_key")
@@ -0,0 +1,28 @@
+"""Totais de gastos por projeto e categoria, em centavos
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # Bancos migrados antes desta revisão já receberam a tabela junto com a 0001
+    if "project_category_totals" in sa.inspect(op.get_bind()).get_table_names():
+        return
+    op.create_table(
+        "project_category_totals",
+        sa.Column("project_id", sa.Integer(), sa.ForeignKey("projects.id"), primary_key=True),
+        sa.Column("category", sa.String(), primary_key=True),
+        sa.Column("total_cents", sa.BigInteger(), nullable=True),
+        sa.Column("expense_count", sa.Integer(), nullable=True),
+    )
+
+def downgrade():
+    op.drop_table("project_category_totals")
@@ -0,0 +1,29 @@
+"""Índice único parcial (project_id, dedup_key) nos alertas ativos
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # Duplicatas criadas por avaliações simultâneas: mantém ativo só o alerta mais antigo de cada chave
+    op.execute(sa.text("""
+        UPDATE alerts SET is_active = false, resolved_at = CURRENT_TIMESTAMP
+        WHERE is_active AND dedup_key IS NOT NULL AND id NOT IN (
+            SELECT min(id) FROM alerts WHERE is_active AND dedup_key IS NOT NULL GROUP BY project_id, dedup_key
+        )
+    """))
+    op.create_index(
+        "ux_alerts_project_id_dedup_key_active", "alerts", ["project_id", "dedup_key"], unique=True,
+        sqlite_where=sa.text("is_active"), postgresql_where=sa.text("is_active"),
+    )
+
+def downgrade():
+    op.drop_index("ux_alerts_project_id_dedup_key_active", table_name="alerts")
@@ -1,5 +1,5 @@
 # backend/models.py
-from sqlalchemy import Boolean, Column, ForeignKey, Integer, String, Float, DateTime
+from sqlalchemy import BigInteger, Boolean, Column, ForeignKey, Index, Integer, String, Float, DateTime, text
 from datetime import datetime
 from sqlalchemy.orm import relationship
 
@@ -20,6 +20,10 @@ class User(Base):
 
 class Project(Base):
     __tablename__ = "projects"
+    __table_args__ = (
+        # Listagens do arquiteto filtram por dono e, opcionalmente, por status
+        Index("ix_projects_owner_id_status", "owner_id", "status"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, index=True)
@@ -28,9 +32,11 @@ class Project(Base):
     status = Column(String, default="Em Andamento") # Novo campo: "Em Andamento" ou "Concluída"
     created_at = Column(DateTime, default=datetime.utcnow) # Novo campo: data de criação
     completed_at = Column(DateTime, nullable=True) # Novo campo: data de conclusão
+    # Incrementada a cada escrita no projeto (despesas, fases, checklist...); base dos ETags
+    version = Column(Integer, nullable=False, default=1, server_default="1")
     
     owner_id = Column(Integer, ForeignKey("users.id")) # ID do Arquiteto
-    client_id = Column(Integer, ForeignKey("users.id")) # ID do Cliente
+    client_id = Column(Integer, ForeignKey("users.id"), index=True) # ID do Cliente
 
     # Relacionamento com o usuário (dono/arquiteto)
     owner = relationship("User", back_populates="owned_projects", foreign_keys=[owner_id])
@@ -41,24 +47,38 @@ class Project(Base):
 
 class Expense(Base):
     __tablename__ = "expenses"
+    __table_args__ = (
+        # Toda leitura de despesas é por projeto e ignora as excluídas
+        Index("ix_expenses_project_id_is_deleted", "project_id", "is_deleted"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    name = Column(String, index=True)
+    name = Column(String)
     value = Column(Float, default=0.0)
     category = Column(String, index=True) # Novo campo para categoria
     photo_url = Column(String, nullable=True) # Caminho para a foto da despesa
     is_deleted = Column(Boolean, default=False) # Novo campo para soft delete
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=True) # Nulo para despesas anteriores à migração 0003
 
     project_id = Column(Integer, ForeignKey("projects.id"))
 
     # Relacionamento com o projeto
     project = relationship("Project", back_populates="expenses")
 
+class ProjectCategoryTotal(Base):
+    # Agregado mantido a cada despesa criada/excluída: total em centavos por projeto e categoria
+    __tablename__ = "project_category_totals"
+
+    project_id = Column(Integer, ForeignKey("projects.id"), primary_key=True)
+    category = Column(String, primary_key=True)
+    total_cents = Column(BigInteger, default=0)
+    expense_count = Column(Integer, default=0)
+
 class ProjectPhase(Base):
     __tablename__ = "project_phases"
 
     id = Column(Integer, primary_key=True, index=True)
-    name = Column(String, index=True)
+    name = Column(String)
     description = Column(String, nullable=True)
     start_date = Column(DateTime, nullable=True)
     end_date = Column(DateTime, nullable=True)
@@ -68,7 +88,7 @@ class ProjectPhase(Base):
     actual_cost = Column(Float, default=0.0)
     notes = Column(String, nullable=True)
 
-    project_id = Column(Integer, ForeignKey("projects.id"))
+    project_id = Column(Integer, ForeignKey("projects.id"), index=True)
 
     # Relacionamento com o projeto
     project = relationship("Project")
@@ -77,19 +97,23 @@ class Checklist(Base):
     __tablename__ = "checklists"
 
     id = Column(Integer, primary_key=True, index=True)
-    item_name = Column(String, index=True)
+    item_name = Column(String)
     is_completed = Column(Boolean, default=False)
     priority = Column(String, default="Média") # Baixa, Média, Alta
     due_date = Column(DateTime, nullable=True)
     notes = Column(String, nullable=True)
 
-    project_id = Column(Integer, ForeignKey("projects.id"))
+    project_id = Column(Integer, ForeignKey("projects.id"), index=True)
 
     # Relacionamento com o projeto
     project = relationship("Project")
 
 class CashFlow(Base):
     __tablename__ = "cash_flows"
+    __table_args__ = (
+        # Séries por período percorrem os lançamentos de um projeto em ordem de data
+        Index("ix_cash_flows_project_id_transaction_date", "project_id", "transaction_date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     transaction_date = Column(DateTime, default=datetime.utcnow)
@@ -106,10 +130,18 @@ class CashFlow(Base):
 
 class Alert(Base):
     __tablename__ = "alerts"
+    __table_args__ = (
+        # Um único alerta ativo por chave em cada projeto, mesmo com avaliações simultâneas
+        Index(
+            "ux_alerts_project_id_dedup_key_active", "project_id", "dedup_key", unique=True,
+            sqlite_where=text("is_active"), postgresql_where=text("is_active"),
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     alert_type = Column(String, index=True) # budget_overrun, deadline_approaching, etc.
-    title = Column(String, index=True)
+    dedup_key = Column(String, nullable=True) # Identifica o alerta ativo (ex.: "deadline_missed:12") para não duplicá-lo
+    title = Column(String)
     message = Column(String)
     severity = Column(String, default="medium") # low, medium, high, critical
     is_read = Column(Boolean, default=False)
@@ -117,8 +149,8 @@ class Alert(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     resolved_at = Column(DateTime, nullable=True)
 
-    project_id = Column(Integer, ForeignKey("projects.id"))
-    user_id = Column(Integer, ForeignKey("users.id"))
+    project_id = Column(Integer, ForeignKey("projects.id"), index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), index=True)
 
     # Relacionamentos
     project = relationship("Project")
@@ -4,14 +4,40 @@ from fpdf import FPDF
 from datetime import datetime
 from . import models
 from collections import defaultdict
+import os
+
+# Caminho a partir deste arquivo: o servidor pode ser iniciado de qualquer diretório
+LOGO_PATH = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'frontend', 'logo.jpg'))
+
+# Informações do logo já decodificadas, reaproveitadas entre relatórios (só após uma leitura bem-sucedida)
+_logo_info = None
 
 class PDF(FPDF):
+    def _register_logo(self):
+        global _logo_info
+        if LOGO_PATH in self.images:
+            return True
+        if _logo_info is None:
+            try:
+                _logo_info = self._parsejpg(LOGO_PATH)
+            except Exception as e:
+                # Falha não fica em cache: o próximo relatório tenta de novo
+                print(f"Erro ao carregar logo: {e}")
+                return False
+        info = dict(_logo_info)
+        info['i'] = len(self.images) + 1
+        self.images[LOGO_PATH] = info
+        return True
+
+    def cell(self, w, h=0, txt='', border=0, ln=0, align='', fill=0, link=''):
+        # As fontes padrão do FPDF só suportam latin-1; caracteres fora dele (ex.: emojis) viram '?'
+        txt = str(txt).encode('latin-1', 'replace').decode('latin-1')
+        return super().cell(w, h, txt, border, ln, align, fill, link)
+
     def header(self):
         # Header profissional com logo
-        try:
-            self.image('frontend/logo.jpg', 10, 8, 30)
-        except Exception as e:
-            print(f"Erro ao carregar logo: {e}")
+        if self._register_logo():
+            self.image(LOGO_PATH, 10, 8, 30)
 
         # Título principal
         self.set_font('Arial', 'B', 20)
@@ -0,0 +1,223 @@
+# backend/profiling.py
+"""Perfil de uma requisição sob demanda (config.PROFILING_ENABLED).
+
+Um usuário de config.PROFILING_USERS envia o cabeçalho "X-Profile: 1" (ou ?profile=1)
+e a requisição é acompanhada por um profiler de amostragem: uma thread registra a pilha
+das threads ocupadas a cada config.PROFILE_INTERVAL_MS. O perfil é gravado em
+config.PROFILE_DIR no formato "collapsed stacks" (flamegraph.pl, speedscope, inferno;
+o peso de cada pilha é em microssegundos),
+com um resumo que separa o tempo em SQL, serialização (Pydantic) e renderização do PDF.
+A resposta traz o ID do perfil em X-Profile-Id. Com a opção desligada o middleware nem
+é instalado.
+
+As amostras cobrem todas as threads do processo que não estão ociosas (o event loop e o
+threadpool das rotas síncronas); em um servidor com outras requisições simultâneas elas
+também aparecem no perfil. O PDF é renderizado no pool de processos de reports.py: o
+perfil mostra a espera pelo resultado (categoria "pdf"), não as funções do FPDF.
+"""
+import json
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from typing import Optional
+from urllib.parse import parse_qs
+
+from starlette.datastructures import MutableHeaders
+
+from . import auth, config, metrics
+
+PROFILE_ID_PATTERN = re.compile(r"^[0-9]+-[0-9a-f]{8}$")
+
+# Funções em que uma thread fica parada esperando trabalho (a amostra é descartada): o event
+# loop, o threadpool, o pool do bcrypt (concurrent.futures) e a thread de conexão do aiosqlite
+IDLE_FRAMES = {
+    ("selectors.py", "select"),
+    ("threading.py", "wait"),
+    ("queue.py", "get"),
+    ("thread.py", "_worker"),
+    ("core.py", "_connection_worker_thread"),
+}
+
+# Categorias do resumo, verificadas a partir do topo da pilha: a primeira que casar vence
+CATEGORIES = (
+    ("sql", ("/sqlalchemy/engine/", "/sqlite3/", "/aiosqlite/", "/psycopg/")),
+    ("pdf", ("/fpdf/", "pdf_generator.py")),
+    ("serialization", ("/pydantic/", "/fastapi/encoders.py")),
+)
+# O FPDF roda no pool de processos de reports.py: a thread que espera o resultado em
+# reports.render() parece ociosa, mas o tempo é de renderização do PDF
+PDF_WAIT_FRAME = ("reports.py", "render")
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_qualname} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})".replace(";", ",")
+
+def _frame_key(frame) -> tuple:
+    return os.path.basename(frame.f_code.co_filename), frame.f_code.co_name
+
+def _category(frames) -> str:
+    for frame in frames:
+        filename = frame.f_code.co_filename.replace("\\", "/")
+        for name, markers in CATEGORIES:
+            if any(marker in filename for marker in markers):
+                return name
+        if frame.f_code.co_name == "serialize_response":
+            return "serialization"
+        if _frame_key(frame) == PDF_WAIT_FRAME:
+            return "pdf"
+    return "other"
+
+class Sampler(threading.Thread):
+    """Amostra periodicamente as pilhas das threads ocupadas.
+
+    Cada amostra pesa o tempo real decorrido desde a anterior (em microssegundos), já que
+    com o GIL ocupado o intervalo efetivo costuma ser maior que o configurado.
+    """
+
+    def __init__(self, interval: float):
+        super().__init__(name="profiling-sampler", daemon=True)
+        self.interval = interval
+        self.stacks = Counter()
+        self.categories = Counter()
+        self.samples = 0
+        self._stop_event = threading.Event()
+
+    def run(self):
+        last = time.perf_counter()
+        while not self._stop_event.wait(self.interval):
+            now = time.perf_counter()
+            self.sample(max(1, int((now - last) * 1_000_000)))
+            last = now
+
+    def sample(self, weight_us: int):
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == self.ident:
+                continue
+            frames = []
+            while frame is not None:
+                frames.append(frame)
+                frame = frame.f_back
+            category = _category(frames)
+            if _frame_key(frames[0]) in IDLE_FRAMES and category != "pdf":
+                continue
+            stack = [names.get(ident, str(ident))] + [_frame_label(f) for f in reversed(frames)]
+            self.stacks[";".join(stack)] += weight_us
+            self.categories[category] += weight_us
+            self.samples += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+# --- Armazenamento ---
+
+def _path(profile_id: str, extension: str) -> str:
+    return os.path.join(config.PROFILE_DIR, f"{profile_id}.{extension}")
+
+def _prune():
+    summaries = sorted(name for name in os.listdir(config.PROFILE_DIR) if name.endswith(".json"))
+    for name in summaries[:max(0, len(summaries) - config.PROFILE_MAX_FILES)]:
+        profile_id = name[:-len(".json")]
+        for extension in ("json", "folded"):
+            try:
+                os.remove(_path(profile_id, extension))
+            except FileNotFoundError:
+                pass
+
+def save(summary: dict, stacks: Counter):
+    os.makedirs(config.PROFILE_DIR, exist_ok=True)
+    with open(_path(summary["id"], "folded"), "w", encoding="utf-8") as f:
+        f.writelines(f"{stack} {count}\n" for stack, count in stacks.most_common())
+    with open(_path(summary["id"], "json"), "w", encoding="utf-8") as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+    _prune()
+
+def list_profiles() -> list:
+    if not os.path.isdir(config.PROFILE_DIR):
+        return []
+    profiles = []
+    for name in sorted(os.listdir(config.PROFILE_DIR), reverse=True):
+        if name.endswith(".json"):
+            with open(os.path.join(config.PROFILE_DIR, name), encoding="utf-8") as f:
+                profiles.append(json.load(f))
+    return profiles
+
+def profile_path(profile_id: str) -> Optional[str]:
+    """Caminho do arquivo collapsed stacks, ou None se o ID for inválido ou não existir."""
+    if not PROFILE_ID_PATTERN.match(profile_id):
+        return None
+    path = _path(profile_id, "folded")
+    return path if os.path.exists(path) else None
+
+# --- Middleware ---
+
+def can_profile(email: Optional[str]) -> bool:
+    return bool(email) and email.lower() in config.PROFILING_USERS
+
+def _requested(scope) -> bool:
+    headers = dict(scope["headers"])
+    if headers.get(b"x-profile", b"").strip() in (b"1", b"true"):
+        return True
+    return parse_qs(scope.get("query_string", b"").decode("latin-1")).get("profile", [""])[-1] in ("1", "true")
+
+def _requesting_user(scope) -> Optional[str]:
+    authorization = dict(scope["headers"]).get(b"authorization", b"").decode("latin-1")
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        return auth.jwt.decode(token, auth.SECRET_KEY, algorithms=[auth.ALGORITHM]).get("sub")
+    except auth.JWTError:
+        return None
+
+class ProfilingMiddleware:
+    """Middleware ASGI que perfila as requisições marcadas com X-Profile de usuários autorizados."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not _requested(scope) or not can_profile(_requesting_user(scope)):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = f"{int(time.time() * 1000)}-{uuid.uuid4().hex[:8]}"
+        status_code = 500
+        sampler = Sampler(config.PROFILE_INTERVAL_MS / 1000)
+
+        async def send_with_profile_id(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                MutableHeaders(scope=message).append("X-Profile-Id", profile_id)
+            await send(message)
+
+        started = time.perf_counter()
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            sampler.stop()
+            wall_seconds = time.perf_counter() - started
+            # Tempo exato de SQL vem da contabilidade do metrics (quando ativo)
+            request_stats = metrics.current_request()
+            save({
+                "id": profile_id,
+                "method": scope["method"],
+                "path": scope["path"],
+                "query": scope.get("query_string", b"").decode("latin-1"),
+                "status": status_code,
+                "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "wall_ms": round(wall_seconds * 1000, 2),
+                "samples": sampler.samples,
+                "interval_ms": config.PROFILE_INTERVAL_MS,
+                "db_ms": round(request_stats.db_seconds * 1000, 2) if request_stats else None,
+                "db_statements": request_stats.statements if request_stats else None,
+                # Estimativa pelas amostras (soma das threads, pode passar do tempo de parede)
+                "sampled_ms": {name: round(weight_us / 1000, 2) for name, weight_us in sampler.categories.most_common()},
+            }, sampler.stacks)
@@ -0,0 +1,122 @@
+# backend/reports.py
+import threading
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List, Optional
+
+from . import cache, config, pdf_generator
+
+# --- Cópia desacoplada do ORM para renderização em outro processo ---
+
+@dataclass
+class ExpenseSnapshot:
+    name: str
+    value: float
+    category: str
+    created_at: Optional[datetime] = None
+
+@dataclass
+class ProjectSnapshot:
+    id: int
+    name: str
+    status: str
+    budget: float
+    spent: float
+    created_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    expenses: List[ExpenseSnapshot] = field(default_factory=list)
+
+def snapshot_project(project) -> ProjectSnapshot:
+    return ProjectSnapshot(
+        id=project.id,
+        name=project.name,
+        status=project.status,
+        budget=project.budget,
+        spent=project.spent,
+        created_at=project.created_at,
+        completed_at=project.completed_at,
+        expenses=[
+            ExpenseSnapshot(
+                name=e.name,
+                value=e.value,
+                category=e.category,
+                created_at=e.created_at,
+            )
+            for e in project.expenses
+        ],
+    )
+
+# --- Pool de renderização e jobs assíncronos ---
+
+@dataclass
+class ReportJob:
+    id: str
+    project_id: int
+    version: str
+    future: Future
+
+    @property
+    def status(self) -> str:
+        if not self.future.done():
+            return "running" if self.future.running() else "pending"
+        return "failed" if self.future.exception() else "done"
+
+_executor = None
+_executor_lock = threading.Lock()
+# Jobs recentes (id -> job) e o job em andamento de cada (project_id, versão)
+_jobs = cache.TTLCache(maxsize=256, ttl=config.REPORT_CACHE_TTL_SECONDS)
+_jobs_by_key = {}
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=config.REPORT_WORKERS)
+        return _executor
+
+def shutdown():
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+def get_cached(project_id: int, version: str) -> Optional[bytes]:
+    return cache.report_cache.get((project_id, version))
+
+def submit(project, version: str) -> ReportJob:
+    """Agenda a renderização no pool de processos, reaproveitando um job igual em andamento."""
+    key = (project.id, version)
+    with _executor_lock:
+        job = _jobs_by_key.get(key)
+    if job is not None and job.status != "failed":
+        return job
+
+    cached = get_cached(*key)
+    if cached is not None:
+        future = Future()
+        future.set_result(cached)
+    else:
+        future = _get_executor().submit(pdf_generator.create_project_report, snapshot_project(project))
+    job = ReportJob(id=uuid.uuid4().hex, project_id=project.id, version=version, future=future)
+
+    def _store(done: Future):
+        with _executor_lock:
+            _jobs_by_key.pop(key, None)
+        if not done.exception():
+            cache.report_cache.set(key, done.result())
+
+    with _executor_lock:
+        _jobs_by_key[key] = job
+    _jobs.set(job.id, job)
+    future.add_done_callback(_store)
+    return job
+
+def render(project, version: str) -> bytes:
+    """Renderiza (ou aguarda a renderização em andamento) e devolve os bytes do PDF."""
+    return submit(project, version).future.result()
+
+def get_job(job_id: str) -> Optional[ReportJob]:
+    return _jobs.get(job_id)
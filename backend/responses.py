@@ -0,0 +1,164 @@
+# backend/responses.py
+"""Caminho rápido para respostas grandes: JSON com orjson, serialização direta de objetos
+ORM e compressão gzip/brotli.
+
+As rotas com response_model já serializam pelo núcleo Rust do Pydantic, mas antes validam
+cada objeto ORM (from_attributes) campo a campo. Para listagens grandes cujos dados vêm
+direto do banco, orm_dumper() lê os atributos indicados pelo schema sem validar e a
+FastJSONResponse grava o resultado com orjson. O schema continua no response_model da
+rota, então a documentação OpenAPI não muda.
+"""
+import gzip
+import json
+from typing import Optional, Type, get_args, get_origin
+
+from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import JSONResponse
+
+from . import config
+
+try:
+    import orjson
+except ImportError:  # orjson é opcional: sem ele a resposta usa o json da biblioteca padrão
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # brotli é opcional: sem ele apenas gzip é oferecido
+    brotli = None
+
+# --- JSON ---
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content) -> bytes:
+        if orjson is None:
+            return json.dumps(content, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+def _list_item_model(annotation) -> Optional[Type[BaseModel]]:
+    if get_origin(annotation) in (list, tuple):
+        args = get_args(annotation)
+        if args and isinstance(args[0], type) and issubclass(args[0], BaseModel):
+            return args[0]
+    return None
+
+def orm_dumper(schema: Type[BaseModel]):
+    """Monta uma função que converte um objeto ORM em dict com os campos do schema.
+
+    Não há validação: use apenas com dados lidos do banco, cujos tipos já correspondem
+    ao schema. Campos List[Modelo] são convertidos recursivamente e os computed_field
+    são calculados a partir do próprio objeto ORM.
+    """
+    plain = []
+    nested = []
+    for name, field in schema.model_fields.items():
+        child = _list_item_model(field.annotation)
+        if child is not None:
+            nested.append((name, orm_dumper(child)))
+        else:
+            plain.append(name)
+    computed = [(name, info.wrapped_property.fget) for name, info in schema.model_computed_fields.items()]
+
+    def dump(obj) -> dict:
+        # Atributos já carregados ficam no __dict__ da instância: lê direto, sem passar pelo
+        # descritor do SQLAlchemy; os demais (expirados, adiados) usam getattr normalmente
+        state = obj.__dict__
+        data = {name: state[name] if name in state else getattr(obj, name) for name in plain}
+        for name, dump_item in nested:
+            data[name] = [dump_item(item) for item in (state[name] if name in state else getattr(obj, name))]
+        for name, getter in computed:
+            data[name] = getter(obj)
+        return data
+
+    return dump
+
+# --- Compressão ---
+
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript", "image/svg+xml")
+# Corpos maiores que isso são comprimidos no threadpool para não segurar o event loop
+THREADPOOL_COMPRESSION_BYTES = 256 * 1024
+
+def compress(body: bytes, encoding: str, maximum: bool = False) -> bytes:
+    """Comprime com os níveis configurados; maximum=True usa o nível máximo (arquivos comprimidos uma única vez)."""
+    if encoding == "br":
+        return brotli.compress(body, quality=11 if maximum else config.BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=9 if maximum else config.GZIP_LEVEL, mtime=0)
+
+def available_encodings() -> tuple:
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Escolhe br ou gzip conforme o Accept-Encoding do cliente (respeitando q=0)."""
+    accepted = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding.strip().lower()] = quality
+    for encoding in available_encodings():
+        if accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+def is_compressible(content_type: str) -> bool:
+    return content_type.startswith(COMPRESSIBLE_TYPES) and not content_type.startswith("text/event-stream")
+
+class CompressionMiddleware:
+    """Comprime com brotli ou gzip as respostas de corpo único acima de config.COMPRESSION_MIN_BYTES.
+
+    Respostas em streaming (SSE, arquivos), já comprimidas ou de tipos binários passam intactas.
+    """
+
+    def __init__(self, app, minimum_size: Optional[int] = None):
+        self.app = app
+        self.minimum_size = config.COMPRESSION_MIN_BYTES if minimum_size is None else minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+
+        async def send_compressed(message):
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                # Segura o início da resposta até saber o tamanho do corpo
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or start_message is None:
+                await send(message)
+                return
+
+            start, start_message = start_message, None
+            headers = MutableHeaders(scope=start)
+            body = message.get("body", b"")
+            content_type = headers.get("content-type", "")
+            if is_compressible(content_type) and "accept-encoding" not in headers.get("vary", "").lower():
+                headers.add_vary_header("Accept-Encoding")
+            if (message.get("more_body", False) or len(body) < self.minimum_size
+                    or "content-encoding" in headers or not is_compressible(content_type)):
+                await send(start)
+                await send(message)
+                return
+
+            if len(body) >= THREADPOOL_COMPRESSION_BYTES:
+                body = await run_in_threadpool(compress, body, encoding)
+            else:
+                body = compress(body, encoding)
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(body))
+            await send(start)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_compressed)
@@ -1,7 +1,18 @@
 # backend/schemas.py
-from pydantic import BaseModel
-from typing import List, Optional
-from datetime import datetime
+from pydantic import BaseModel, Field, computed_field, field_validator
+from typing import Generic, List, Literal, Optional, TypeVar
+from datetime import date, datetime
+from decimal import Decimal, ROUND_HALF_UP
+
+from . import images
+
+T = TypeVar("T")
+
+# --- Envelope de paginação ---
+
+class Page(BaseModel, Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str] = None
 
 # --- Schemas para Despesas (Expense) ---
 
@@ -13,15 +24,43 @@ class ExpenseBase(BaseModel):
     is_deleted: bool = False
 
 class ExpenseCreate(ExpenseBase):
-    pass
+    value: float = Field(..., allow_inf_nan=False)
+
+    @field_validator("value")
+    @classmethod
+    def round_to_cents(cls, value: float) -> float:
+        # Mesmo arredondamento de crud.to_cents: o valor gravado e os centavos somados nos totais coincidem
+        return float(Decimal(str(value)).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP))
 
 class Expense(ExpenseBase):
     id: int
     project_id: int
+    created_at: Optional[datetime] = None
+
+    # Versões reduzidas da foto para listagens (geradas em segundo plano ou sob demanda)
+    @computed_field
+    @property
+    def photo_thumb_url(self) -> Optional[str]:
+        return images.variant_url(self.photo_url, "thumb")
+
+    @computed_field
+    @property
+    def photo_medium_url(self) -> Optional[str]:
+        return images.variant_url(self.photo_url, "medium")
 
     class Config:
         from_attributes = True
 
+class ExpenseImportError(BaseModel):
+    row: int
+    errors: List[str]
+
+class ExpenseImportResult(BaseModel):
+    total_rows: int
+    inserted: int
+    error_count: int
+    errors: List[ExpenseImportError] = []
+
 # --- Schemas para Projetos (Project) ---
 
 class ProjectBase(BaseModel):
@@ -32,18 +71,122 @@ class ProjectBase(BaseModel):
 class ProjectCreate(ProjectBase):
     client_id: int
 
-class Project(ProjectBase):
+class ProjectSummary(ProjectBase):
+    # Versão resumida para listagens: não inclui as despesas
     id: int
     spent: float
     owner_id: int
     client_id: int
     created_at: datetime
     completed_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+class Project(ProjectSummary):
     expenses: List[Expense] = []
 
+# --- Schemas para o Dashboard ---
+
+class CategoryTotal(BaseModel):
+    category: str
+    count: int
+    total: float
+
+class ProjectDashboard(BaseModel):
+    project_id: int
+    name: str
+    status: str
+    budget: float
+    spent: float
+    remaining: float
+    budget_usage: float
+    is_over_budget: bool
+    expense_count: int
+    avg_expense: float
+    max_expense: float
+    main_category: Optional[str] = None
+    categories: List[CategoryTotal] = []
+
+class DashboardSummary(BaseModel):
+    total_projects: int
+    active_projects: int
+    completed_projects: int
+    total_budget: float
+    total_spent: float
+    budget_usage: float
+    over_budget_count: int
+    expense_count: int
+    categories: List[CategoryTotal] = []
+    projects: List[ProjectDashboard] = []
+
+# --- Schemas para Fluxo de Caixa ---
+
+class CashFlowBase(BaseModel):
+    transaction_date: Optional[datetime] = None # Padrão: agora
+    # income/expense usam valores positivos; forecast é uma projeção com sinal (+ entrada, - saída)
+    amount: float
+    transaction_type: Literal["income", "expense", "forecast"] = "expense"
+    category: Optional[str] = None
+    description: Optional[str] = None
+    is_confirmed: bool = True
+
+class CashFlowCreate(CashFlowBase):
+    pass
+
+class CashFlow(CashFlowBase):
+    id: int
+    project_id: int
+    transaction_date: datetime
+
     class Config:
         from_attributes = True
 
+class CashFlowBulkCreate(BaseModel):
+    entries: List[CashFlowCreate] = Field(..., min_length=1, max_length=5000)
+
+class CashFlowBulkResult(BaseModel):
+    inserted: int
+
+class CashFlowBucket(BaseModel):
+    period: date # Início da semana (segunda-feira) ou do mês
+    income: float # Entradas confirmadas
+    expense: float # Saídas confirmadas
+    net: float
+    forecast_net: float # Lançamentos previstos ou não confirmados
+    balance: float # Saldo acumulado confirmado
+    projected_balance: float # Saldo acumulado incluindo as previsões
+
+class CashFlowSeries(BaseModel):
+    project_id: int
+    bucket: str
+    items: List[CashFlowBucket] = []
+
+# --- Schemas para Alertas ---
+
+class Alert(BaseModel):
+    id: int
+    project_id: int
+    alert_type: str
+    title: str
+    message: str
+    severity: str # low, medium, high, critical
+    is_read: bool
+    is_active: bool
+    created_at: datetime
+    resolved_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+# --- Schemas para Relatórios ---
+
+class ReportJob(BaseModel):
+    job_id: str
+    project_id: int
+    status: str # pending, running, done, failed
+    download_url: str
+
 # --- Schemas para Usuários (User) ---
 
 class UserBase(BaseModel):
@@ -78,6 +221,25 @@ class ProjectPhaseBase(BaseModel):
 class ProjectPhaseCreate(ProjectPhaseBase):
     pass
 
+class ProjectPhaseUpdate(BaseModel):
+    # Atualização parcial: apenas os campos enviados são gravados. Os campos sem Optional
+    # não aceitam null (422); o default None só indica que o campo não foi enviado
+    name: str = None
+    description: Optional[str] = None
+    start_date: Optional[datetime] = None
+    end_date: Optional[datetime] = None
+    status: str = None
+    progress_percentage: float = None
+    estimated_cost: float = None
+    actual_cost: float = None
+    notes: Optional[str] = None
+
+class ProjectPhaseBatchItem(ProjectPhaseUpdate):
+    id: int
+
+class ProjectPhaseBatchUpdate(BaseModel):
+    updates: List[ProjectPhaseBatchItem] = Field(..., min_length=1, max_length=1000)
+
 class ProjectPhase(ProjectPhaseBase):
     id: int
     project_id: int
@@ -97,6 +259,20 @@ class ChecklistBase(BaseModel):
 class ChecklistCreate(ChecklistBase):
     pass
 
+class ChecklistUpdate(BaseModel):
+    # Atualização parcial, como em ProjectPhaseUpdate: null só é aceito nos campos Optional
+    item_name: str = None
+    is_completed: bool = None
+    priority: str = None
+    due_date: Optional[datetime] = None
+    notes: Optional[str] = None
+
+class ChecklistBatchItem(ChecklistUpdate):
+    id: int
+
+class ChecklistBatchUpdate(BaseModel):
+    updates: List[ChecklistBatchItem] = Field(..., min_length=1, max_length=1000)
+
 class Checklist(ChecklistBase):
     id: int
     project_id: int
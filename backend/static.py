@@ -0,0 +1,131 @@
+# backend/static.py
+import hashlib
+import mimetypes
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Optional
+
+from starlette.staticfiles import StaticFiles
+
+from . import config, responses
+
+# Nomes derivados do hash do conteúdo nunca mudam de conteúdo
+_CONTENT_ADDRESSED = re.compile(r"^[0-9a-f]{64}(\.[a-z0-9]{1,5})?$")
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# Conteúdo público que pode mudar a cada deploy: o navegador guarda, mas revalida pelo ETag
+REVALIDATE_CACHE_CONTROL = "public, no-cache"
+
+class CachedStaticFiles(StaticFiles):
+    """StaticFiles com Cache-Control: imutável para arquivos endereçados por conteúdo."""
+
+    def __init__(self, *args, default_max_age: int = 86400, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.default_max_age = default_max_age
+
+    def file_response(self, full_path, stat_result, scope, status_code=200):
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        filename = str(full_path).replace("\\", "/").rsplit("/", 1)[-1]
+        if _CONTENT_ADDRESSED.match(filename):
+            response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+        else:
+            response.headers["Cache-Control"] = f"public, max-age={self.default_max_age}"
+        return response
+
+# --- Frontend em memória ---
+
+FINGERPRINT_LENGTH = 12
+# Arquivos de texto cujas referências a /frontend/... são trocadas pelas URLs com hash,
+# na ordem em que são processados (o HTML por último, já com os hashes de CSS e JS)
+REWRITE_ORDER = (".css", ".js", ".html")
+
+@dataclass
+class Asset:
+    path: str  # Caminho relativo ao diretório ("style.css")
+    url: str  # URL com o hash do conteúdo ("/frontend/style.1a2b3c4d5e6f.css")
+    media_type: str
+    etag: str
+    bodies: dict = field(default_factory=dict)  # Codificação ("identity", "gzip", "br") -> conteúdo
+
+    def body(self, encoding: Optional[str]) -> tuple:
+        """Conteúdo na codificação pedida, se houver versão pré-comprimida; senão o original."""
+        if encoding in self.bodies:
+            return self.bodies[encoding], encoding
+        return self.bodies["identity"], None
+
+def _read_text(full_path: str) -> str:
+    with open(full_path, "rb") as f:
+        content = f.read()
+    try:
+        return content.decode("utf-8")
+    except UnicodeDecodeError:
+        # Arquivos salvos no Windows: servidos sempre em UTF-8
+        return content.decode("cp1252")
+
+def _fingerprinted_name(path: str, digest: str) -> str:
+    stem, extension = os.path.splitext(path)
+    return f"{stem}.{digest[:FINGERPRINT_LENGTH]}{extension}"
+
+def _rewrite_rank(path: str) -> int:
+    extension = os.path.splitext(path)[1]
+    return REWRITE_ORDER.index(extension) + 1 if extension in REWRITE_ORDER else 0
+
+class FrontendBundle:
+    """Arquivos do frontend carregados uma vez na inicialização.
+
+    Cada arquivo ganha uma URL com o hash do conteúdo (servida como imutável) e as páginas,
+    o CSS e o JS passam a referenciar essas URLs. Os tipos de texto ficam também
+    pré-comprimidos em gzip (e brotli, se instalado) no nível máximo. Alterações nos
+    arquivos só aparecem depois de reiniciar o servidor.
+    """
+
+    def __init__(self, directory: str, url_prefix: str = "/frontend"):
+        self.url_prefix = url_prefix
+        self.assets = {}  # Caminho original ou com hash -> Asset
+        self.fingerprinted = set()
+
+        paths = []
+        for root, _, filenames in os.walk(directory):
+            for filename in filenames:
+                paths.append(os.path.relpath(os.path.join(root, filename), directory).replace(os.sep, "/"))
+        # Arquivos sem referências primeiro; depois CSS, JS e HTML, reescritos com os hashes já conhecidos
+        for path in sorted(paths, key=lambda path: (_rewrite_rank(path), path)):
+            self._load(os.path.join(directory, path), path, rewrite=_rewrite_rank(path) > 0)
+
+    def _rewrite_references(self, text: str) -> str:
+        urls = {f"{self.url_prefix}/{path}": asset.url for path, asset in self.assets.items() if path not in self.fingerprinted}
+        if not urls:
+            return text
+        pattern = re.compile("|".join(re.escape(url) for url in sorted(urls, key=len, reverse=True)) + r"(?![\w.-])")
+        return pattern.sub(lambda match: urls[match.group(0)], text)
+
+    def _load(self, full_path: str, path: str, rewrite: bool):
+        media_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        if rewrite or media_type.startswith("text/") or media_type == "application/javascript":
+            text = _read_text(full_path)
+            content = (self._rewrite_references(text) if rewrite else text).encode("utf-8")
+            media_type = f"{media_type}; charset=utf-8"
+        else:
+            with open(full_path, "rb") as f:
+                content = f.read()
+
+        digest = hashlib.sha256(content).hexdigest()
+        fingerprinted = _fingerprinted_name(path, digest)
+        asset = Asset(path=path, url=f"{self.url_prefix}/{fingerprinted}", media_type=media_type,
+                      etag=f'W/"{digest[:16]}"', bodies={"identity": content})
+        if config.COMPRESSION_ENABLED and responses.is_compressible(media_type) and len(content) >= config.COMPRESSION_MIN_BYTES:
+            for encoding in responses.available_encodings():
+                compressed = responses.compress(content, encoding, maximum=True)
+                if len(compressed) < len(content):
+                    asset.bodies[encoding] = compressed
+
+        self.assets[path] = asset
+        self.assets[fingerprinted] = asset
+        self.fingerprinted.add(fingerprinted)
+
+    def get(self, path: str) -> Optional[Asset]:
+        return self.assets.get(path)
+
+    def cache_control(self, path: str) -> str:
+        return IMMUTABLE_CACHE_CONTROL if path in self.fingerprinted else REVALIDATE_CACHE_CONTROL
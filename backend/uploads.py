@@ -0,0 +1,117 @@
+# backend/uploads.py
+import hashlib
+import os
+import re
+import uuid
+from typing import Optional
+
+from fastapi import UploadFile
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+from starlette.exceptions import HTTPException
+from starlette.responses import JSONResponse
+
+from . import config
+
+# Folga para os demais campos do formulário e os delimitadores do multipart
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+class UploadTooLarge(ValueError):
+    """O arquivo enviado excede config.MAX_UPLOAD_BYTES."""
+
+def _too_large_detail() -> str:
+    return f"Arquivo excede o limite de {config.MAX_UPLOAD_BYTES} bytes."
+
+def _safe_extension(filename: str) -> str:
+    _, extension = os.path.splitext(filename or "")
+    extension = extension.lower()
+    return extension if re.fullmatch(r"\.[a-z0-9]{1,5}", extension) else ""
+
+def _discard(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+async def save_upload(upload: UploadFile) -> str:
+    """Grava o arquivo em blocos, fora do event loop, com nome derivado do SHA-256 do conteúdo.
+
+    Arquivos idênticos são armazenados uma única vez. Devolve a URL pública (/uploads/...).
+    """
+    if upload.size is not None and upload.size > config.MAX_UPLOAD_BYTES:
+        raise UploadTooLarge(_too_large_detail())
+
+    os.makedirs(config.UPLOAD_DIR, exist_ok=True)
+    temp_path = os.path.join(config.UPLOAD_DIR, f".{uuid.uuid4().hex}.part")
+    digest = hashlib.sha256()
+    size = 0
+    temp_file = await run_in_threadpool(open, temp_path, "wb")
+    try:
+        while True:
+            chunk = await upload.read(config.UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            size += len(chunk)
+            if size > config.MAX_UPLOAD_BYTES:
+                raise UploadTooLarge(_too_large_detail())
+            digest.update(chunk)
+            await run_in_threadpool(temp_file.write, chunk)
+    except BaseException:
+        await run_in_threadpool(temp_file.close)
+        await run_in_threadpool(_discard, temp_path)
+        raise
+    await run_in_threadpool(temp_file.close)
+
+    filename = f"{digest.hexdigest()}{_safe_extension(upload.filename)}"
+    final_path = os.path.join(config.UPLOAD_DIR, filename)
+    if os.path.exists(final_path):
+        # Conteúdo já armazenado: reaproveita o arquivo existente
+        await run_in_threadpool(_discard, temp_path)
+    else:
+        await run_in_threadpool(os.replace, temp_path, final_path)
+    return f"/uploads/{filename}"
+
+# --- Limite na entrada ---
+
+class UploadLimitMiddleware:
+    """Recusa com 413 corpos multipart maiores que config.MAX_UPLOAD_BYTES antes do parser.
+
+    O Starlette lê e grava em disco o formulário inteiro antes de a rota ver o UploadFile,
+    então o limite de save_upload() sozinho não evita o tráfego nem o arquivo temporário.
+    Com Content-Length acima do limite a resposta sai sem ler o corpo; sem ele (chunked)
+    ou com valor incorreto, a leitura é interrompida assim que o limite é ultrapassado.
+    """
+
+    def __init__(self, app, max_body_bytes: Optional[int] = None):
+        self.app = app
+        self.max_body_bytes = (config.MAX_UPLOAD_BYTES + MULTIPART_OVERHEAD_BYTES
+                               if max_body_bytes is None else max_body_bytes)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        if not headers.get("content-type", "").lower().startswith("multipart/form-data"):
+            await self.app(scope, receive, send)
+            return
+
+        content_length = headers.get("content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > self.max_body_bytes:
+            response = JSONResponse({"detail": _too_large_detail()}, status_code=413, headers={"Connection": "close"})
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_body_bytes:
+                    # Propagado pelo parser do FastAPI e convertido em resposta 413
+                    raise HTTPException(status_code=413, detail=_too_large_detail())
+            return message
+
+        await self.app(scope, limited_receive, send)
@@ -0,0 +1,252 @@
+# benchmarks/api.py
+"""Benchmark e teste de carga das rotas mais acessadas da API.
+
+Cria um banco SQLite temporário, popula com benchmarks.data e executa cada cenário
+dentro do processo (httpx sobre ASGI, sem servidor), primeiro em série e depois com
+--concurrency requisições simultâneas. Para cada cenário informa p50/p95/p99, vazão e
+consultas SQL por requisição.
+
+Com --url as requisições vão para um servidor já em execução, populado antes com
+python -m benchmarks.data; nesse modo as consultas por requisição não são medidas e o
+cache de relatórios do servidor não é limpo entre as execuções.
+
+Com --json o resultado é gravado em arquivo; com --baseline ele é comparado a uma
+execução anterior e o comando sai com código 1 se o p95 piorar além de --tolerance
+ou se alguma rota passar a fazer mais consultas.
+
+Uso: python -m benchmarks.api [--projects 2000] [--requests 200] [--concurrency 16] [--json atual.json] [--baseline anterior.json]
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from typing import Callable, Optional
+
+import httpx
+
+@dataclass
+class Scenario:
+    name: str
+    call: Callable  # (cliente, índice da requisição) -> awaitable de httpx.Response
+    requests_ratio: float = 1.0  # Fração de --requests (rotas caras como /token rodam menos vezes)
+    reset: Optional[Callable] = None  # Chamado antes de cada execução para descartar caches que seriam medidos no lugar da rota
+
+@dataclass
+class Result:
+    scenario: str
+    concurrency: int
+    requests: int
+    errors: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    throughput: float
+    queries_per_request: Optional[float]
+
+class QueryCounter:
+    """Conta os comandos SQL executados pelas engines síncrona e assíncrona da aplicação."""
+
+    def __init__(self):
+        self.value = 0
+
+    def attach(self, *engines):
+        from sqlalchemy import event
+
+        for engine in engines:
+            event.listen(engine, "before_cursor_execute", self._count)
+
+    def _count(self, *args):
+        self.value += 1
+
+def percentile(cuts, value: int) -> float:
+    return cuts[value - 1] * 1000
+
+async def run_scenario(client, scenario: Scenario, total: int, concurrency: int, warmup: int, counter: Optional[QueryCounter],
+                       start: int = 0) -> Result:
+    if scenario.reset is not None:
+        scenario.reset()
+    for index in range(start, start + warmup):
+        await scenario.call(client, index)
+
+    indexes = iter(range(start + warmup, start + warmup + total))
+    latencies = []
+    errors = 0
+
+    async def worker():
+        nonlocal errors
+        # Os workers compartilham o mesmo iterador: cada índice é usado uma única vez
+        for index in indexes:
+            started = time.perf_counter()
+            response = await scenario.call(client, index)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors += 1
+
+    queries_before = counter.value if counter else 0
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    cuts = statistics.quantiles(latencies, n=100, method="inclusive") if len(latencies) > 1 else latencies * 99
+    return Result(
+        scenario=scenario.name,
+        concurrency=concurrency,
+        requests=len(latencies),
+        errors=errors,
+        p50_ms=percentile(cuts, 50),
+        p95_ms=percentile(cuts, 95),
+        p99_ms=percentile(cuts, 99),
+        throughput=len(latencies) / elapsed if elapsed else 0.0,
+        queries_per_request=(counter.value - queries_before) / len(latencies) if counter and latencies else None,
+    )
+
+async def login(client, email: str, password: str) -> dict:
+    response = await client.post("/token", data={"username": email, "password": password})
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+async def build_scenarios(client, architect_emails: list, password: str, reset_reports: Optional[Callable] = None) -> list:
+    headers = await login(client, architect_emails[0], password)
+    response = await client.get("/projects/", params={"fields": "summary", "limit": 200}, headers=headers)
+    response.raise_for_status()
+    project_ids = [project["id"] for project in response.json()["items"]]
+    if not project_ids:
+        raise SystemExit(f"O usuário {architect_emails[0]} não tem projetos: popule o banco com benchmarks.data.")
+
+    def project(index: int) -> int:
+        return project_ids[index % len(project_ids)]
+
+    return [
+        Scenario("POST /token", lambda c, i: c.post(
+            "/token", data={"username": architect_emails[i % len(architect_emails)], "password": password}
+        ), requests_ratio=0.1),
+        Scenario("GET /projects/", lambda c, i: c.get("/projects/", headers=headers)),
+        Scenario("GET /projects/?fields=summary", lambda c, i: c.get("/projects/", params={"fields": "summary"}, headers=headers)),
+        Scenario("POST /projects/{id}/expenses/", lambda c, i: c.post(
+            f"/projects/{project(i)}/expenses/", data={"name": f"Carga {i}", "value": "150.75", "category": "Materiais"}, headers=headers
+        )),
+        Scenario("GET /projects/{id}/phases", lambda c, i: c.get(f"/projects/{project(i)}/phases", headers=headers)),
+        Scenario("GET /projects/{id}/checklist", lambda c, i: c.get(f"/projects/{project(i)}/checklist", headers=headers)),
+        Scenario("GET /projects/{id}/report", lambda c, i: c.get(f"/projects/{project(i)}/report", headers=headers),
+                 requests_ratio=0.5, reset=reset_reports),
+    ]
+
+async def run_all(client, scenarios: list, args, counter: Optional[QueryCounter]) -> list:
+    results = []
+    for scenario in scenarios:
+        total = max(2, int(args.requests * scenario.requests_ratio))
+        start = 0
+        for concurrency in sorted({1, args.concurrency}):
+            # Cada nível de concorrência usa índices (e projetos) novos: repetir os da passada
+            # anterior mediria respostas já em cache em vez da rota
+            result = await run_scenario(client, scenario, total, concurrency, args.warmup, counter, start)
+            start += args.warmup + total
+            print_result(result)
+            results.append(result)
+    return results
+
+def print_header():
+    print(f"{'cenário':<34}{'conc.':>6}{'req.':>6}{'erros':>6}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'req/s':>9}{'SQL/req':>9}")
+
+def print_result(result: Result):
+    queries = f"{result.queries_per_request:.1f}" if result.queries_per_request is not None else "-"
+    print(
+        f"{result.scenario:<34}{result.concurrency:>6}{result.requests:>6}{result.errors:>6}"
+        f"{result.p50_ms:>9.1f}{result.p95_ms:>9.1f}{result.p99_ms:>9.1f}{result.throughput:>9.1f}{queries:>9}"
+    )
+
+def compare(results: list, baseline: list, tolerance: float) -> list:
+    """Lista as regressões (p95 acima da tolerância ou mais consultas por requisição) em relação à execução anterior."""
+    previous = {(item["scenario"], item["concurrency"]): item for item in baseline}
+    regressions = []
+    for result in results:
+        before = previous.get((result.scenario, result.concurrency))
+        if before is None:
+            continue
+        if result.p95_ms > before["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{result.scenario} (conc. {result.concurrency}): p95 {before['p95_ms']:.1f} -> {result.p95_ms:.1f} ms")
+        if (result.queries_per_request is not None and before.get("queries_per_request") is not None
+                and result.queries_per_request > before["queries_per_request"] + 0.5):
+            regressions.append(
+                f"{result.scenario} (conc. {result.concurrency}): SQL/req {before['queries_per_request']:.1f} -> {result.queries_per_request:.1f}"
+            )
+    return regressions
+
+async def run_in_process(args) -> list:
+    # A aplicação lê o banco das variáveis de ambiente ao ser importada
+    from backend import auth, cache, crud, database, migrate, reports
+    from backend.main import app
+    from . import data
+
+    print(f"Populando {args.projects} projetos x {args.expenses_per_project} despesas...")
+    migrate.upgrade(database.engine)
+    dataset = data.seed(database.engine, data.Scale(projects=args.projects, expenses_per_project=args.expenses_per_project),
+                        auth.get_password_hash(data.PASSWORD))
+    db = database.SessionLocal()
+    try:
+        crud.reconcile_spending(db, apply=True)
+    finally:
+        db.close()
+
+    counter = QueryCounter()
+    counter.attach(database.engine, database.async_engine.sync_engine)
+    try:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://benchmark") as client:
+            scenarios = await build_scenarios(client, dataset.architect_emails, dataset.password, cache.report_cache.clear)
+            print_header()
+            return await run_all(client, scenarios, args, counter)
+    finally:
+        reports.shutdown()
+        auth.shutdown()
+        await database.async_engine.dispose()
+        database.engine.dispose()
+
+async def run_remote(args) -> list:
+    from . import data
+
+    architect_emails = [data.architect_email(number) for number in range(1, data.Scale.architects + 1)]
+    async with httpx.AsyncClient(base_url=args.url, timeout=60) as client:
+        scenarios = await build_scenarios(client, architect_emails, data.PASSWORD)
+        print_header()
+        return await run_all(client, scenarios, args, None)
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.api")
+    parser.add_argument("--url", help="servidor já em execução (padrão: aplicação dentro do processo)")
+    parser.add_argument("--projects", type=int, default=2000)
+    parser.add_argument("--expenses-per-project", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=200, help="requisições medidas por cenário")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--json", help="grava os resultados neste arquivo")
+    parser.add_argument("--baseline", help="resultados de uma execução anterior para comparação")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="piora aceita no p95 (padrão: 20%%)")
+    args = parser.parse_args(argv)
+
+    if args.url:
+        results = asyncio.run(run_remote(args))
+    else:
+        with tempfile.TemporaryDirectory() as directory:
+            os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(directory, 'benchmark.db')}"
+            os.environ["UPLOAD_DIR"] = os.path.join(directory, "uploads")
+            os.environ.setdefault("ALERT_SWEEP_INTERVAL_SECONDS", "0")
+            results = asyncio.run(run_in_process(args))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump([asdict(result) for result in results], f, indent=2, ensure_ascii=False)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSÃO: {regression}")
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
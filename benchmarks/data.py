@@ -0,0 +1,181 @@
+# benchmarks/data.py
+"""Gerador determinístico (semente fixa) de dados sintéticos para benchmarks e testes de carga.
+
+Insere arquitetos, clientes, projetos, despesas, fases e itens de checklist direto nas
+tabelas do banco. As tabelas são lidas do próprio banco (reflexão), então o gerador
+funciona em qualquer revisão das migrações: colunas que ainda não existem são ignoradas.
+
+Uso: python -m benchmarks.data --database-url sqlite:///./carga.db [--projects 2000] [--expenses-per-project 100]
+"""
+import argparse
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import MetaData, create_engine, insert
+
+from backend.database import engine_options
+
+PASSWORD = "benchmark"
+CATEGORIES = ["Mão de Obra", "Materiais", "Equipamentos", "Serviços", "Outros"]
+PROJECT_STATUSES = ["Em Andamento", "Em Andamento", "Em Andamento", "Concluída"]
+PHASE_STATUSES = ["Pendente", "Em Andamento", "Concluído"]
+PRIORITIES = ["Baixa", "Média", "Alta"]
+BATCH_SIZE = 20000
+
+@dataclass
+class Scale:
+    architects: int = 20
+    clients: int = 400
+    projects: int = 2000
+    expenses_per_project: int = 100
+    phases_per_project: int = 8
+    checklist_per_project: int = 15
+
+@dataclass
+class Dataset:
+    scale: Scale
+    architect_emails: list
+    client_emails: list
+    password: str = PASSWORD
+
+def architect_email(number: int) -> str:
+    return f"arquiteto{number}@ybyoca.com"
+
+def client_email(number: int) -> str:
+    return f"cliente{number}@ybyoca.com"
+
+def _insert(connection, table, rows):
+    # Mantém só as colunas existentes na revisão atual do banco
+    columns = set(table.columns.keys())
+    rows = [{key: value for key, value in row.items() if key in columns} for row in rows]
+    if rows:
+        connection.execute(insert(table), rows)
+
+def _insert_batched(connection, table, rows):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= BATCH_SIZE:
+            _insert(connection, table, batch)
+            batch = []
+    _insert(connection, table, batch)
+
+def _expenses(rng, scale: Scale, now: datetime):
+    for project_id in range(1, scale.projects + 1):
+        for _ in range(scale.expenses_per_project):
+            yield {
+                "name": "Despesa",
+                "value": round(rng.uniform(10, 5000), 2),
+                "category": rng.choice(CATEGORIES),
+                "photo_url": None,
+                "is_deleted": rng.random() < 0.05,
+                "created_at": now - timedelta(minutes=rng.randint(0, 365 * 24 * 60)),
+                "project_id": project_id,
+            }
+
+def _phases(rng, scale: Scale, now: datetime):
+    for project_id in range(1, scale.projects + 1):
+        start = now - timedelta(days=rng.randint(0, 300))
+        for number in range(scale.phases_per_project):
+            end = start + timedelta(days=rng.randint(7, 60))
+            status = rng.choice(PHASE_STATUSES)
+            yield {
+                "name": f"Fase {number + 1}",
+                "start_date": start,
+                "end_date": end,
+                "status": status,
+                "progress_percentage": 100.0 if status == "Concluído" else float(rng.randint(0, 90)),
+                "estimated_cost": round(rng.uniform(1000, 50000), 2),
+                "actual_cost": 0.0,
+                "project_id": project_id,
+            }
+            start = end
+
+def _checklist(rng, scale: Scale, now: datetime):
+    for project_id in range(1, scale.projects + 1):
+        for number in range(scale.checklist_per_project):
+            yield {
+                "item_name": f"Item {number + 1}",
+                "is_completed": rng.random() < 0.4,
+                "priority": rng.choice(PRIORITIES),
+                "due_date": now + timedelta(days=rng.randint(-60, 120)),
+                "project_id": project_id,
+            }
+
+def seed(engine, scale: Optional[Scale] = None, hashed_password: str = "-", seed_value: int = 42) -> Dataset:
+    """Popula um banco vazio (já migrado) e devolve os e-mails criados.
+
+    Os usuários recebem hashed_password; passe auth.get_password_hash(PASSWORD) quando
+    o benchmark precisar autenticar. Project.spent e os totais por categoria não são
+    calculados aqui: use crud.reconcile_spending(db, apply=True) se a revisão os tiver.
+    """
+    scale = scale or Scale()
+    rng = random.Random(seed_value)
+    now = datetime(2026, 1, 1)
+    metadata = MetaData()
+    metadata.reflect(engine, only=["users", "projects", "expenses", "project_phases", "checklists"])
+    tables = metadata.tables
+    architects = range(1, scale.architects + 1)
+    clients = range(scale.architects + 1, scale.architects + scale.clients + 1)
+
+    with engine.begin() as connection:
+        _insert(connection, tables["users"], [
+            {"id": user_id, "email": architect_email(user_id), "hashed_password": hashed_password, "role": "architect"}
+            for user_id in architects
+        ] + [
+            {"id": user_id, "email": client_email(user_id - scale.architects), "hashed_password": hashed_password, "role": "client"}
+            for user_id in clients
+        ])
+        _insert_batched(connection, tables["projects"], (
+            {
+                "id": project_id,
+                "name": f"Obra {project_id}",
+                "budget": float(rng.randint(50, 500) * 1000),
+                "spent": 0.0,
+                "status": rng.choice(PROJECT_STATUSES),
+                "created_at": now - timedelta(days=rng.randint(0, 730)),
+                "version": 1,
+                "owner_id": rng.choice(architects),
+                "client_id": rng.choice(clients),
+            }
+            for project_id in range(1, scale.projects + 1)
+        ))
+        _insert_batched(connection, tables["expenses"], _expenses(rng, scale, now))
+        _insert_batched(connection, tables["project_phases"], _phases(rng, scale, now))
+        _insert_batched(connection, tables["checklists"], _checklist(rng, scale, now))
+
+    return Dataset(
+        scale=scale,
+        architect_emails=[architect_email(user_id) for user_id in architects],
+        client_emails=[client_email(user_id - scale.architects) for user_id in clients],
+    )
+
+def main(argv=None):
+    from backend import auth, crud, migrate
+    from sqlalchemy.orm import Session
+
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.data")
+    parser.add_argument("--database-url", required=True, help="banco de destino (será migrado até a head)")
+    parser.add_argument("--architects", type=int, default=Scale.architects)
+    parser.add_argument("--clients", type=int, default=Scale.clients)
+    parser.add_argument("--projects", type=int, default=Scale.projects)
+    parser.add_argument("--expenses-per-project", type=int, default=Scale.expenses_per_project)
+    parser.add_argument("--phases-per-project", type=int, default=Scale.phases_per_project)
+    parser.add_argument("--checklist-per-project", type=int, default=Scale.checklist_per_project)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    scale = Scale(args.architects, args.clients, args.projects, args.expenses_per_project, args.phases_per_project, args.checklist_per_project)
+    engine = create_engine(args.database_url, **engine_options(args.database_url))
+    migrate.upgrade(engine)
+    dataset = seed(engine, scale, auth.get_password_hash(PASSWORD), args.seed)
+    with Session(engine) as db:
+        crud.reconcile_spending(db, apply=True)
+    engine.dispose()
+    print(f"{scale.projects} projetos, {scale.projects * scale.expenses_per_project} despesas. "
+          f"Login: {dataset.architect_emails[0]} / {dataset.password}")
+
+if __name__ == "__main__":
+    main()
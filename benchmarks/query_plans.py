@@ -0,0 +1,85 @@
+# benchmarks/query_plans.py
+"""Compara planos de consulta e tempos antes/depois dos índices da migração 0002.
+
+Cria um banco SQLite temporário na revisão 0001, popula com um volume grande de
+dados e executa as consultas das rotas mais acessadas na revisão 0001 e na head.
+
+Uso: python -m benchmarks.query_plans [--projects 2000] [--expenses-per-project 100]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import defer
+
+from backend import crud, migrate, models
+from backend.database import engine_options
+
+from . import data
+
+def benchmark_queries(project_id: int, owner_id: int, client_id: int):
+    project_statement, category_statement = crud.select_dashboard(owner_id=owner_id)
+    # Colunas adicionadas depois da revisão 0001 ficam fora do SELECT para a comparação valer nas duas revisões
+    projects = lambda **filters: crud.select_projects(with_expenses=False, **filters).options(defer(models.Project.version))
+    expenses = crud.select_expenses(project_id).options(defer(models.Expense.created_at))
+    return {
+        "projetos do arquiteto (status)": crud.keyset(projects(owner_id=owner_id, status="Em Andamento"), models.Project.id, None, 50),
+        "projetos do cliente": crud.keyset(projects(client_id=client_id), models.Project.id, None, 50),
+        "acesso ao projeto (EXISTS)": crud.select_can_access_project(project_id, client_id, "client"),
+        "despesas do projeto": crud.keyset(expenses, models.Expense.id, None, 50),
+        "fases do projeto": crud.keyset(crud.select_project_phases(project_id), models.ProjectPhase.id, None, 50),
+        "checklist do projeto": crud.keyset(crud.select_project_checklist(project_id), models.Checklist.id, None, 50),
+        "dashboard (por projeto)": project_statement,
+        "dashboard (por categoria)": category_statement,
+    }
+
+def measure(engine, statements: dict, repeat: int):
+    results = {}
+    with engine.connect() as connection:
+        for label, statement in statements.items():
+            compiled = statement.compile(engine, compile_kwargs={"literal_binds": True})
+            plan = connection.execute(text(f"EXPLAIN QUERY PLAN {compiled}")).fetchall()
+            started = time.perf_counter()
+            for _ in range(repeat):
+                connection.execute(statement).fetchall()
+            elapsed_ms = (time.perf_counter() - started) * 1000 / repeat
+            results[label] = (elapsed_ms, [row[-1] for row in plan])
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.query_plans")
+    parser.add_argument("--projects", type=int, default=2000)
+    parser.add_argument("--expenses-per-project", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        url = f"sqlite:///{os.path.join(directory, 'benchmark.db')}"
+        engine = create_engine(url, **engine_options(url))
+        migrate.upgrade(engine, migrate.BASELINE_REVISION)
+        print(f"Populando {args.projects} projetos x {args.expenses_per_project} despesas...")
+        data.seed(engine, data.Scale(
+            architects=50, clients=50, projects=args.projects, expenses_per_project=args.expenses_per_project,
+            phases_per_project=5, checklist_per_project=5,
+        ))
+
+        with engine.connect() as connection:
+            owner_id, client_id = connection.execute(text("SELECT owner_id, client_id FROM projects WHERE id = :id"), {"id": args.projects // 2}).one()
+        statements = benchmark_queries(args.projects // 2, owner_id, client_id)
+
+        before = measure(engine, statements, args.repeat)
+        migrate.upgrade(engine)
+        with engine.begin() as connection:
+            connection.execute(text("ANALYZE"))
+        after = measure(engine, statements, args.repeat)
+        engine.dispose()
+
+    for label in statements:
+        print(f"\n== {label}: {before[label][0]:.2f} ms -> {after[label][0]:.2f} ms")
+        print("   antes: " + " | ".join(before[label][1]))
+        print("   depois: " + " | ".join(after[label][1]))
+
+if __name__ == "__main__":
+    main()
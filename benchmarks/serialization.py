@@ -0,0 +1,85 @@
+# benchmarks/serialization.py
+"""Compara a serialização da listagem de projetos: caminho padrão do FastAPI x caminho rápido.
+
+Padrão: validação de cada objeto ORM pelo schema Page[Project] (from_attributes) seguida
+do dump_json do Pydantic, o que o FastAPI faz com o response_model. Rápido: orm_dumper()
+sem validação + FastJSONResponse (orjson), usado em GET /projects/. Confere que os dois
+geram o mesmo JSON e mostra o tamanho e o custo da compressão gzip/brotli da resposta.
+
+Uso: python -m benchmarks.serialization [--sizes 50,200,1000] [--expenses-per-project 100] [--repeat 10]
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from backend import crud, migrate, models, responses, schemas
+from backend.database import engine_options
+
+from . import data
+
+def best_ms(function, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+    return min(timings) * 1000
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.serialization")
+    parser.add_argument("--sizes", default="50,200,1000", help="quantidades de projetos por resposta")
+    parser.add_argument("--expenses-per-project", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args(argv)
+    sizes = [int(size) for size in args.sizes.split(",")]
+
+    adapter = TypeAdapter(schemas.Page[schemas.Project])
+    dump_project = responses.orm_dumper(schemas.Project)
+    render = responses.FastJSONResponse(None).render
+    print(f"JSON rápido: {'orjson' if responses.orjson is not None else 'json (orjson não instalado)'}; "
+          f"compressão: {', '.join(responses.available_encodings())}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        url = f"sqlite:///{os.path.join(directory, 'benchmark.db')}"
+        engine = create_engine(url, **engine_options(url))
+        migrate.upgrade(engine)
+        print(f"Populando {max(sizes)} projetos x {args.expenses_per_project} despesas...")
+        data.seed(engine, data.Scale(
+            architects=1, clients=10, projects=max(sizes), expenses_per_project=args.expenses_per_project,
+            phases_per_project=0, checklist_per_project=0,
+        ))
+
+        print(f"\n{'projetos':>9}{'KB':>9}{'padrão ms':>11}{'rápido ms':>11}{'ganho':>8}  compressão")
+        with Session(engine) as db:
+            for size in sizes:
+                projects = db.execute(crud.select_projects(with_expenses=True).order_by(models.Project.id).limit(size)).scalars().all()
+                page = {"items": projects, "next_cursor": None}
+
+                def standard() -> bytes:
+                    return adapter.dump_json(adapter.validate_python(page, from_attributes=True))
+
+                def fast() -> bytes:
+                    return render({"items": [dump_project(p) for p in projects], "next_cursor": None})
+
+                body = fast()
+                if json.loads(body) != json.loads(standard()):
+                    raise SystemExit(f"Os dois caminhos geraram JSON diferente para {size} projetos.")
+                standard_ms = best_ms(standard, args.repeat)
+                fast_ms = best_ms(fast, args.repeat)
+
+                compression = []
+                for encoding in responses.available_encodings():
+                    compressed_ms = best_ms(lambda: responses.compress(body, encoding), max(1, args.repeat // 2))
+                    ratio = len(responses.compress(body, encoding)) / len(body)
+                    compression.append(f"{encoding} {ratio:.0%} em {compressed_ms:.1f} ms")
+                print(f"{size:>9}{len(body) / 1024:>9.0f}{standard_ms:>11.1f}{fast_ms:>11.1f}{standard_ms / fast_ms:>7.1f}x  {'; '.join(compression)}")
+        engine.dispose()
+
+if __name__ == "__main__":
+    main()
@@ -54,10 +54,11 @@ class MobileMenu {
 
 // Dashboard Analytics Manager
 class DashboardManager {
-    static updateAnalytics(projects, clients) {
-        const totalProjects = projects.length;
-        const activeProjects = projects.filter(p => p.status === "Em Andamento").length;
-        const totalInvested = projects.reduce((sum, p) => sum + p.spent, 0);
+    static updateAnalytics(summary, clients) {
+        // Totais calculados no servidor (GET /dashboard/summary)
+        const totalProjects = summary.total_projects;
+        const activeProjects = summary.active_projects;
+        const totalInvested = summary.total_spent;
         const activeClients = clients.length;
 
         document.getElementById('dashboard-total-projects').textContent = totalProjects;
@@ -178,6 +179,35 @@ document.addEventListener('DOMContentLoaded', () => {
     // --- Estado Global da Aplicação ---
     let architectState = { allProjects: [], activeProjects: [], completedProjects: [], clients: [] };
     let selectedProjectId = null;
+    let clientProjectId = null; // Projeto aberto na visão do cliente
+
+    // --- Atualizações em Tempo Real (Server-Sent Events) ---
+    // Substitui o recarregamento manual: o servidor avisa quando um projeto muda
+    const LiveUpdates = {
+        source: null,
+        timer: null,
+        connect(role) {
+            this.disconnect();
+            const token = localStorage.getItem('userToken');
+            if (!token || !window.EventSource) return;
+            this.source = new EventSource(`${API_URL}/events?access_token=${encodeURIComponent(token)}`);
+            const types = ['project.created', 'project.updated', 'expense.created', 'expense.deleted', 'expense.imported',
+                'phase.created', 'phase.updated', 'phase.deleted', 'checklist.created', 'checklist.updated',
+                'checklist.toggled', 'checklist.deleted', 'alert.created', 'alert.resolved'];
+            types.forEach(type => this.source.addEventListener(type, (e) => this.schedule(role, JSON.parse(e.data))));
+        },
+        disconnect() {
+            if (this.source) this.source.close();
+            this.source = null;
+            clearTimeout(this.timer);
+        },
+        schedule(role, event) {
+            // Agrupa rajadas de eventos (ex.: importação) em uma única atualização
+            if (role === 'client' && clientProjectId && event.project_id !== clientProjectId) return;
+            clearTimeout(this.timer);
+            this.timer = setTimeout(() => role === 'architect' ? loadArchitectDashboard() : refreshClientView(), 400);
+        }
+    };
 
     // --- Elementos da UI ---
     const loginView = document.getElementById('login-view');
@@ -208,6 +238,18 @@ document.addEventListener('DOMContentLoaded', () => {
             if (!response.ok) throw new Error('Falha ao buscar dados');
             return response.json();
         },
+        async getAll(endpoint) {
+            // Percorre todas as páginas de um endpoint paginado por cursor
+            const items = [];
+            let cursor = null;
+            do {
+                const separator = endpoint.includes('?') ? '&' : '?';
+                const page = await this.get(cursor ? `${endpoint}${separator}cursor=${encodeURIComponent(cursor)}` : endpoint);
+                items.push(...page.items);
+                cursor = page.next_cursor;
+            } while (cursor);
+            return items;
+        },
         async post(endpoint, data) {
             const token = localStorage.getItem('userToken');
             const response = await fetch(`${API_URL}${endpoint}`, {
@@ -282,8 +324,10 @@ document.addEventListener('DOMContentLoaded', () => {
     });
 
     function logout() {
+        LiveUpdates.disconnect();
         localStorage.removeItem('userToken');
         selectedProjectId = null;
+        clientProjectId = null;
         architectState = { allProjects: [], activeProjects: [], completedProjects: [], clients: [] };
         showView('login-view');
     }
@@ -310,9 +354,11 @@ document.addEventListener('DOMContentLoaded', () => {
     async function loadArchitectDashboard() {
         try {
             // Busca todos os projetos e clientes
-            [architectState.allProjects, architectState.clients] = await Promise.all([
-                api.get('/projects/'),
-                api.get('/users/clients')
+            let summary;
+            [architectState.allProjects, architectState.clients, summary] = await Promise.all([
+                api.getAll('/projects/?limit=200'),
+                api.getAll('/users/clients?limit=200'),
+                api.get('/dashboard/summary')
             ]);
 
             // Filtra projetos ativos e concluídos
@@ -320,7 +366,7 @@ document.addEventListener('DOMContentLoaded', () => {
             architectState.completedProjects = architectState.allProjects.filter(p => p.status === "Concluída");
 
             // Atualizar dashboard analytics
-            DashboardManager.updateAnalytics(architectState.allProjects, architectState.clients);
+            DashboardManager.updateAnalytics(summary, architectState.clients);
 
             renderArchitectProjects();
             renderCompletedProjects(); // Nova função para renderizar concluídos
@@ -458,7 +504,7 @@ document.addEventListener('DOMContentLoaded', () => {
                     <div class="flex-responsive between items-start">
                         <div class="flex items-center space-x-3 flex-grow min-w-0">
                             ${e.photo_url ?
-                                `<img src="${API_URL}${e.photo_url}" alt="${e.name}" class="img-card flex-shrink-0">` :
+                                `<img src="${API_URL}${e.photo_thumb_url || e.photo_url}" alt="${e.name}" loading="lazy" class="img-card flex-shrink-0">` :
                                 `<div class="img-card bg-gray-100 rounded-lg flex items-center justify-center flex-shrink-0">
                                     <span class="text-2xl">${categoryIcon}</span>
                                 </div>`
@@ -509,6 +555,7 @@ document.addEventListener('DOMContentLoaded', () => {
 
     // --- Renderização do Painel do Cliente ---
     function showClientProjectDetails(project) {
+        clientProjectId = project.id;
         if (project.status === "Concluída") {
             loadCompletedClientProject(project);
         } else {
@@ -517,9 +564,20 @@ document.addEventListener('DOMContentLoaded', () => {
         }
     }
 
+    async function refreshClientView() {
+        if (!clientProjectId) {
+            await loadClientDashboard();
+            return;
+        }
+        const projects = await api.getAll('/projects/?limit=200');
+        const project = projects.find(p => p.id === clientProjectId);
+        if (project) showClientProjectDetails(project);
+    }
+
     async function loadClientDashboard() {
+        clientProjectId = null;
         try {
-            const projects = await api.get('/projects/'); // Busca todos os projetos do cliente
+            const projects = await api.getAll('/projects/?limit=200'); // Busca todos os projetos do cliente
             
             if (projects.length === 0) {
                 const container = document.getElementById('client-project-details');
@@ -602,20 +660,13 @@ document.addEventListener('DOMContentLoaded', () => {
         const offset = circumference - (progressPercentage / 100) * circumference;
         progressCircle.style.strokeDashoffset = offset;
 
-        // Calcular estatísticas
-        const totalExpenses = project.expenses.length;
-        const avgExpense = totalExpenses > 0 ? project.spent / totalExpenses : 0;
-        const maxExpense = project.expenses.length > 0 ? Math.max(...project.expenses.map(e => e.value)) : 0;
-        const categoryCounts = {};
-        let mainCategory = '-';
-
-        project.expenses.forEach(e => {
-            categoryCounts[e.category] = (categoryCounts[e.category] || 0) + 1;
-        });
-
-        if (Object.keys(categoryCounts).length > 0) {
-            mainCategory = Object.keys(categoryCounts).reduce((a, b) => categoryCounts[a] > categoryCounts[b] ? a : b);
-        }
+        // Estatísticas agregadas no servidor
+        const summary = await api.get(`/dashboard/summary?project_id=${project.id}`);
+        const stats = summary.projects[0] || { expense_count: 0, avg_expense: 0, max_expense: 0, main_category: null };
+        const totalExpenses = stats.expense_count;
+        const avgExpense = stats.avg_expense;
+        const maxExpense = stats.max_expense;
+        const mainCategory = stats.main_category || '-';
 
         // Atualizar estatísticas
         document.getElementById('total-expenses').textContent = totalExpenses;
@@ -689,7 +740,7 @@ document.addEventListener('DOMContentLoaded', () => {
                             <span class="text-xs text-gray-500">${date} ${time}</span>
                         </div>
                         ${expense.photo_url ?
-                            `<img src="${API_URL}${expense.photo_url}" alt="${expense.name}" class="w-full h-32 object-cover rounded-lg mt-2">` :
+                            `<img src="${API_URL}${expense.photo_thumb_url || expense.photo_url}" alt="${expense.name}" loading="lazy" class="w-full h-32 object-cover rounded-lg mt-2">` :
                             ''
                         }
                     </div>
@@ -737,7 +788,7 @@ document.addEventListener('DOMContentLoaded', () => {
                         </div>
                         <h4 class="font-semibold text-gray-800 mb-2 truncate">${expense.name}</h4>
                         ${expense.photo_url ?
-                            `<img src="${API_URL}${expense.photo_url}" alt="${expense.name}" class="w-full h-32 object-cover rounded-lg mb-2">` :
+                            `<img src="${API_URL}${expense.photo_thumb_url || expense.photo_url}" alt="${expense.name}" loading="lazy" class="w-full h-32 object-cover rounded-lg mb-2">` :
                             `<div class="w-full h-32 bg-gray-100 rounded-lg mb-2 flex items-center justify-center">
                                 <svg class="w-8 h-8 text-gray-400" fill="none" stroke="currentColor" viewBox="0 0 24 24">
                                     <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M4 16l4.586-4.586a2 2 0 012.828 0L16 16m-2-2l1.586-1.586a2 2 0 012.828 0L20 14m-6-6h.01M6 20h12a2 2 0 002-2V6a2 2 0 00-2-2H6a2 2 0 00-2 2v12a2 2 0 002 2z"></path>
@@ -926,10 +977,19 @@ document.addEventListener('DOMContentLoaded', () => {
         document.getElementById('print-report-button').addEventListener('click', async () => {
             try {
                 const token = localStorage.getItem('userToken');
-                const response = await fetch(`${API_URL}/projects/${project.id}/report`, {
+                let response = await fetch(`${API_URL}/projects/${project.id}/report`, {
                     headers: { 'Authorization': `Bearer ${token}` }
                 });
 
+                // Obras grandes: o relatório é gerado em segundo plano (202) e baixado quando pronto
+                while (response.status === 202) {
+                    const job = await response.json();
+                    await new Promise(resolve => setTimeout(resolve, 1000));
+                    response = await fetch(`${API_URL}${job.download_url}`, {
+                        headers: { 'Authorization': `Bearer ${token}` }
+                    });
+                }
+
                 if (!response.ok) {
                     throw new Error('Falha ao gerar o relatório. Status: ' + response.status);
                 }
@@ -996,7 +1056,7 @@ document.addEventListener('DOMContentLoaded', () => {
                             <span class="text-xs bg-green-100 text-green-700 px-2 py-1 rounded-full">✅ Concluído</span>
                         </div>
                         ${expense.photo_url ?
-                            `<img src="${API_URL}${expense.photo_url}" alt="${expense.name}" class="w-full h-32 object-cover rounded-lg mt-2 shadow-md">` :
+                            `<img src="${API_URL}${expense.photo_thumb_url || expense.photo_url}" alt="${expense.name}" loading="lazy" class="w-full h-32 object-cover rounded-lg mt-2 shadow-md">` :
                             `<div class="w-full h-32 bg-gray-100 rounded-lg mt-2 flex items-center justify-center shadow-inner">
                                 <svg class="w-8 h-8 text-gray-400" fill="none" stroke="currentColor" viewBox="0 0 24 24">
                                     <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M4 16l4.586-4.586a2 2 0 012.828 0L16 16m-2-2l1.586-1.586a2 2 0 012.828 0L20 14m-6-6h.01M6 20h12a2 2 0 002-2V6a2 2 0 00-2-2H6a2 2 0 00-2 2v12a2 2 0 002 2z"></path>
@@ -1129,6 +1189,7 @@ document.addEventListener('DOMContentLoaded', () => {
             const user = await api.get('/users/me');
             if (user.role === 'architect') { loadArchitectDashboard(); }
             else { loadClientDashboard(); }
+            LiveUpdates.connect(user.role);
         } catch (error) { console.error('Sessão inválida:', error); logout(); }
     }
 
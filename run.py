@@ -25,6 +25,14 @@ def main():
     print(f"🌐 Porta: {port}")
     print(f"📁 Diretório: {os.getcwd()}")
 
+    # Migrações e usuário inicial rodam uma vez, antes do servidor
+    for command in ("migrate", "seed"):
+        try:
+            subprocess.run([sys.executable, "-m", "backend.manage", command], check=True)
+        except subprocess.CalledProcessError as e:
+            print(f"❌ Erro ao preparar o banco de dados: {e}")
+            sys.exit(1)
+
     # Comando para iniciar o servidor
     cmd = [
         sys.executable, "-m", "uvicorn",
@@ -3,5 +3,8 @@
 # Instalar dependências
 pip install -r requirements.txt
 
+# Preparar o banco de dados (migrações e usuário inicial) antes dos workers
+python -m backend.manage migrate && python -m backend.manage seed || exit 1
+
 # Iniciar o servidor FastAPI
 uvicorn backend.main:app --host 0.0.0.0 --port $PORT
\ No newline at end of file